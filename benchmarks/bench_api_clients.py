@@ -0,0 +1,67 @@
+"""Пропускная способность `APIClientBase` (последовательно) и `AsyncAPIClientBase` (gather) на локальной заглушке.
+
+Заглушка — aiohttp-сервер в отдельном потоке, каждый ответ задерживается на `--latency` секунд
+(имитация времени обработки запроса сервисом).
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_api_clients.py --requests 200
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+from aiohttp import web
+
+from xtest.api import APIClientBase
+from xtest.api.aio import AsyncAPIClientBase
+
+
+def start_stub_server(latency: float) -> str:
+    async def handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        return web.json_response({"id": request.match_info["item_id"]})
+
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_get("/items/{item_id}", handler)
+    runner = web.AppRunner(app, access_log=None)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]  # pylint: disable=protected-access
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return f"http://127.0.0.1:{port}/"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="количество запросов")
+    parser.add_argument("--latency", type=float, default=0.02, help="время обработки запроса заглушкой, с")
+    parser.add_argument("--concurrency", type=int, default=50, help="max_concurrency асинхронного клиента")
+    args = parser.parse_args()
+
+    base_url = start_stub_server(args.latency)
+    endpoints = [f"items/{index}" for index in range(args.requests)]
+
+    sync_client = APIClientBase(base_url)
+    started = time.perf_counter()
+    for endpoint in endpoints:
+        sync_client.request(endpoint, jsonify=True)
+    sync_time = time.perf_counter() - started
+    sync_client.close()
+
+    with AsyncAPIClientBase(base_url, max_concurrency=args.concurrency) as async_client:
+        started = time.perf_counter()
+        async_client.request_many((endpoint, {"jsonify": True}) for endpoint in endpoints)
+        async_time = time.perf_counter() - started
+
+    print(f"Запросов: {args.requests}, задержка заглушки: {args.latency * 1000:.0f} мс")
+    print(f"{'client':<24}{'time, с':>10}{'req/s':>10}")
+    for name, duration in (("APIClientBase", sync_time), ("AsyncAPIClientBase", async_time)):
+        print(f"{name:<24}{duration:>10.2f}{args.requests / duration:>10.0f}")
+    print(f"Ускорение: x{sync_time / async_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
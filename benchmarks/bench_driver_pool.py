@@ -0,0 +1,80 @@
+"""Сравнение "браузер на каждый тест" с пулом сессий `pytest_xtest.pool.DriverPool`.
+
+Поддельный драйвер: создание сессии стоит `--startup` секунд, каждая команда WebDriver
+(в том числе команды очистки сессии между тестами) — `--latency` секунд.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_driver_pool.py --tests 20
+"""
+import argparse
+import time
+
+from pytest_xtest.pool import DriverPool, reset_driver
+
+
+class FakeSwitchTo:
+    def __init__(self, driver: "FakeDriver") -> None:
+        self._driver = driver
+
+    def window(self, handle: str) -> None:
+        self._driver.command()
+
+
+class FakeDriver:
+    def __init__(self, *, startup: float, latency: float) -> None:
+        self.latency = latency
+        self.switch_to = FakeSwitchTo(self)
+        time.sleep(startup)
+
+    def command(self) -> None:
+        time.sleep(self.latency)
+
+    @property
+    def window_handles(self) -> list[str]:
+        self.command()
+        return ["main"]
+
+    def execute_script(self, script: str) -> None:
+        self.command()
+
+    def delete_all_cookies(self) -> None:
+        self.command()
+
+    def get(self, url: str) -> None:
+        self.command()
+
+    def quit(self) -> None:
+        self.command()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tests", type=int, default=20, help="количество тестов на воркер")
+    parser.add_argument("--startup", type=float, default=0.5, help="время создания сессии браузера, с")
+    parser.add_argument("--latency", type=float, default=0.005, help="стоимость одной команды WebDriver, с")
+    parser.add_argument("--max-uses", type=int, default=10, help="пересоздание сессии пула после N тестов")
+    args = parser.parse_args()
+
+    def factory() -> FakeDriver:
+        return FakeDriver(startup=args.startup, latency=args.latency)
+
+    started = time.perf_counter()
+    for _ in range(args.tests):
+        factory().quit()
+    per_test = time.perf_counter() - started
+
+    pool = DriverPool(factory, size=1, max_uses=args.max_uses, reset=reset_driver)
+    started = time.perf_counter()
+    for _ in range(args.tests):
+        pool.release(pool.acquire())
+    pool.close()
+    pooled = time.perf_counter() - started
+
+    print(f"Тестов: {args.tests}, создание сессии: {args.startup} с")
+    print(f"{'браузер на тест':<20}{per_test:>8.2f} с")
+    print(f"{'пул сессий':<20}{pooled:>8.2f} с")
+    print(f"Переиспользовано: {pool.stats.reuse_rate:.0%}, ожидание сессии: {pool.stats.wait_time:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
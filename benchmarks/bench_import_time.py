@@ -0,0 +1,70 @@
+"""Время импорта плагина pytest_xtest в сравнении с "жадным" импортом модулей xtest.
+
+Для каждого модуля запускается `python -X importtime -c "import pytest, <модуль>"` в отдельном
+процессе. pytest импортируется первым (к моменту загрузки плагина он уже загружен), поэтому
+в отчет попадает только собственная стоимость модуля и его самые тяжелые зависимости.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_import_time.py
+"""
+import argparse
+import subprocess
+import sys
+
+MODULES = (
+    "pytest_xtest.plugin",
+    "xtest.pom.pages",
+    "xtest.api",
+    "xtest.utils.keycloak",
+    "xtest.utils.awsutil",
+)
+
+
+def import_time(module: str) -> tuple[int, list[tuple[int, str]]]:
+    """Кумулятивное время импорта модуля (мкс) и его прямые зависимости по убыванию времени."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import pytest, {module}"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ""
+        raise RuntimeError(last_line)
+
+    # Формат строк: "import time: <self> | <cumulative> | <отступ><модуль>", зависимости
+    # выводятся до самого модуля и с большим отступом.
+    children: list[tuple[int, str]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:") :].split("|")
+        depth = len(name) - len(name.lstrip())
+        if name.strip() == module and depth == 1:
+            return int(cumulative_us), sorted(children, reverse=True)
+        if depth == 1:
+            children = []
+        elif depth == 3:
+            children.append((int(cumulative_us), name.strip()))
+    raise RuntimeError(f"Модуль {module} не найден в выводе -X importtime.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=3, help="сколько самых тяжелых зависимостей показать")
+    parser.add_argument("--repeat", type=int, default=3, help="количество замеров (берется минимум)")
+    args = parser.parse_args()
+
+    for module in MODULES:
+        try:
+            cumulative, children = min((import_time(module) for _ in range(args.repeat)), key=lambda run: run[0])
+        except RuntimeError as ex:
+            print(f"{module:<24}пропущено: {ex}")
+            continue
+        print(f"{module:<24}{cumulative / 1000:8.1f} мс")
+        for child_cumulative, child in children[: args.top]:
+            print(f"{'':<24}{child_cumulative / 1000:8.1f} мс  {child}")
+
+
+if __name__ == "__main__":
+    main()
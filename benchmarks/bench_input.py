@@ -0,0 +1,124 @@
+"""Сравнение режимов ввода `InputMode.LEGACY` и `InputMode.FAST` на заполнении формы.
+
+Поддельный драйвер: каждая команда WebDriver "стоит" `--latency` секунд, поля изначально
+содержат текст длиной `--prefilled` символов, значение поля обновляется через `--apply-delay`
+секунд после ввода (имитация обработчиков фреймворка).
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_input.py --fields 5
+"""
+import argparse
+import collections
+import time
+import typing as t
+
+from selenium.webdriver import Keys
+
+from xtest.pom.locators import AdvancedLocator
+from xtest.pom.pages import InputMode, _BaseActions
+
+
+class FakeInput:
+    def __init__(self, driver: "FakeDriver", *, prefilled: int) -> None:
+        self._driver = driver
+        self._value = "x" * prefilled
+        self._pending: t.Optional[tuple[float, str]] = None
+        self._selected = False
+
+    @property
+    def value(self) -> str:
+        if self._pending and time.monotonic() >= self._pending[0]:
+            self._value, self._pending = self._pending[1], None
+        return self._value
+
+    def is_displayed(self) -> bool:
+        self._driver.command("isElementDisplayed")
+        return True
+
+    def is_selected(self) -> bool:
+        self._driver.command("isElementSelected")
+        return self._selected
+
+    def click(self) -> None:
+        self._driver.command("elementClick")
+        self._selected = not self._selected
+
+    def get_attribute(self, name: str) -> str:
+        self._driver.command("getElementAttribute")
+        return self.value
+
+    def get_property(self, name: str) -> str:
+        self._driver.command("getElementProperty")
+        return self.value
+
+    def send_keys(self, *keys: str) -> None:
+        self._driver.command("elementSendKeys")
+        text = "".join(keys)
+        if text in (Keys.BACKSPACE, Keys.DELETE):
+            self._value = self.value[:-1]
+            return
+        self._pending = (time.monotonic() + self._driver.apply_delay, self.value + text)
+
+
+class FakeDriver:
+    def __init__(self, *, latency: float, apply_delay: float, prefilled: int) -> None:
+        self.latency = latency
+        self.apply_delay = apply_delay
+        self.prefilled = prefilled
+        self.commands: t.Counter[str] = collections.Counter()
+
+    def command(self, name: str) -> None:
+        self.commands[name] += 1
+        time.sleep(self.latency)
+
+    def find_element(self, by: str, value: str) -> FakeInput:
+        self.command("findElement")
+        return FakeInput(self, prefilled=self.prefilled)
+
+    def execute_script(self, script: str, element: FakeInput) -> str:
+        self.command("executeScript")
+        element._value = ""
+        return ""
+
+
+class FormPage(_BaseActions):
+    pass
+
+
+def fill_form(mode: InputMode, *, fields: int, latency: float, apply_delay: float, prefilled: int) -> tuple[int, float]:
+    driver = FakeDriver(latency=latency, apply_delay=apply_delay, prefilled=prefilled)
+    page = FormPage(driver)
+    page.input_mode = mode
+    started = time.perf_counter()
+    for index in range(fields):
+        page.send_keys(AdvancedLocator(loc=f"input[name='field{index}']"), f"value-{index}")
+    page.set_value_to_checkbox(AdvancedLocator(loc="input[type='checkbox']"), True)
+    return sum(driver.commands.values()), time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fields", type=int, default=5, help="количество текстовых полей в форме")
+    parser.add_argument("--latency", type=float, default=0.002, help="стоимость одной команды WebDriver, с")
+    parser.add_argument("--apply-delay", type=float, default=0.02, help="задержка применения значения, с")
+    parser.add_argument("--prefilled", type=int, default=10, help="длина исходного текста в полях")
+    args = parser.parse_args()
+
+    print(f"Форма: {args.fields} полей + чекбокс, latency={args.latency * 1000:.1f} мс")
+    print(f"{'mode':<10}{'commands':>10}{'time, с':>10}")
+    results = {}
+    for mode in (InputMode.LEGACY, InputMode.FAST):
+        commands, duration = fill_form(
+            mode,
+            fields=args.fields,
+            latency=args.latency,
+            apply_delay=args.apply_delay,
+            prefilled=args.prefilled,
+        )
+        results[mode] = duration
+        print(f"{mode.value:<10}{commands:>10}{duration:>10.2f}")
+    print(f"Ускорение: x{results[InputMode.LEGACY] / results[InputMode.FAST]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
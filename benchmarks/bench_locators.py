@@ -0,0 +1,85 @@
+"""Сравнение `AdvancedLocator` на pydantic (старая реализация) с интернированным локатором на `__slots__`.
+
+Замеряются создание локатора, форматирование шаблона (`LOCATOR(query)`) с повторяющимися
+аргументами и поиск по словарю с локатором в качестве ключа.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_locators.py --repeat 100000
+"""
+import argparse
+import time
+import typing as t
+
+try:
+    from pydantic.v1 import BaseModel, Field
+except ImportError:
+    from pydantic import BaseModel, Field
+
+from xtest.pom.locators import AdvancedLocator
+
+
+class LegacyAdvancedLocator(BaseModel):
+    # Копия старой реализации: валидация pydantic и изменение loc на месте.
+    loc: str = Field()
+    by: str = Field(default="css selector")
+    desc: t.Optional[str] = None
+
+    @property
+    def as_locator(self) -> tuple[str, str]:
+        return self.by, self.loc
+
+    def __call__(self, /, *args, **kwargs) -> "LegacyAdvancedLocator":
+        self.__config__.allow_mutation = True
+        self.loc = self.loc.format(*args, **kwargs)
+        self.__config__.allow_mutation = False
+        return self
+
+    class Config:
+        allow_mutation = False
+
+
+TEMPLATE = "div[data-async-context='query:{0}'] > div:nth-child(3) > div"
+QUERIES = [f"query-{index}" for index in range(20)]
+
+
+def measure(func: t.Callable[[int], t.Any], repeat: int) -> float:
+    started = time.perf_counter()
+    for index in range(repeat):
+        func(index)
+    return (time.perf_counter() - started) / repeat * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100000, help="количество повторов каждой операции")
+    args = parser.parse_args()
+
+    legacy_cache = {LegacyAdvancedLocator(loc=TEMPLATE).as_locator: 1}
+    cache = {AdvancedLocator(TEMPLATE): 1}
+    template = AdvancedLocator(loc=TEMPLATE, desc="Результаты")
+
+    scenarios: dict[str, tuple[t.Callable[[int], t.Any], t.Callable[[int], t.Any]]] = {
+        "создание": (
+            lambda index: LegacyAdvancedLocator(loc=TEMPLATE, desc="Результаты"),
+            lambda index: AdvancedLocator(loc=TEMPLATE, desc="Результаты"),
+        ),
+        # Старый локатор перезаписывает шаблон, поэтому для каждого форматирования нужен новый экземпляр.
+        "создание + форматирование": (
+            lambda index: LegacyAdvancedLocator(loc=TEMPLATE, desc="Результаты")(QUERIES[index % 20]),
+            lambda index: template(QUERIES[index % 20]),
+        ),
+        "ключ словаря": (
+            lambda index: legacy_cache.get(LegacyAdvancedLocator(loc=TEMPLATE).as_locator),
+            lambda index: cache.get(template),
+        ),
+    }
+
+    print(f"{'operation':<30}{'pydantic, нс':>14}{'slots, нс':>12}{'ускорение':>12}")
+    for name, (legacy, current) in scenarios.items():
+        legacy_time = measure(legacy, args.repeat)
+        current_time = measure(current, args.repeat)
+        print(f"{name:<30}{legacy_time:>14.0f}{current_time:>12.0f}{legacy_time / current_time:>11.1f}x")
+
+
+if __name__ == "__main__":
+    main()
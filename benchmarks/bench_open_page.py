@@ -0,0 +1,98 @@
+"""Сравнение режимов открытия страницы `OpenMode.LEGACY` и `OpenMode.FAST`.
+
+Поддельный драйвер: каждая команда WebDriver "стоит" `--latency` секунд, загрузка страницы
+(`get`/`refresh`) — `--load` секунд, фронтенд становится готов через `--render` секунд после загрузки.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_open_page.py --opens 10
+"""
+import argparse
+import collections
+import time
+import typing as t
+
+from xtest.pom.pages import BasePageActions, OpenMode
+
+
+class FakeDriver:
+    def __init__(self, *, latency: float, load: float, render: float) -> None:
+        self.latency = latency
+        self.load = load
+        self.render = render
+        self.commands: collections.Counter = collections.Counter()
+        self.url = "about:blank"
+        self.loaded_at = 0.0
+
+    def command(self, name: str) -> None:
+        self.commands[name] += 1
+        time.sleep(self.latency)
+
+    def _load(self) -> None:
+        time.sleep(self.load)
+        self.loaded_at = time.monotonic()
+
+    def get(self, url: str) -> None:
+        self.command("get")
+        self.url = url
+        self._load()
+
+    def refresh(self) -> None:
+        self.command("refresh")
+        self._load()
+
+    @property
+    def current_url(self) -> str:
+        self.command("getCurrentUrl")
+        return self.url
+
+    @property
+    def rendered(self) -> bool:
+        return time.monotonic() - self.loaded_at >= self.render
+
+    def execute_script(self, script: str, *args: t.Any) -> t.Any:
+        self.command("executeScript")
+        if "readyStates" in script:
+            return [self.url, "complete", self.rendered]
+        return "complete"
+
+
+class Page(BasePageActions):
+    page_name = "Тестовая страница"
+    endpoint = "/orders/42"
+    endpoint_pattern = r"/orders/\d+$"
+    ready_script = "document.querySelector('#app') !== null"
+
+    def build_url(self) -> str:
+        return "https://example.com/"
+
+    def is_loading_page(self) -> bool:
+        return self.driver.rendered or None
+
+
+def run(mode: OpenMode, args: argparse.Namespace) -> tuple[collections.Counter, float]:
+    driver = FakeDriver(latency=args.latency, load=args.load, render=args.render)
+    page = Page(driver)
+    page.open_mode = mode
+    started = time.perf_counter()
+    for _ in range(args.opens):
+        page.open_page()
+    return driver.commands, (time.perf_counter() - started) / args.opens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--opens", type=int, default=10, help="количество открытий страницы")
+    parser.add_argument("--latency", type=float, default=0.002, help="стоимость одной команды WebDriver, с")
+    parser.add_argument("--load", type=float, default=0.3, help="длительность загрузки страницы, с")
+    parser.add_argument("--render", type=float, default=0.1, help="готовность фронтенда после загрузки, с")
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'open, мс':>10}{'commands/open':>16}  loads/open")
+    for mode in (OpenMode.LEGACY, OpenMode.FAST):
+        commands, duration = run(mode, args)
+        loads = (commands["get"] + commands["refresh"]) / args.opens
+        print(f"{mode.value:<10}{duration * 1000:>10.0f}{sum(commands.values()) / args.opens:>16.1f}  {loads:.0f}")
+
+
+if __name__ == "__main__":
+    main()
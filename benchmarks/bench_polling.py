@@ -0,0 +1,74 @@
+"""Сравнение старого цикла `wait()` (фиксированный интервал 0.5 с) с адаптивным движком опроса.
+
+Каждое "действие" — условие, которое становится истинным через случайную задержку
+(имитация появления элемента/текста). Для набора действий считается суммарное время
+ожидания и экономия на одно действие.
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_polling.py --actions 40
+"""
+import argparse
+import random
+import statistics
+import time
+import typing as t
+
+from xtest.utils.decorators import wait
+
+
+def legacy_wait(method: t.Callable[[], t.Any], *, timeout: int = 10, interval: float = 0.5) -> t.Any:
+    # Копия старой реализации: time.time(), int(timeout), сон после дедлайна.
+    start_time = time.time()
+    while time.time() - start_time < int(timeout):
+        result = method()
+        if result is not None:
+            return result
+        time.sleep(interval)
+    return None
+
+
+def make_condition(ready_after: float) -> t.Callable[[], t.Optional[bool]]:
+    ready_at = time.monotonic() + ready_after
+
+    def _condition() -> t.Optional[bool]:
+        return True if time.monotonic() >= ready_at else None
+
+    return _condition
+
+
+def run(waiter: t.Callable[[t.Callable[[], t.Any]], t.Any], delays: list[float]) -> list[float]:
+    durations = []
+    for delay in delays:
+        condition = make_condition(delay)
+        started = time.perf_counter()
+        waiter(condition)
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--actions", type=int, default=40, help="количество действий в 'наборе тестов'")
+    parser.add_argument("--max-delay", type=float, default=0.3, help="максимальная задержка готовности, с")
+    parser.add_argument("--suite-actions", type=int, default=10000, help="действий в полном прогоне для оценки")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    delays = [rnd.uniform(0, args.max_delay) for _ in range(args.actions)]
+
+    legacy = run(legacy_wait, delays)
+    adaptive = run(lambda condition: wait(condition, check=True, timeout=10), delays)
+
+    saved = statistics.mean(legacy) - statistics.mean(adaptive)
+    print(f"Действий: {args.actions}, задержка готовности: 0..{args.max_delay} с")
+    print(f"{'':>12}{'mean, мс':>12}{'p95, мс':>12}{'total, с':>12}")
+    for name, durations in (("legacy", legacy), ("adaptive", adaptive)):
+        p95 = statistics.quantiles(durations, n=20)[-1]
+        print(f"{name:>12}{statistics.mean(durations) * 1000:>12.1f}{p95 * 1000:>12.1f}{sum(durations):>12.2f}")
+    print(f"Экономия на действие: {saved * 1000:.1f} мс")
+    print(f"Оценка экономии на прогон из {args.suite_actions} действий: {saved * args.suite_actions / 60:.1f} мин")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Сравнение условий ожидания URL: паттерн-строка на каждой попытке и скомпилированный `UrlMatches`.
+
+Замеряется одна попытка опроса `WebDriverWait` и количество запросов `current_url` для
+составного условия (URL, заголовок и ещё одно условие на URL).
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_predicates.py --repeat 100000
+"""
+import argparse
+import collections
+import re
+import time
+import typing as t
+
+from xtest.pom.predicates import TitleMatches, UrlMatches
+
+PATTERN = r"https://example\.com/orders/(\d+)/items/(\d+)$"
+
+
+class FakeDriver:
+    def __init__(self) -> None:
+        self.commands: collections.Counter = collections.Counter()
+
+    @property
+    def current_url(self) -> str:
+        self.commands["getCurrentUrl"] += 1
+        return "https://example.com/orders/42/items/7?tab=history#top"
+
+    @property
+    def title(self) -> str:
+        self.commands["getTitle"] += 1
+        return "Заказ 42"
+
+
+def legacy_url_matches(pattern: str) -> t.Callable[[t.Any], bool]:
+    # Копия старой реализации: паттерн передается строкой и ищется при каждой попытке.
+    def _predicate(driver: t.Any) -> bool:
+        return re.search(pattern, driver.current_url.split("?")[0]) is not None
+
+    return _predicate
+
+
+def measure(predicate: t.Callable[[t.Any], t.Any], driver: FakeDriver, repeat: int) -> tuple[float, float]:
+    driver.commands.clear()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        predicate(driver)
+    return (time.perf_counter() - started) / repeat * 1e9, driver.commands["getCurrentUrl"] / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=100000, help="количество попыток опроса")
+    args = parser.parse_args()
+
+    driver = FakeDriver()
+    legacy = legacy_url_matches(PATTERN)
+    other = legacy_url_matches(r"/orders/")
+    scenarios: dict[str, t.Callable[[t.Any], t.Any]] = {
+        "url, строка": legacy,
+        "url, UrlMatches": UrlMatches(PATTERN),
+        "url & title & url, строки": lambda d: legacy(d) and re.search("Заказ", d.title) and other(d),
+        "url & title & url, Predicate": UrlMatches(PATTERN) & TitleMatches("Заказ") & UrlMatches(r"/orders/"),
+    }
+
+    print(f"{'predicate':<32}{'попытка, нс':>13}{'current_url/попытка':>22}")
+    for name, predicate in scenarios.items():
+        duration, url_calls = measure(predicate, driver, args.repeat)
+        print(f"{name:<32}{duration:>13.0f}{url_calls:>22.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Количество команд WebDriver на одно ожидание: опрос через WebDriver против ожидания в браузере.
+
+Используется поддельный драйвер: каждая команда "стоит" `--latency` секунд (имитация HTTP round-trip
+до Selenium Grid), элементы становятся видимыми/исчезают через `--ready-after` секунд.
+
+Режимы:
+    driver-1ms   — старое поведение `WebDriverWait(poll_frequency=0.001)`;
+    driver       — опрос через WebDriver с адаптивным интервалом (`xtest.utils.polling`);
+    browser      — `WaitMode.BROWSER`, один `execute_async_script` на ожидание
+                   (плюс однократный `setTimeouts` на драйвер).
+
+Запуск:
+    PYTHONPATH=src python benchmarks/bench_wait_commands.py
+"""
+import argparse
+import collections
+import time
+import typing as t
+
+from selenium.common import exceptions
+
+from xtest.pom.locators import AdvancedLocator
+from xtest.pom.pages import _BaseActions
+from xtest.pom.waits import WaitMode
+from xtest.utils.polling import FixedInterval
+
+
+class FakeElement:
+    def __init__(self, driver: "FakeDriver") -> None:
+        self._driver = driver
+
+    def is_displayed(self) -> bool:
+        self._driver.command("isElementDisplayed")
+        return self._driver.visible
+
+
+class FakeDriver:
+    def __init__(self, *, latency: float, ready_after: float, appear: bool) -> None:
+        self.latency = latency
+        self.commands: t.Counter[str] = collections.Counter()
+        self._ready_at = time.monotonic() + ready_after
+        self._appear = appear
+
+    @property
+    def visible(self) -> bool:
+        ready = time.monotonic() >= self._ready_at
+        return ready if self._appear else not ready
+
+    def command(self, name: str) -> None:
+        self.commands[name] += 1
+        time.sleep(self.latency)
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        self.command("findElement")
+        return FakeElement(self)
+
+    def find_elements(self, by: str, value: str) -> list[FakeElement]:
+        self.command("findElements")
+        return [FakeElement(self) for _ in range(3)]
+
+    def set_script_timeout(self, timeout: float) -> None:
+        self.command("setTimeouts")
+
+    def execute_async_script(self, script: str, *args: t.Any) -> t.Any:
+        self.command("executeAsyncScript")
+        # Браузер сам дожидается условия; по сети уходит одна команда.
+        expected_visible = args[2] != "hidden"
+        while self.visible != expected_visible:
+            time.sleep(0.001)
+        return {"ok": True, "value": True}
+
+
+class Actions(_BaseActions):
+    pass
+
+
+LOCATOR = AdvancedLocator(loc="div.result", desc="Результаты")
+
+SCENARIOS: dict[str, tuple[bool, t.Callable[[Actions], t.Any]]] = {
+    "find_visible_element": (True, lambda page: page.find_visible_element(LOCATOR)),
+    "wait_hide_element": (False, lambda page: page.wait_hide_element(LOCATOR)),
+    "wait_number_of_elements_to_appear": (
+        True,
+        lambda page: page.wait_number_of_elements_to_appear(LOCATOR, 3),
+    ),
+}
+
+
+def run(mode: str, scenario: str, *, latency: float, ready_after: float) -> tuple[int, float]:
+    appear, action = SCENARIOS[scenario]
+    driver = FakeDriver(latency=latency, ready_after=ready_after, appear=appear)
+    page = Actions(driver)
+    if mode == "driver-1ms":
+        page.polling = FixedInterval(0.001)
+    if mode == "browser":
+        page.wait_mode = WaitMode.BROWSER
+    started = time.perf_counter()
+    try:
+        action(page)
+    except exceptions.TimeoutException:
+        pass
+    return sum(driver.commands.values()), time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.002, help="стоимость одной команды WebDriver, с")
+    parser.add_argument("--ready-after", type=float, default=0.5, help="через сколько секунд выполняется условие")
+    args = parser.parse_args()
+
+    print(f"latency={args.latency * 1000:.1f} мс, условие выполняется через {args.ready_after} с")
+    print(f"{'scenario':<36}{'mode':<12}{'commands':>10}{'time, мс':>12}")
+    for scenario in SCENARIOS:
+        for mode in ("driver-1ms", "driver", "browser"):
+            commands, duration = run(mode, scenario, latency=args.latency, ready_after=args.ready_after)
+            print(f"{scenario:<36}{mode:<12}{commands:>10}{duration * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
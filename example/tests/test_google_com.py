@@ -4,13 +4,13 @@ from selenium.webdriver.remote.webdriver import WebDriver
 from library.pom.pages import GoogleComPage
 
 
-@pytest.fixture(scope="session")
-def driver() -> WebDriver:
-    # Фикстура для получение драйвера Selenium.
-    pass
+@pytest.fixture
+def driver(xtest_pooled_driver: WebDriver) -> WebDriver:
+    # Сессия Selenium из пула плагина: браузер не запускается заново для каждого теста.
+    return xtest_pooled_driver
 
 
-@pytest.fixture(scope="class")
+@pytest.fixture
 def page_google_com(driver):
     page = GoogleComPage(driver)
     page.open_page()
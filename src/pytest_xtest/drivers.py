@@ -0,0 +1,79 @@
+"""Конфигурация и создание WebDriver. Selenium импортируется только при создании драйвера."""
+from __future__ import annotations
+
+import dataclasses
+import typing as t
+
+if t.TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+BROWSERS = ("chrome", "firefox", "edge")
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+
+def parse_window_size(value: t.Optional[str], /) -> t.Optional[tuple[int, int]]:
+    """Разбор размера окна в формате "1920x1080"."""
+    if not value:
+        return None
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError as ex:
+        raise ValueError(f'Некорректный размер окна "{value}", ожидается формат "1920x1080".') from ex
+    return width, height
+
+
+@dataclasses.dataclass(frozen=True)
+class DriverConfig:
+    browser: str = "chrome"
+    headless: bool = False
+    remote_url: t.Optional[str] = None
+    window_size: t.Optional[tuple[int, int]] = None
+    page_load_strategy: str = "normal"
+    arguments: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.browser not in BROWSERS:
+            raise ValueError(f'Неподдерживаемый браузер "{self.browser}". Доступные: {", ".join(BROWSERS)}.')
+        if self.page_load_strategy not in PAGE_LOAD_STRATEGIES:
+            raise ValueError(
+                f'Неподдерживаемая стратегия загрузки "{self.page_load_strategy}". '
+                f'Доступные: {", ".join(PAGE_LOAD_STRATEGIES)}.'
+            )
+
+    @property
+    def name(self) -> str:
+        name = self.browser
+        if self.window_size:
+            name += f"-{self.window_size[0]}x{self.window_size[1]}"
+        if self.headless:
+            name += "-headless"
+        return name
+
+
+def create_driver(config: DriverConfig, /) -> WebDriver:
+    """Создание WebDriver по конфигурации (локально или через Selenium Grid)."""
+    from selenium import webdriver
+
+    options = {
+        "chrome": webdriver.ChromeOptions,
+        "firefox": webdriver.FirefoxOptions,
+        "edge": webdriver.EdgeOptions,
+    }[config.browser]()
+    options.page_load_strategy = config.page_load_strategy
+    if config.headless:
+        options.add_argument("-headless" if config.browser == "firefox" else "--headless=new")
+    for argument in config.arguments:
+        options.add_argument(argument)
+
+    if config.remote_url:
+        driver = webdriver.Remote(command_executor=config.remote_url, options=options)
+    else:
+        driver = {
+            "chrome": webdriver.Chrome,
+            "firefox": webdriver.Firefox,
+            "edge": webdriver.Edge,
+        }[config.browser](options=options)
+
+    if config.window_size:
+        driver.set_window_size(*config.window_size)
+    return driver
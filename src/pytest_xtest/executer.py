@@ -1,6 +1,45 @@
+"""Скрипты подготовки и завершения сессии (заполнение БД, запуск заглушек и т.п.).
+
+Скрипты одного этапа без зависимостей друг от друга выполняются параллельно. Скрипт пропускается,
+если его отпечаток (содержимое скрипта, аргументы, объявленные входные файлы и отпечатки
+зависимостей) не изменился с последнего успешного запуска. Этап выполняется один раз за сессию,
+даже если его запускают все воркеры pytest-xdist: первый процесс выполняет этап под файловой
+блокировкой, остальные получают его результаты.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
 import enum
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+import typing as t
+import uuid
 from pathlib import Path
 
+from xtest.utils.filelock import FileLock
+
+# Переменная окружения с идентификатором сессии, общая для контроллера и воркеров xdist.
+SESSION_ID_ENV = "XTEST_SESSION_ID"
+
+# Этапы старше суток удаляются из каталога состояния.
+_STAGE_MARKER_TTL = 24 * 60 * 60
+
+
+def session_id() -> str:
+    """Идентификатор текущей сессии pytest (одинаковый в контроллере и воркерах xdist).
+
+    Контроллер выставляет переменную окружения до запуска воркеров, воркеры наследуют ее.
+    Плагин создает новый идентификатор при каждом запуске контроллера и удаляет его по завершении.
+    """
+    if (value := os.environ.get(SESSION_ID_ENV)) is None:
+        value = os.environ[SESSION_ID_ENV] = uuid.uuid4().hex
+    return value
+
 
 @enum.unique
 class ScriptExecuterEnum(enum.Enum):
@@ -8,8 +47,92 @@ class ScriptExecuterEnum(enum.Enum):
     AFTER_SESSION_FINISH = enum.auto()
 
 
+@enum.unique
+class ScriptStatus(enum.Enum):
+    PASSED = "passed"
+    FAILED = "failed"
+    # Отпечаток не изменился с последнего успешного запуска.
+    CACHED = "cached"
+    # Не запускался из-за ошибки в зависимости.
+    SKIPPED = "skipped"
+
+
+_NOT_COMPLETED = (ScriptStatus.FAILED, ScriptStatus.SKIPPED)
+
+
+@dataclasses.dataclass(frozen=True)
+class Script:
+    name: str
+    path: Path
+    when: ScriptExecuterEnum
+    args: tuple[str, ...] = ()
+    depends_on: tuple[str, ...] = ()
+    inputs: tuple[Path, ...] = ()
+    cwd: t.Optional[Path] = None
+    timeout: t.Optional[float] = None
+    cache: bool = True
+
+    @property
+    def command(self) -> list[str]:
+        if self.path.suffix == ".py":
+            return [sys.executable, str(self.path), *self.args]
+        return [str(self.path), *self.args]
+
+
+@dataclasses.dataclass
+class ScriptRun:
+    name: str
+    when: str
+    status: ScriptStatus
+    duration: float = 0.0
+    returncode: t.Optional[int] = None
+    # Конец вывода скрипта (для сообщения об ошибке).
+    output: str = ""
+
+    def as_dict(self) -> dict[str, t.Any]:
+        return {**dataclasses.asdict(self), "status": self.status.value}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, t.Any], /) -> ScriptRun:
+        return cls(**{**data, "status": ScriptStatus(data["status"])})
+
+
+class ScriptExecutionError(Exception):
+    def __init__(self, runs: t.Sequence[ScriptRun], /) -> None:
+        self.runs = list(runs)
+        details = "\n".join(
+            f"- {run.name}: код возврата {run.returncode}\n{run.output.rstrip()}" for run in self.runs
+        )
+        super().__init__(f"Скрипты сессии завершились с ошибкой: {len(self.runs)}.\n{details}")
+
+
 class ScriptExecuter:
+    """Реестр и исполнитель скриптов сессии.
+
+    Args:
+        state_dir (typing.Union[str, os.PathLike, None]): каталог состояния (отпечатки, блокировка, результаты
+            этапов); если не задан, его нужно присвоить атрибуту `state_dir` до вызова `run`.
+        max_workers (int): количество одновременно выполняемых скриптов.
+        use_cache (bool): пропускать скрипты с неизменившимся отпечатком.
+    """
+
     when = ScriptExecuterEnum
+    # Конец вывода скрипта, сохраняемый в результате.
+    output_tail = 4096
+
+    def __init__(
+        self,
+        state_dir: t.Union[str, os.PathLike, None] = None,
+        /,
+        *,
+        max_workers: int = 4,
+        use_cache: bool = True,
+    ) -> None:
+        self.state_dir = Path(state_dir) if state_dir is not None else None
+        self.max_workers = max_workers
+        self.use_cache = use_cache
+        self.scripts: dict[str, Script] = {}
+        self.runs: list[ScriptRun] = []
 
     def run_on(
         self,
@@ -17,5 +140,220 @@ class ScriptExecuter:
         /,
         *,
         when: ScriptExecuterEnum = ScriptExecuterEnum.BEFORE_SESSION_START,
-    ) -> None:
-        pass
+        name: t.Optional[str] = None,
+        args: t.Sequence[str] = (),
+        depends_on: t.Sequence[str] = (),
+        inputs: t.Sequence[t.Union[str, os.PathLike]] = (),
+        cwd: t.Optional[t.Union[str, os.PathLike]] = None,
+        timeout: t.Optional[float] = None,
+        cache: bool = True,
+    ) -> Script:
+        """Регистрация скрипта на этап сессии.
+
+        Args:
+            path_to_script (pathlib.Path): путь к скрипту (.py запускается текущим интерпретатором,
+                остальные — как исполняемые файлы).
+            when (ScriptExecuterEnum): этап сессии.
+            name (typing.Optional[str]): имя скрипта для зависимостей и отчета (по умолчанию — имя файла).
+            args (typing.Sequence[str]): аргументы командной строки.
+            depends_on (typing.Sequence[str]): имена скриптов того же этапа, после которых запускается скрипт.
+            inputs (typing.Sequence[typing.Union[str, os.PathLike]]): файлы и каталоги, от которых зависит
+                результат скрипта (входят в отпечаток).
+            cwd (typing.Optional[typing.Union[str, os.PathLike]]): рабочий каталог скрипта.
+            timeout (typing.Optional[float]): таймаут выполнения в секундах.
+            cache (bool): пропускать скрипт с неизменившимся отпечатком.
+
+        Returns:
+            Script: зарегистрированный скрипт.
+        """
+        path = Path(path_to_script).resolve()
+        script = Script(
+            name=name or path.name,
+            path=path,
+            when=when,
+            args=tuple(str(arg) for arg in args),
+            depends_on=tuple(depends_on),
+            inputs=tuple(Path(item).resolve() for item in inputs),
+            cwd=Path(cwd) if cwd is not None else None,
+            timeout=timeout,
+            cache=cache,
+        )
+        if script.name in self.scripts:
+            raise ValueError(f"Скрипт с именем {script.name!r} уже зарегистрирован.")
+        self.scripts[script.name] = script
+        return script
+
+    def run(self, when: ScriptExecuterEnum, /, *, session: t.Optional[str] = None) -> list[ScriptRun]:
+        """Выполнение этапа (один раз за сессию).
+
+        Args:
+            when (ScriptExecuterEnum): этап сессии.
+            session (typing.Optional[str]): идентификатор сессии (по умолчанию `session_id()`).
+
+        Returns:
+            list[ScriptRun]: результаты скриптов этапа.
+
+        Raises:
+            ScriptExecutionError: часть скриптов завершилась с ошибкой.
+        """
+        scripts = self._ordered(when)
+        if not scripts:
+            return []
+        if self.state_dir is None:
+            raise ValueError("Не задан каталог состояния скриптов (state_dir).")
+        marker = self.state_dir / "stages" / f"{session or session_id()}-{when.name.lower()}.json"
+        with FileLock(self.state_dir / "lock"):
+            if marker.exists():
+                # Этап уже выполнен другим процессом этой сессии.
+                runs = [ScriptRun.from_dict(item) for item in json.loads(marker.read_text(encoding="utf-8"))]
+            else:
+                runs = self._run_stage(scripts)
+                marker.parent.mkdir(parents=True, exist_ok=True)
+                marker.write_text(json.dumps([run.as_dict() for run in runs], ensure_ascii=False), encoding="utf-8")
+                self._prune_markers(marker.parent)
+        self.runs.extend(runs)
+        if failed := [run for run in runs if run.status is ScriptStatus.FAILED]:
+            raise ScriptExecutionError(failed)
+        return runs
+
+    def _ordered(self, when: ScriptExecuterEnum, /) -> list[Script]:
+        # Топологический порядок скриптов этапа с проверкой зависимостей.
+        scripts = {name: script for name, script in self.scripts.items() if script.when is when}
+        ordered: list[Script] = []
+        state: dict[str, bool] = {}
+
+        def visit(script: Script, /) -> None:
+            if state.get(script.name) is True:
+                return
+            if state.get(script.name) is False:
+                raise ValueError(f"Циклическая зависимость скриптов: {script.name!r}.")
+            state[script.name] = False
+            for dependency in script.depends_on:
+                if dependency not in scripts:
+                    raise ValueError(
+                        f"Скрипт {script.name!r} зависит от незарегистрированного скрипта этапа {when.name}: "
+                        f"{dependency!r}."
+                    )
+                visit(scripts[dependency])
+            state[script.name] = True
+            ordered.append(script)
+
+        for script in scripts.values():
+            visit(script)
+        return ordered
+
+    def _run_stage(self, scripts: list[Script], /) -> list[ScriptRun]:
+        fingerprints = self._fingerprints(scripts)
+        known = self._load_fingerprints()
+        runs: dict[str, ScriptRun] = {}
+        futures: dict[concurrent.futures.Future, Script] = {}
+        waiting = list(scripts)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while waiting or futures:
+                for script in list(waiting):
+                    if any(dependency not in runs for dependency in script.depends_on):
+                        continue
+                    waiting.remove(script)
+                    if any(runs[dependency].status in _NOT_COMPLETED for dependency in script.depends_on):
+                        runs[script.name] = ScriptRun(script.name, script.when.name, ScriptStatus.SKIPPED)
+                    elif self.use_cache and script.cache and known.get(script.name) == fingerprints[script.name]:
+                        runs[script.name] = ScriptRun(script.name, script.when.name, ScriptStatus.CACHED)
+                    else:
+                        futures[executor.submit(self._execute, script)] = script
+                if not futures:
+                    continue
+                done, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    script = futures.pop(future)
+                    runs[script.name] = run = future.result()
+                    if run.status is ScriptStatus.PASSED:
+                        known[script.name] = fingerprints[script.name]
+                    else:
+                        known.pop(script.name, None)
+
+        self._save_fingerprints(known)
+        return [runs[script.name] for script in scripts]
+
+    def _execute(self, script: Script, /) -> ScriptRun:
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                script.command,
+                cwd=script.cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=script.timeout,
+                check=False,
+            )
+        except subprocess.TimeoutExpired as ex:
+            output = (ex.output or b"").decode("utf-8", "replace")
+            output += f"\nПревышен таймаут выполнения: {script.timeout} с."
+            returncode = None
+        except OSError as ex:
+            output, returncode = f"{ex.__class__.__name__}: {ex}", None
+        else:
+            output, returncode = completed.stdout.decode("utf-8", "replace"), completed.returncode
+        return ScriptRun(
+            name=script.name,
+            when=script.when.name,
+            status=ScriptStatus.PASSED if returncode == 0 else ScriptStatus.FAILED,
+            duration=time.perf_counter() - started,
+            returncode=returncode,
+            output=output[-self.output_tail :],
+        )
+
+    def _fingerprints(self, scripts: list[Script], /) -> dict[str, str]:
+        # Скрипты в топологическом порядке: отпечатки зависимостей уже вычислены.
+        fingerprints: dict[str, str] = {}
+        for script in scripts:
+            digest = hashlib.sha256()
+            digest.update(json.dumps([str(script.path), script.args, script.depends_on]).encode("utf-8"))
+            _hash_path(digest, script.path)
+            for item in script.inputs:
+                digest.update(str(item).encode("utf-8"))
+                _hash_path(digest, item)
+            for dependency in script.depends_on:
+                digest.update(fingerprints[dependency].encode("ascii"))
+            fingerprints[script.name] = digest.hexdigest()
+        return fingerprints
+
+    @property
+    def _fingerprints_path(self) -> Path:
+        return self.state_dir / "fingerprints.json"
+
+    def _load_fingerprints(self) -> dict[str, str]:
+        try:
+            return json.loads(self._fingerprints_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_fingerprints(self, fingerprints: dict[str, str], /) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self._fingerprints_path.write_text(json.dumps(fingerprints, indent=2, sort_keys=True), encoding="utf-8")
+
+    @staticmethod
+    def _prune_markers(directory: Path, /) -> None:
+        expired = time.time() - _STAGE_MARKER_TTL
+        for path in directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime < expired:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+
+def _hash_path(digest: t.Any, path: Path, /) -> None:
+    # Содержимое файла или всех файлов каталога (с относительными путями); отсутствующий путь — отдельная метка.
+    if path.is_dir():
+        for item in sorted(path.rglob("*")):
+            if item.is_file():
+                digest.update(str(item.relative_to(path)).encode("utf-8"))
+                _hash_path(digest, item)
+        return
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        digest.update(b"\0missing")
@@ -0,0 +1,182 @@
+"""Параллельный прогон одного теста в нескольких конфигурациях браузера (fan-out).
+
+Тест, запрашивающий фикстуру `xtest_fanout_driver`, выполняется одновременно в потоках — по одному
+на конфигурацию из опции `--xtest-fanout` или маркера `xtest_fanout`. Работа с WebDriver — ожидание
+ответов браузера, поэтому потоки не упираются в GIL. Сессии каждой конфигурации берутся из
+собственного пула (`DriverPool`) и переиспользуются между тестами.
+
+Остальные фикстуры теста общие для всех потоков и должны быть потокобезопасными.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import enum
+import threading
+import time
+import traceback
+import typing as t
+
+from pytest_xtest.drivers import DriverConfig, parse_window_size
+from pytest_xtest.pool import DriverPool, DriverPoolStats
+
+if t.TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+
+def parse_fanout(
+    entries: t.Iterable[t.Union[str, DriverConfig]], /, *, base: DriverConfig
+) -> tuple[DriverConfig, ...]:
+    """Конфигурации fan-out из записей вида "chrome", "firefox@1280x720".
+
+    Остальные параметры (headless, remote_url, стратегия загрузки) берутся из `base`.
+
+    Args:
+        entries (typing.Iterable[typing.Union[str, DriverConfig]]): записи или готовые конфигурации.
+        base (DriverConfig): конфигурация по умолчанию.
+
+    Returns:
+        tuple[DriverConfig, ...]: конфигурации без повторов, в порядке записей.
+    """
+    configs: dict[DriverConfig, None] = {}
+    for entry in entries:
+        if isinstance(entry, str):
+            browser, _, size = entry.strip().partition("@")
+            entry = dataclasses.replace(
+                base, browser=browser or base.browser, window_size=parse_window_size(size) or base.window_size
+            )
+        configs[entry] = None
+    return tuple(configs)
+
+
+@enum.unique
+class FanoutStatus(enum.Enum):
+    PASSED = "passed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+@dataclasses.dataclass
+class FanoutResult:
+    config: DriverConfig
+    status: FanoutStatus
+    duration: float
+    # Краткое описание исключения (или причина пропуска).
+    message: t.Optional[str] = None
+    traceback: t.Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+
+class FanoutError(AssertionError):
+    """Тест не прошел хотя бы в одной конфигурации."""
+
+    def __init__(self, results: t.Sequence[FanoutResult], /) -> None:
+        self.results = list(results)
+        failed = [result for result in self.results if result.status is FanoutStatus.FAILED]
+        lines = [f"Тест не прошел в {len(failed)} из {len(self.results)} конфигураций:"]
+        lines.extend(f"  {result.name}: {result.message}" for result in failed)
+        super().__init__("\n".join(lines))
+
+
+class DriverFanout:
+    """Прогон функции с WebDriver одновременно в нескольких конфигурациях.
+
+    Args:
+        factory (typing.Callable[[DriverConfig], WebDriver]): создание сессии по конфигурации.
+        max_uses (typing.Optional[int]): количество тестов, после которого сессия пересоздается.
+        skip_exceptions (tuple[type[BaseException], ...]): исключения, означающие пропуск теста
+            (например, `pytest.skip.Exception`).
+    """
+
+    def __init__(
+        self,
+        factory: t.Callable[[DriverConfig], WebDriver],
+        /,
+        *,
+        max_uses: t.Optional[int] = None,
+        skip_exceptions: tuple[type[BaseException], ...] = (),
+    ) -> None:
+        self.max_uses = max_uses
+        self.skip_exceptions = skip_exceptions
+        self._factory = factory
+        self._pools: dict[DriverConfig, DriverPool] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} configs={[config.name for config in self._pools]}>"
+
+    def pool(self, config: DriverConfig, /) -> DriverPool:
+        # Тесты воркера выполняются последовательно: одной конфигурации достаточно одной сессии.
+        with self._lock:
+            if (pool := self._pools.get(config)) is None:
+                pool = self._pools[config] = DriverPool(lambda: self._factory(config), size=1, max_uses=self.max_uses)
+            return pool
+
+    @property
+    def stats(self) -> DriverPoolStats:
+        stats = DriverPoolStats()
+        for pool in self._pools.values():
+            stats.merge(pool.stats)
+        return stats
+
+    def run(
+        self,
+        func: t.Callable[[WebDriver, DriverConfig], t.Any],
+        configs: t.Sequence[DriverConfig],
+        /,
+    ) -> list[FanoutResult]:
+        """Вызов `func(driver, config)` для всех конфигураций одновременно.
+
+        Исключения функции не прерывают остальные конфигурации, а попадают в результаты.
+
+        Returns:
+            list[FanoutResult]: результаты в порядке `configs`.
+        """
+        if not configs:
+            raise ValueError("Не заданы конфигурации браузеров для fan-out.")
+        with concurrent.futures.ThreadPoolExecutor(len(configs), thread_name_prefix="xtest-fanout") as executor:
+            futures = [executor.submit(self._run_one, func, config) for config in configs]
+        return [future.result() for future in futures]
+
+    def _run_one(self, func: t.Callable[[WebDriver, DriverConfig], t.Any], config: DriverConfig, /) -> FanoutResult:
+        from selenium.common import TimeoutException, WebDriverException
+
+        started = time.perf_counter()
+        pool = self.pool(config)
+        try:
+            driver = pool.acquire()
+        except Exception as ex:  # pylint: disable=broad-except
+            return FanoutResult(
+                config, FanoutStatus.FAILED, time.perf_counter() - started, _describe(ex), traceback.format_exc()
+            )
+        discard = False
+        try:
+            func(driver, config)
+        except self.skip_exceptions as ex:
+            return FanoutResult(config, FanoutStatus.SKIPPED, time.perf_counter() - started, str(ex) or None)
+        except BaseException as ex:  # pylint: disable=broad-except
+            # `pytest.fail()` и `pytest.xfail()` выбрасывают исключения, не унаследованные от Exception:
+            # они тоже считаются падением в конфигурации, прерывание прогона передается дальше.
+            if isinstance(ex, (KeyboardInterrupt, SystemExit)):
+                raise
+            # Ошибка WebDriver (кроме таймаутов ожиданий) — сессия могла сломаться и не возвращается в пул.
+            discard = isinstance(ex, WebDriverException) and not isinstance(ex, TimeoutException)
+            return FanoutResult(
+                config, FanoutStatus.FAILED, time.perf_counter() - started, _describe(ex), traceback.format_exc()
+            )
+        finally:
+            pool.release(driver, discard=discard)
+        return FanoutResult(config, FanoutStatus.PASSED, time.perf_counter() - started)
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.close()
+
+
+def _describe(error: BaseException, /) -> str:
+    return "".join(traceback.format_exception_only(type(error), error)).strip()
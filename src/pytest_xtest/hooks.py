@@ -0,0 +1,26 @@
+"""Хуки плагина pytest_xtest, реализуемые в conftest.py."""
+from __future__ import annotations
+
+import typing as t
+
+if t.TYPE_CHECKING:
+    import pytest
+
+    from pytest_xtest.executer import ScriptExecuter
+    from xtest.processrunner import ProcessRunner
+
+
+def pytest_xtest_scripts(executer: ScriptExecuter) -> None:
+    """Регистрация скриптов сессии через `executer.run_on(...)`.
+
+    Вызывается в начале сессии в контроллере и в каждом воркере xdist; регистрация должна быть
+    одинаковой во всех процессах, а выполняется каждый этап один раз.
+    """
+
+
+def pytest_xtest_processes(config: pytest.Config) -> t.Optional[t.Iterable[ProcessRunner]]:
+    """Вспомогательные сервисы сессии (`xtest.processrunner.ProcessRunner`).
+
+    Сервисы запускаются параллельно в начале сессии, до скриптов `pytest_xtest_scripts`, по одному
+    экземпляру на сессию: воркеры xdist подключаются к сервисам, запущенным контроллером.
+    """
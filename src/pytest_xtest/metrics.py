@@ -0,0 +1,49 @@
+"""Отчет по замерам вызовов API и WebDriver (`xtest.utils.instrumentation`) для плагина."""
+from __future__ import annotations
+
+import json
+import typing as t
+from pathlib import Path
+
+from xtest.utils.instrumentation import CallRecord, summarize
+
+
+def per_test_totals(records: t.Iterable[CallRecord], /) -> dict[str, dict[str, float]]:
+    """Суммарное время вызовов из тестов по видам ("api", "ui") для каждого теста."""
+    totals: dict[str, dict[str, float]] = {}
+    for record in records:
+        if record.depth == 0 and record.test_id is not None:
+            test_totals = totals.setdefault(record.test_id, {})
+            test_totals[record.kind] = test_totals.get(record.kind, 0.0) + record.duration
+    return totals
+
+
+def build_report(records: list[CallRecord], /, *, top: int) -> dict[str, t.Any]:
+    report = summarize(records, top=top)
+    report["tests"] = per_test_totals(records)
+    return report
+
+
+def write_report(report: dict[str, t.Any], path: t.Union[str, Path], /) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def format_report(report: dict[str, t.Any], /, *, top: int) -> list[str]:
+    lines = [f"{'вызов':<60}{'count':>7}{'p50, мс':>10}{'p95, мс':>10}{'max, мс':>10}{'total, с':>10}"]
+    for item in report["targets"][:top]:
+        call = f"[{item['kind']}] {item['name']} {item['target']}"
+        lines.append(
+            f"{call[:59]:<60}{item['count']:>7}{item['p50'] * 1000:>10.0f}{item['p95'] * 1000:>10.0f}"
+            f"{item['max'] * 1000:>10.0f}{item['total']:>10.2f}"
+        )
+    if report["slowest"]:
+        lines.append("")
+        lines.append("самые медленные вызовы:")
+        for item in report["slowest"]:
+            lines.append(
+                f"{item['duration']:8.2f} с  [{item['kind']}] {item['name']} {item['target']}"
+                f"  (опрос: {item['polls']}, повторы: {item['retries']})  {item['test_id'] or ''}"
+            )
+    return lines
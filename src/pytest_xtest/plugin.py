@@ -0,0 +1,633 @@
+"""Pytest-плагин xtest: опции командной строки и фикстуры для UI и API.
+
+Тяжелые зависимости (selenium, requests, pydantic, boto3) импортируются только внутри фикстур,
+поэтому `--collect-only` и фильтрация `-k` не тратят время на их загрузку.
+"""
+from __future__ import annotations
+
+import dataclasses
+import os
+import typing as t
+from pathlib import Path
+
+import pytest
+
+from pytest_xtest.drivers import (
+    BROWSERS,
+    PAGE_LOAD_STRATEGIES,
+    DriverConfig,
+    parse_window_size,
+)
+from pytest_xtest.pool import DriverPool, DriverPoolStats, pool_size_per_worker
+
+if t.TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    from pytest_xtest.executer import ScriptExecuter
+    from pytest_xtest.fanout import DriverFanout
+    from xtest.api import APIClientBase, ResponseCache
+    from xtest.pom.session_state import SessionSnapshots
+    from xtest.processrunner import ProcessRunner
+    from xtest.utils.allurecollector import AllureCollector
+    from xtest.utils.awsutil import AWSClient
+    from xtest.utils.instrumentation import CallRecorder
+    from xtest.utils.keycloak import KeycloakClient
+
+_pool_stats_key = pytest.StashKey[DriverPoolStats]()
+_recorder_key: pytest.StashKey[CallRecorder] = pytest.StashKey()
+_metrics_report_key = pytest.StashKey[dict]()
+_allure_key = pytest.StashKey["AllureCollector"]()
+_executer_key: pytest.StashKey[ScriptExecuter] = pytest.StashKey()
+_scripts_error_key = pytest.StashKey[str]()
+# Значение переменной идентификатора сессии до запуска (восстанавливается в `pytest_unconfigure`).
+_previous_session_id_key = pytest.StashKey[t.Optional[str]]()
+_processes_key = pytest.StashKey[dict[str, "ProcessRunner"]]()
+_allure_status_key = pytest.StashKey[tuple[str, t.Optional[str], t.Optional[str]]]()
+# Конфигурация браузера -> количество тестов по статусам (passed/failed/skipped).
+_fanout_summary_key = pytest.StashKey[dict[str, dict[str, int]]]()
+
+# (имя опции, параметры argparse, тип ini-параметра, описание)
+_OPTIONS: tuple[tuple[str, dict[str, t.Any], str, str], ...] = (
+    ("browser", {"choices": BROWSERS}, "string", "Браузер для фикстуры xtest_driver (по умолчанию chrome)."),
+    ("headless", {"action": "store_true", "default": None}, "bool", "Запуск браузера без графического интерфейса."),
+    ("remote-url", {}, "string", "Адрес Selenium Grid. Если не задан, браузер запускается локально."),
+    ("window-size", {}, "string", 'Размер окна браузера, например "1920x1080".'),
+    (
+        "page-load-strategy",
+        {"choices": PAGE_LOAD_STRATEGIES},
+        "string",
+        "Стратегия загрузки страниц WebDriver (по умолчанию normal).",
+    ),
+    (
+        "pool-size",
+        {"type": int},
+        "string",
+        "Общее количество сессий пула xtest_pooled_driver на все воркеры xdist (по умолчанию 1 на воркер).",
+    ),
+    ("pool-max-uses", {"type": int}, "string", "Количество тестов, после которого сессия пула пересоздается."),
+    ("pool-timeout", {"type": float}, "string", "Таймаут ожидания свободной сессии пула, в секундах."),
+    (
+        "fanout",
+        {},
+        "string",
+        'Конфигурации браузеров для тестов с xtest_fanout_driver через запятую, например "chrome,firefox@1280x720".',
+    ),
+    (
+        "metrics",
+        {"action": "store_true", "default": None},
+        "bool",
+        "Замеры длительности вызовов API и WebDriver со сводкой в конце прогона.",
+    ),
+    ("metrics-json", {}, "string", "Путь к JSON-отчету по замерам вызовов (включает замеры)."),
+    ("metrics-top", {"type": int}, "string", "Количество строк в сводке по замерам (по умолчанию 10)."),
+    (
+        "allure-dir",
+        {},
+        "string",
+        "Каталог результатов Allure: результаты пишутся в фоне и раскладываются в конце прогона.",
+    ),
+    ("api-url", {}, "string", "Базовый URL для фикстуры xtest_api_client."),
+    (
+        "api-cache",
+        {"choices": ("cache", "record", "replay")},
+        "string",
+        "Кэш ответов API-клиентов: cache — кэш GET/HEAD, record — запись кассеты, replay — прогон без сети.",
+    ),
+    ("api-cache-dir", {}, "string", "Каталог кэша/кассеты ответов (по умолчанию в каталоге кэша pytest)."),
+    ("api-cache-ttl", {"type": float}, "string", "Время жизни ответа в кэше, в секундах (только режим cache)."),
+    ("keycloak-url", {}, "string", "URL Keycloak для фикстуры xtest_keycloak_client."),
+    ("keycloak-realm", {}, "string", "Realm Keycloak."),
+    ("keycloak-client-id", {}, "string", "Client ID сервисного аккаунта Keycloak."),
+    ("keycloak-client-secret", {}, "string", "Client secret сервисного аккаунта Keycloak."),
+    (
+        "keycloak-keep-users",
+        {"action": "store_true", "default": None},
+        "bool",
+        "Не удалять пользователей, созданных через xtest_keycloak_client, в конце сессии.",
+    ),
+    ("scripts-workers", {"type": int}, "string", "Количество одновременно выполняемых скриптов сессии."),
+    (
+        "scripts-no-cache",
+        {"action": "store_true", "default": None},
+        "bool",
+        "Запускать скрипты сессии, даже если их входные данные не изменились.",
+    ),
+    (
+        "session-state-ttl",
+        {"type": float},
+        "string",
+        "Время жизни снимков состояния входа xtest_session_snapshots, в секундах (по умолчанию 600).",
+    ),
+    ("aws-bucket", {}, "string", "Бакет S3-совместимого хранилища для фикстуры xtest_aws_client."),
+    ("aws-access-key", {}, "string", "Ключ доступа к хранилищу."),
+    ("aws-secret-key", {}, "string", "Секретный ключ хранилища."),
+    ("aws-endpoint-url", {}, "string", "Адрес хранилища (по умолчанию https://storage.yandexcloud.net)."),
+    ("aws-upload-workers", {"type": int}, "string", "Количество потоков фоновой загрузки артефактов."),
+)
+
+
+def pytest_addhooks(pluginmanager: pytest.PytestPluginManager) -> None:
+    from pytest_xtest import hooks
+
+    pluginmanager.add_hookspecs(hooks)
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("xtest", "xtest: UI и API автоматизация")
+    for name, kwargs, ini_type, help_text in _OPTIONS:
+        dest = f"xtest_{name.replace('-', '_')}"
+        group.addoption(f"--xtest-{name}", dest=dest, help=help_text, **kwargs)
+        parser.addini(dest, help=help_text, type=ini_type, default=None)
+
+
+def get_option(config: pytest.Config, name: str, /, default: t.Any = None) -> t.Any:
+    """Значение опции xtest: командная строка имеет приоритет над ini-файлом.
+
+    Args:
+        config (pytest.Config): конфигурация pytest.
+        name (str): имя опции без префикса, например "remote-url".
+        default (typing.Any): значение, если опция не задана.
+
+    Returns:
+        typing.Any: значение опции.
+    """
+    dest = f"xtest_{name.replace('-', '_')}"
+    value = config.getoption(dest)
+    if value is None:
+        value = config.getini(dest)
+    if value is None or value == "":
+        return default
+    return value
+
+
+def _require_option(config: pytest.Config, name: str, /) -> str:
+    value = get_option(config, name)
+    if value is None:
+        pytest.fail(f"Не задана опция --xtest-{name} (или xtest_{name.replace('-', '_')} в ini-файле).", pytrace=False)
+    return value
+
+
+def _int_option(config: pytest.Config, name: str, /) -> t.Optional[int]:
+    value = get_option(config, name)
+    return None if value is None else int(value)
+
+
+@pytest.fixture(scope="session")
+def xtest_driver_config(pytestconfig: pytest.Config) -> DriverConfig:
+    return DriverConfig(
+        browser=get_option(pytestconfig, "browser", "chrome"),
+        headless=bool(get_option(pytestconfig, "headless", False)),
+        remote_url=get_option(pytestconfig, "remote-url"),
+        window_size=parse_window_size(get_option(pytestconfig, "window-size")),
+        page_load_strategy=get_option(pytestconfig, "page-load-strategy", "normal"),
+    )
+
+
+@pytest.fixture(scope="session")
+def xtest_driver(xtest_driver_config: DriverConfig) -> t.Iterator[WebDriver]:
+    from pytest_xtest.drivers import create_driver
+
+    driver = create_driver(xtest_driver_config)
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture(scope="session")
+def xtest_driver_pool(pytestconfig: pytest.Config, xtest_driver_config: DriverConfig) -> t.Iterator[DriverPool]:
+    from pytest_xtest.drivers import create_driver
+
+    pool = DriverPool(
+        lambda: create_driver(xtest_driver_config),
+        size=pool_size_per_worker(_int_option(pytestconfig, "pool-size")),
+        max_uses=_int_option(pytestconfig, "pool-max-uses"),
+    )
+    yield pool
+    pool.close()
+    pytestconfig.stash.setdefault(_pool_stats_key, DriverPoolStats()).merge(pool.stats)
+
+
+@pytest.fixture
+def xtest_pooled_driver(pytestconfig: pytest.Config, xtest_driver_pool: DriverPool) -> t.Iterator[WebDriver]:
+    timeout = get_option(pytestconfig, "pool-timeout")
+    driver = xtest_driver_pool.acquire(timeout=None if timeout is None else float(timeout))
+    yield driver
+    xtest_driver_pool.release(driver)
+
+
+@pytest.fixture(scope="session")
+def xtest_fanout(pytestconfig: pytest.Config) -> t.Iterator[DriverFanout]:
+    """Сессии браузеров для параллельного прогона тестов с `xtest_fanout_driver` (по пулу на конфигурацию)."""
+    from pytest_xtest.drivers import create_driver
+    from pytest_xtest.fanout import DriverFanout
+
+    fanout = DriverFanout(
+        create_driver, max_uses=_int_option(pytestconfig, "pool-max-uses"), skip_exceptions=(pytest.skip.Exception,)
+    )
+    yield fanout
+    fanout.close()
+    pytestconfig.stash.setdefault(_pool_stats_key, DriverPoolStats()).merge(fanout.stats)
+
+
+@pytest.fixture
+def xtest_fanout_configs(
+    pytestconfig: pytest.Config, request: pytest.FixtureRequest, xtest_driver_config: DriverConfig
+) -> tuple[DriverConfig, ...]:
+    """Конфигурации браузеров теста: из маркера `xtest_fanout`, опции --xtest-fanout или `xtest_driver_config`."""
+    from pytest_xtest.fanout import parse_fanout
+
+    if (marker := request.node.get_closest_marker("xtest_fanout")) is not None and marker.args:
+        entries = marker.args
+    elif option := get_option(pytestconfig, "fanout"):
+        entries = option.split(",")
+    else:
+        entries = (xtest_driver_config,)
+    return parse_fanout(entries, base=xtest_driver_config)
+
+
+@pytest.fixture
+def xtest_fanout_driver(xtest_fanout: DriverFanout, xtest_fanout_configs: tuple[DriverConfig, ...]) -> None:
+    """WebDriver конфигурации из `xtest_fanout_configs`.
+
+    Тест с этой фикстурой выполняется одновременно для всех конфигураций, каждый раз в своем
+    потоке; значение подставляется при вызове теста (см. `pytest_pyfunc_call`).
+    """
+    return None
+
+
+@pytest.fixture
+def xtest_fanout_config(xtest_fanout_configs: tuple[DriverConfig, ...]) -> None:
+    """Конфигурация браузера текущего потока теста с `xtest_fanout_driver`."""
+    return None
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> t.Optional[bool]:
+    if "xtest_fanout_driver" not in pyfuncitem.funcargs:
+        return None
+    __tracebackhide__ = True  # pylint: disable=unused-variable
+    import inspect
+
+    from pytest_xtest.fanout import FanoutError, FanoutStatus
+
+    funcargs = pyfuncitem.funcargs
+    testfunction = pyfuncitem.obj
+    testargs = {name: funcargs[name] for name in inspect.signature(testfunction).parameters if name in funcargs}
+
+    def call(driver: WebDriver, config: DriverConfig) -> None:
+        kwargs = dict(testargs, xtest_fanout_driver=driver)
+        if "xtest_fanout_config" in kwargs:
+            kwargs["xtest_fanout_config"] = config
+        testfunction(**kwargs)
+
+    results = funcargs["xtest_fanout"].run(call, funcargs["xtest_fanout_configs"])
+    summary = pyfuncitem.config.stash.setdefault(_fanout_summary_key, {})
+    for result in results:
+        counts = summary.setdefault(result.name, {})
+        counts[result.status.value] = counts.get(result.status.value, 0) + 1
+    lines = [f"{result.name:<32}{result.status.value:<9}{result.duration:>8.2f} с" for result in results]
+    # Трассировки упавших конфигураций: исключение теста возникло в потоке fan-out.
+    lines.extend(f"\n[{result.name}]\n{result.traceback}" for result in results if result.traceback)
+    pyfuncitem.add_report_section("call", "xtest fan-out", "\n".join(lines))
+    if any(result.status is FanoutStatus.FAILED for result in results):
+        raise FanoutError(results)
+    if all(result.status is FanoutStatus.SKIPPED for result in results):
+        pytest.skip("; ".join(f"{result.name}: {result.message}" for result in results))
+    return True
+
+
+@pytest.fixture(scope="session")
+def xtest_response_cache(pytestconfig: pytest.Config) -> t.Optional[ResponseCache]:
+    mode = get_option(pytestconfig, "api-cache")
+    if mode is None:
+        return None
+
+    from xtest.api import CacheMode, DiskStore, ResponseCache
+
+    directory = get_option(pytestconfig, "api-cache-dir")
+    if directory is None:
+        # Без плагина cacheprovider (-p no:cacheprovider) атрибута cache нет.
+        if (cache := getattr(pytestconfig, "cache", None)) is not None:
+            directory = cache.mkdir("xtest-responses")
+        else:
+            directory = pytestconfig.rootpath / ".xtest_cache" / "responses"
+    ttl = get_option(pytestconfig, "api-cache-ttl")
+    mode = CacheMode(mode)
+    # Каталог общий для воркеров xdist; кассета в режиме replay не устаревает.
+    store = DiskStore(directory, ttl=float(ttl) if ttl is not None and mode is CacheMode.CACHE else None)
+    return ResponseCache(store, mode=mode)
+
+
+@pytest.fixture(scope="session")
+def xtest_api_client(
+    pytestconfig: pytest.Config, xtest_response_cache: t.Optional[ResponseCache]
+) -> APIClientBase:
+    from xtest.api import APIClientBase
+
+    return APIClientBase(_require_option(pytestconfig, "api-url"), response_cache=xtest_response_cache)
+
+
+@pytest.fixture(scope="session")
+def xtest_keycloak_client(
+    pytestconfig: pytest.Config, xtest_response_cache: t.Optional[ResponseCache]
+) -> t.Iterator[KeycloakClient]:
+    from xtest.utils.keycloak import KeycloakClient
+
+    client = KeycloakClient(
+        _require_option(pytestconfig, "keycloak-url"),
+        _require_option(pytestconfig, "keycloak-client-id"),
+        _require_option(pytestconfig, "keycloak-client-secret"),
+        _require_option(pytestconfig, "keycloak-realm"),
+        response_cache=xtest_response_cache,
+    )
+    yield client
+    if not get_option(pytestconfig, "keycloak-keep-users", False):
+        # Пользователи, созданные за сессию, удаляются одним параллельным проходом.
+        client.cleanup_created_users().raise_for_errors()
+
+
+@pytest.fixture(scope="session")
+def xtest_session_snapshots(pytestconfig: pytest.Config, request: pytest.FixtureRequest) -> SessionSnapshots:
+    """Снимки состояния входа для `BasePageActions.open_page_as` (общие для воркеров xdist)."""
+    from xtest.api import DiskStore
+    from xtest.pom.session_state import SessionSnapshots
+
+    # Клиент Keycloak нужен только для первого входа пользователя и только если он настроен.
+    keycloak = request.getfixturevalue("xtest_keycloak_client") if get_option(pytestconfig, "keycloak-url") else None
+    ttl = get_option(pytestconfig, "session-state-ttl")
+    return SessionSnapshots(
+        DiskStore(_state_dir(pytestconfig, "xtest-sessions")),
+        keycloak=keycloak,
+        ttl=float(ttl) if ttl is not None else 600.0,
+    )
+
+
+@pytest.fixture(scope="session")
+def xtest_aws_client(pytestconfig: pytest.Config) -> t.Iterator[AWSClient]:
+    from xtest.utils.awsutil import DEFAULT_ENDPOINT_URL, AWSClient
+
+    workers = _int_option(pytestconfig, "aws-upload-workers")
+    client = AWSClient(
+        _require_option(pytestconfig, "aws-bucket"),
+        _require_option(pytestconfig, "aws-access-key"),
+        _require_option(pytestconfig, "aws-secret-key"),
+        endpoint_url=get_option(pytestconfig, "aws-endpoint-url", DEFAULT_ENDPOINT_URL),
+        max_workers=workers if workers is not None else 4,
+        background_uploads=True,
+    )
+    yield client
+    # Фоновые загрузки завершаются до конца сессии; ошибки загрузки попадают в отчет как ошибка teardown.
+    client.close()
+
+
+@pytest.fixture(scope="session")
+def xtest_allure(pytestconfig: pytest.Config) -> AllureCollector:
+    """Сборщик результатов Allure (шаги и вложения текущего теста)."""
+    if _allure_key not in pytestconfig.stash:
+        pytest.fail("Не задана опция --xtest-allure-dir (или xtest_allure_dir в ini-файле).", pytrace=False)
+    return pytestconfig.stash[_allure_key]
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        'xtest_fanout(*configs): конфигурации браузеров для теста с xtest_fanout_driver, например "firefox@1280x720".',
+    )
+    if not hasattr(config, "workerinput"):
+        from pytest_xtest.executer import SESSION_ID_ENV, session_id
+
+        # Новый идентификатор при каждом запуске: переменная могла остаться от предыдущего `pytest.main()`
+        # в этом процессе или прийти от прогона pytest, запустившего этот. Воркеры xdist наследуют его.
+        config.stash[_previous_session_id_key] = os.environ.pop(SESSION_ID_ENV, None)
+        session_id()
+    if get_option(config, "metrics", False) or get_option(config, "metrics-json"):
+        from xtest.utils import instrumentation
+
+        config.stash[_recorder_key] = instrumentation.enable()
+    if directory := get_option(config, "allure-dir"):
+        from xtest.utils.allurecollector import AllureCollector
+
+        config.stash[_allure_key] = AllureCollector(
+            directory, worker_id=os.environ.get("PYTEST_XDIST_WORKER", "master")
+        )
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    if (collector := config.stash.get(_allure_key, None)) is not None:
+        collector.close()
+    if _previous_session_id_key in config.stash:
+        from pytest_xtest.executer import SESSION_ID_ENV
+
+        if (previous := config.stash[_previous_session_id_key]) is None:
+            os.environ.pop(SESSION_ID_ENV, None)
+        else:
+            os.environ[SESSION_ID_ENV] = previous
+    if _recorder_key in config.stash:
+        from xtest.utils import instrumentation
+
+        instrumentation.disable()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: t.Optional[pytest.Item]) -> t.Iterator[None]:
+    recorder = item.config.stash.get(_recorder_key, None)
+    collector = item.config.stash.get(_allure_key, None)
+    if recorder is None and collector is None:
+        return (yield)
+    if recorder is not None:
+        recorder.test_id = item.nodeid
+    if collector is not None:
+        collector.start_test(item.name, full_name=item.nodeid, labels=_allure_labels(item))
+        item.stash[_allure_status_key] = ("passed", None, None)
+    try:
+        return (yield)
+    finally:
+        if recorder is not None:
+            recorder.test_id = None
+        if collector is not None:
+            status, message, trace = item.stash[_allure_status_key]
+            collector.stop_test(status, message=message, trace=trace)
+
+
+def _allure_labels(item: pytest.Item) -> dict[str, str]:
+    module, _, _ = item.nodeid.partition("::")
+    labels = {"suite": module, "framework": "pytest"}
+    if worker := os.environ.get("PYTEST_XDIST_WORKER"):
+        labels["thread"] = worker
+    return labels
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo) -> t.Iterator[pytest.TestReport]:
+    report = yield
+    if _allure_key not in item.config.stash or report.passed:
+        return report
+    status, _, _ = item.stash[_allure_status_key]
+    # Первый неуспешный этап определяет статус: ошибка в тесте — failed, в фикстурах — broken.
+    if status == "passed":
+        if report.skipped:
+            status = "skipped"
+        elif report.when == "call" and call.excinfo is not None and call.excinfo.errisinstance(AssertionError):
+            status = "failed"
+        else:
+            status = "broken"
+        message = call.excinfo.exconly() if call.excinfo is not None else None
+        item.stash[_allure_status_key] = (status, message, report.longreprtext)
+    return report
+
+
+@pytest.fixture(scope="session")
+def xtest_processes(pytestconfig: pytest.Config) -> dict[str, ProcessRunner]:
+    """Вспомогательные сервисы сессии (из хука pytest_xtest_processes) по именам."""
+    return pytestconfig.stash.get(_processes_key, {})
+
+
+def _state_dir(config: pytest.Config, name: str, /) -> Path:
+    # Без плагина cacheprovider (-p no:cacheprovider) атрибута cache нет.
+    if (cache := getattr(config, "cache", None)) is not None:
+        return cache.mkdir(name)
+    return config.rootpath / ".xtest_cache" / name
+
+
+def _start_processes(config: pytest.Config, /) -> None:
+    import concurrent.futures
+
+    from pytest_xtest.executer import session_id
+
+    runners = [runner for result in config.hook.pytest_xtest_processes(config=config) for runner in result or ()]
+    if not runners:
+        return
+    config.stash[_processes_key] = {runner.name: runner for runner in runners}
+    state_dir = _state_dir(config, "xtest-processes")
+    session = session_id()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(runners)) as executor:
+        futures = [executor.submit(runner.run_shared, state_dir, session=session) for runner in runners]
+    if errors := [str(error) for future in futures if (error := future.exception()) is not None]:
+        # Запущенные сервисы останавливаются, если хотя бы один не стал готов.
+        _stop_processes(config)
+        pytest.exit("\n".join(errors), returncode=pytest.ExitCode.INTERNAL_ERROR)
+
+
+def _stop_processes(config: pytest.Config, /) -> None:
+    for runner in config.stash.get(_processes_key, {}).values():
+        runner.teardown_process()
+
+
+def pytest_sessionstart(session: pytest.Session) -> None:
+    from pytest_xtest.executer import ScriptExecuter, ScriptExecutionError
+
+    config = session.config
+    _start_processes(config)
+    workers = _int_option(config, "scripts-workers")
+    executer = ScriptExecuter(
+        max_workers=workers if workers is not None else 4,
+        use_cache=not get_option(config, "scripts-no-cache", False),
+    )
+    config.hook.pytest_xtest_scripts(executer=executer)
+    if not executer.scripts:
+        return
+    # Каталог состояния создается, только если скрипты зарегистрированы.
+    executer.state_dir = _state_dir(config, "xtest-scripts")
+    config.stash[_executer_key] = executer
+    try:
+        executer.run(ScriptExecuter.when.BEFORE_SESSION_START)
+    except ScriptExecutionError as ex:
+        pytest.exit(str(ex), returncode=pytest.ExitCode.INTERNAL_ERROR)
+
+
+def _run_after_session_scripts(session: pytest.Session) -> None:
+    from pytest_xtest.executer import ScriptExecutionError
+
+    if (executer := session.config.stash.get(_executer_key, None)) is None:
+        return
+    try:
+        executer.run(executer.when.AFTER_SESSION_FINISH)
+    except ScriptExecutionError as ex:
+        session.config.stash[_scripts_error_key] = str(ex)
+        if session.exitstatus == pytest.ExitCode.OK:
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    config = session.config
+    if (collector := config.stash.get(_allure_key, None)) is not None:
+        # Воркеры дописывают свои результаты до того, как контроллер их разложит.
+        collector.close()
+        if not hasattr(config, "workeroutput"):
+            from xtest.utils.allurecollector import export_allure
+
+            export_allure(collector.directory)
+    # Воркер xdist передает статистику пула и замеры вызовов контроллеру.
+    if hasattr(config, "workeroutput"):
+        if _pool_stats_key in config.stash:
+            config.workeroutput["xtest_pool_stats"] = dataclasses.asdict(config.stash[_pool_stats_key])
+        if _fanout_summary_key in config.stash:
+            config.workeroutput["xtest_fanout_summary"] = config.stash[_fanout_summary_key]
+        if _recorder_key in config.stash:
+            config.workeroutput["xtest_calls"] = [
+                dataclasses.asdict(record) for record in config.stash[_recorder_key].drain()
+            ]
+        _stop_processes(config)
+        return
+
+    # Скрипты завершения выполняются контроллером после того, как все воркеры закончили тесты.
+    _run_after_session_scripts(session)
+    _stop_processes(config)
+
+    if _recorder_key in config.stash:
+        from pytest_xtest.metrics import build_report, write_report
+
+        report = build_report(config.stash[_recorder_key].drain(), top=int(get_option(config, "metrics-top", 10)))
+        config.stash[_metrics_report_key] = report
+        if path := get_option(config, "metrics-json"):
+            write_report(report, path)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: t.Any, error: t.Any) -> None:
+    workeroutput = getattr(node, "workeroutput", {})
+    if stats := workeroutput.get("xtest_pool_stats"):
+        node.config.stash.setdefault(_pool_stats_key, DriverPoolStats()).merge(DriverPoolStats(**stats))
+    if fanout_summary := workeroutput.get("xtest_fanout_summary"):
+        summary = node.config.stash.setdefault(_fanout_summary_key, {})
+        for name, counts in fanout_summary.items():
+            merged = summary.setdefault(name, {})
+            for status, count in counts.items():
+                merged[status] = merged.get(status, 0) + count
+    if (calls := workeroutput.get("xtest_calls")) and _recorder_key in node.config.stash:
+        from xtest.utils.instrumentation import CallRecord
+
+        node.config.stash[_recorder_key].records.extend(CallRecord(**call) for call in calls)
+
+
+def pytest_terminal_summary(terminalreporter: t.Any, config: pytest.Config) -> None:
+    if (executer := config.stash.get(_executer_key, None)) is not None and executer.runs:
+        terminalreporter.write_sep("-", "xtest: скрипты сессии")
+        for run in executer.runs:
+            terminalreporter.write_line(f"{run.when:<22}{run.status.value:<9}{run.duration:>8.2f} с  {run.name}")
+    if (error := config.stash.get(_scripts_error_key, None)) is not None:
+        terminalreporter.write_line(error, red=True)
+
+    if (report := config.stash.get(_metrics_report_key, None)) is not None and report["targets"]:
+        from pytest_xtest.metrics import format_report
+
+        terminalreporter.write_sep("-", "xtest: длительность вызовов API и WebDriver")
+        for line in format_report(report, top=int(get_option(config, "metrics-top", 10))):
+            terminalreporter.write_line(line)
+
+    if summary := config.stash.get(_fanout_summary_key, None):
+        terminalreporter.write_sep("-", "xtest: fan-out по конфигурациям браузеров")
+        for name, counts in sorted(summary.items()):
+            terminalreporter.write_line(
+                f"{name:<32}" + ", ".join(f"{status}: {count}" for status, count in sorted(counts.items()))
+            )
+
+    if (stats := config.stash.get(_pool_stats_key, None)) is None or not stats.acquisitions:
+        return
+    terminalreporter.write_sep("-", "xtest: пул сессий WebDriver")
+    terminalreporter.write_line(
+        f"выдано сессий: {stats.acquisitions}, переиспользовано: {stats.reused} ({stats.reuse_rate:.0%}), "
+        f"создано: {stats.created}, пересоздано: {stats.recycled}, закрыто после ошибки: {stats.discarded}"
+    )
+    terminalreporter.write_line(
+        f"ожидание сессии: всего {stats.wait_time:.1f} с, в среднем {stats.mean_wait_time * 1000:.0f} мс"
+    )
@@ -0,0 +1,296 @@
+"""Пул "прогретых" сессий WebDriver, переиспользуемых между тестами.
+
+Создание сессии браузера стоит секунды, поэтому сессии не закрываются после теста, а
+очищаются (`reset_driver`) и возвращаются в пул. Сессия пересоздается после `max_uses`
+использований или если она перестала отвечать (ошибка WebDriver при очистке).
+"""
+from __future__ import annotations
+
+import dataclasses
+import math
+import os
+import threading
+import time
+import typing as t
+from urllib.parse import urlparse
+
+if t.TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Данные origin, очищаемые CDP `Storage.clearDataForOrigin` (cookies очищаются отдельно для всех доменов).
+_CLEARED_STORAGE_TYPES = "local_storage,indexeddb,websql,cache_storage,service_workers,file_systems"
+
+# Очистка storage открытого документа (без CDP). Документ может запрещать доступ к storage.
+_CLEAR_STORAGE_JS = """
+for (const storage of ["localStorage", "sessionStorage"]) {
+    try { window[storage].clear(); } catch (error) {}
+}
+"""
+
+
+def xdist_worker_count() -> int:
+    """Количество воркеров pytest-xdist (1, если xdist не используется)."""
+    try:
+        return max(1, int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1")))
+    except ValueError:
+        return 1
+
+
+def pool_size_per_worker(total: t.Optional[int], /, *, workers: t.Optional[int] = None) -> int:
+    """Размер пула одного воркера.
+
+    Args:
+        total (typing.Optional[int]): общее количество сессий на все воркеры (например, число слотов
+            Selenium Grid). None — одна сессия на воркер: тесты внутри воркера выполняются последовательно.
+        workers (typing.Optional[int]): количество воркеров (по умолчанию из окружения pytest-xdist).
+
+    Returns:
+        int: количество сессий в пуле воркера (не меньше 1).
+    """
+    if total is None:
+        return 1
+    if total < 1:
+        raise ValueError(f"Размер пула должен быть >= 1: {total}.")
+    return max(1, math.floor(total / (workers or xdist_worker_count())))
+
+
+def _origin(url: str, /) -> t.Optional[str]:
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def reset_driver(driver: WebDriver, /) -> bool:
+    """Очистка состояния сессии между тестами: вкладки, storage и cookies всех посещенных origin.
+
+    С CDP (локальный Chromium) origin собираются из истории навигации всех вкладок, после чего
+    вкладки заменяются новой (sessionStorage и история не переносятся), а cookies и storage
+    очищаются командами CDP. Без CDP (Firefox, Selenium Grid) лишние вкладки закрываются, а на каждом
+    посещенном origin (известном `WindowManager` или открытом во вкладке) после перехода на него
+    удаляются cookies и очищаются localStorage и sessionStorage; IndexedDB и Cache Storage не очищаются.
+
+    Returns:
+        bool: True — сессия очищена, False — сессию нужно пересоздать.
+    """
+    from xtest.pom.windows import WindowManager
+
+    visited = WindowManager.for_driver(driver).visited_origins
+    # Вкладки закрываются в обход менеджера вкладок: его кэш сессии больше не актуален.
+    WindowManager.discard(driver)
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return _reset_driver_webdriver(driver, visited)
+
+    origins = set(visited)
+    handles = driver.window_handles
+    for handle in handles:
+        driver.switch_to.window(handle)
+        history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+        origins.update(origin for entry in history["entries"] if (origin := _origin(entry["url"])))
+    driver.switch_to.new_window("tab")
+    fresh = driver.current_window_handle
+    for handle in handles:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(fresh)
+
+    # Cookies всех доменов и storage каждого посещенного origin.
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    for origin in sorted(origins):
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": _CLEARED_STORAGE_TYPES})
+    return True
+
+
+def _reset_driver_webdriver(driver: WebDriver, visited: t.Iterable[str], /) -> bool:
+    # Cookies и storage доступны только документу своего origin, поэтому на каждый origin выполняется переход.
+    origins = set(visited)
+    handles = driver.window_handles
+    for handle in reversed(handles):
+        driver.switch_to.window(handle)
+        if origin := _origin(driver.current_url):
+            origins.add(origin)
+        if handle != handles[0]:
+            driver.close()
+
+    for origin in sorted(origins):
+        driver.get(f"{origin}/")
+        driver.delete_all_cookies()
+        driver.execute_script(_CLEAR_STORAGE_JS)
+    driver.get("about:blank")
+    return True
+
+
+@dataclasses.dataclass
+class DriverPoolStats:
+    acquisitions: int = 0
+    # Выдачи уже использованной сессии (без создания браузера).
+    reused: int = 0
+    created: int = 0
+    # Сессии, закрытые после `max_uses` использований или потому, что их нельзя очистить.
+    recycled: int = 0
+    # Сессии, закрытые из-за ошибки (упавший браузер, ошибка очистки).
+    discarded: int = 0
+    # Суммарное время ожидания свободной сессии и создания новой, в секундах.
+    wait_time: float = 0.0
+
+    @property
+    def reuse_rate(self) -> float:
+        return self.reused / self.acquisitions if self.acquisitions else 0.0
+
+    @property
+    def mean_wait_time(self) -> float:
+        return self.wait_time / self.acquisitions if self.acquisitions else 0.0
+
+    def merge(self, other: DriverPoolStats, /) -> None:
+        for field in dataclasses.fields(self):
+            setattr(self, field.name, getattr(self, field.name) + getattr(other, field.name))
+
+
+class DriverPoolTimeoutError(Exception):
+    pass
+
+
+@dataclasses.dataclass
+class _PooledSession:
+    driver: WebDriver
+    uses: int = 0
+
+
+class DriverPool:
+    """Потокобезопасный пул сессий WebDriver.
+
+    Args:
+        factory (typing.Callable[[], WebDriver]): создание новой сессии.
+        size (int): максимальное количество одновременно открытых сессий.
+        max_uses (typing.Optional[int]): количество выдач, после которого сессия пересоздается.
+        reset (typing.Callable[[WebDriver], bool]): очистка сессии перед возвратом в пул
+            (False — сессию нельзя очистить, она пересоздается).
+    """
+
+    def __init__(
+        self,
+        factory: t.Callable[[], WebDriver],
+        /,
+        *,
+        size: int = 1,
+        max_uses: t.Optional[int] = None,
+        reset: t.Callable[[WebDriver], bool] = reset_driver,
+    ) -> None:
+        if size < 1:
+            raise ValueError(f"Размер пула должен быть >= 1: {size}.")
+        if max_uses is not None and max_uses < 1:
+            raise ValueError(f"Количество использований сессии должно быть >= 1: {max_uses}.")
+        self.size = size
+        self.max_uses = max_uses
+        self.stats = DriverPoolStats()
+        self._factory = factory
+        self._reset = reset
+        self._idle: list[_PooledSession] = []
+        self._busy: dict[int, _PooledSession] = {}
+        self._creating = 0
+        self._condition = threading.Condition()
+        self._closed = False
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} size={self.size} idle={len(self._idle)} busy={len(self._busy)}>"
+
+    def acquire(self, /, *, timeout: t.Optional[float] = None) -> WebDriver:
+        """Выдача сессии: свободной из пула или новой, если лимит `size` не исчерпан.
+
+        Raises:
+            DriverPoolTimeoutError: за `timeout` не освободилась ни одна сессия.
+        """
+        started = time.monotonic()
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Пул сессий WebDriver закрыт.")
+                if self._idle:
+                    session = self._idle.pop()
+                    self._busy[id(session.driver)] = session
+                    break
+                if len(self._busy) + self._creating < self.size:
+                    # Резервируем место под новую сессию, чтобы параллельные потоки не превысили `size`.
+                    self._creating += 1
+                    session = None
+                    break
+                remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                if remaining is not None and remaining <= 0:
+                    raise DriverPoolTimeoutError(f"Нет свободной сессии WebDriver за {timeout} с ({self!r}).")
+                self._condition.wait(remaining)
+
+        if session is None:
+            try:
+                session = _PooledSession(driver=self._factory())
+            finally:
+                with self._condition:
+                    self._creating -= 1
+                    if session is None:
+                        self._condition.notify()
+            reused = False
+        else:
+            reused = True
+
+        with self._condition:
+            if not reused:
+                self._busy[id(session.driver)] = session
+            session.uses += 1
+            if reused:
+                self.stats.reused += 1
+            else:
+                self.stats.created += 1
+            self.stats.acquisitions += 1
+            self.stats.wait_time += time.monotonic() - started
+        return session.driver
+
+    def release(self, driver: WebDriver, /, *, discard: bool = False) -> None:
+        """Возврат сессии в пул.
+
+        Args:
+            driver (WebDriver): сессия, выданная `acquire`.
+            discard (bool): закрыть сессию без возврата в пул (например, браузер упал во время теста).
+        """
+        from selenium.common import WebDriverException
+
+        with self._condition:
+            session = self._busy.get(id(driver))
+        if session is None:
+            raise ValueError(f"Сессия {driver!r} не принадлежит пулу.")
+
+        recycle = self.max_uses is not None and session.uses >= self.max_uses
+        if not discard and not recycle and not self._closed:
+            try:
+                # Функция очистки без результата (None) считается успешной.
+                recycle = self._reset(driver) is False
+            except WebDriverException:
+                discard = True
+
+        with self._condition:
+            self._busy.pop(id(driver), None)
+            if discard:
+                self.stats.discarded += 1
+            elif recycle:
+                self.stats.recycled += 1
+            elif not self._closed:
+                self._idle.append(session)
+            self._condition.notify()
+
+        if discard or recycle or self._closed:
+            _quit(driver)
+
+    def close(self) -> None:
+        """Закрытие всех свободных сессий. Занятые сессии закрываются при возврате в пул."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for session in idle:
+            _quit(session.driver)
+
+
+def _quit(driver: WebDriver, /) -> None:
+    try:
+        driver.quit()
+    except Exception:  # pylint: disable=broad-except
+        # Сессия уже недоступна (браузер упал или Grid закрыл ее по таймауту).
+        pass
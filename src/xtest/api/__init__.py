@@ -1,3 +1,13 @@
+from .adapters import ConnectionStats
 from .base import APIClientBase
+from .cache import CacheMode, CassetteMissError, DiskStore, MemoryStore, ResponseCache
 
-__all__ = ["APIClientBase"]
+__all__ = [
+    "APIClientBase",
+    "CacheMode",
+    "CassetteMissError",
+    "ConnectionStats",
+    "DiskStore",
+    "MemoryStore",
+    "ResponseCache",
+]
@@ -0,0 +1,117 @@
+"""HTTP-адаптер для `APIClientBase`: пул соединений, повторы с экспоненциальной задержкой, статистика соединений."""
+from __future__ import annotations
+
+import dataclasses
+import socket
+import threading
+import typing as t
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+# Статусы, при которых запрос повторяется (с учетом заголовка Retry-After).
+DEFAULT_RETRY_STATUSES: tuple[int, ...] = (429, 502, 503)
+
+
+def build_retry(
+    total: int,
+    /,
+    *,
+    backoff_factor: float = 0.2,
+    backoff_jitter: float = 0.1,
+    backoff_max: float = 10.0,
+    statuses: t.Iterable[int] = DEFAULT_RETRY_STATUSES,
+) -> Retry:
+    """Политика повторов urllib3.
+
+    Ошибки соединения повторяются для любых методов, ошибки чтения и статусы `statuses` — только
+    для идемпотентных методов (GET, PUT, DELETE...). Задержка между попытками растет экспоненциально
+    (`backoff_factor * 2 ** (n - 1)`), для статусов 429/503 используется заголовок Retry-After.
+    """
+    kwargs: dict[str, t.Any] = {
+        "total": total,
+        "connect": total,
+        "read": total,
+        "status": total,
+        "other": 0,
+        "backoff_factor": backoff_factor,
+        "status_forcelist": frozenset(statuses),
+        "respect_retry_after_header": True,
+        # Ответ с неуспешным статусом после исчерпания попыток возвращается как есть:
+        # статус проверяет `APIClientBase.request`.
+        "raise_on_status": False,
+    }
+    try:
+        # Разброс задержки и ее ограничение сверху появились в urllib3 2.
+        return Retry(**kwargs, backoff_jitter=backoff_jitter, backoff_max=backoff_max)
+    except TypeError:
+        return Retry(**kwargs)
+
+
+@dataclasses.dataclass
+class ConnectionStats:
+    # Запросы, отправленные через пулы соединений (включая повторы).
+    requests: int = 0
+    # Новые TCP/TLS-соединения.
+    opened: int = 0
+
+    @property
+    def reused(self) -> int:
+        return max(0, self.requests - self.opened)
+
+    @property
+    def reuse_rate(self) -> float:
+        return self.reused / self.requests if self.requests else 0.0
+
+    def merge(self, other: ConnectionStats, /) -> None:
+        self.requests += other.requests
+        self.opened += other.opened
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """`HTTPAdapter` с TCP keep-alive и учетом открытых/переиспользованных соединений.
+
+    Args:
+        tcp_keepalive (bool): включение SO_KEEPALIVE для соединений (простаивающие соединения
+            не закрываются промежуточными балансировщиками).
+        kwargs: параметры `HTTPAdapter` (pool_connections, pool_maxsize, pool_block, max_retries).
+    """
+
+    def __init__(self, *, tcp_keepalive: bool = True, **kwargs: t.Any) -> None:
+        self.tcp_keepalive = tcp_keepalive
+        # Статистика пулов, вытесненных из PoolManager или закрытых.
+        self._disposed = ConnectionStats()
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections: int, maxsize: int, block: bool = False, **pool_kwargs: t.Any) -> None:
+        if self.tcp_keepalive:
+            pool_kwargs.setdefault(
+                "socket_options",
+                [*HTTPConnection.default_socket_options, (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)],
+            )
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager.pools.dispose_func = self._dispose_pool
+
+    def _dispose_pool(self, pool: t.Any) -> None:
+        with self._lock:
+            self._disposed.merge(_pool_stats(pool))
+        pool.close()
+
+    @property
+    def stats(self) -> ConnectionStats:
+        with self._lock:
+            stats = ConnectionStats(requests=self._disposed.requests, opened=self._disposed.opened)
+        pools = self.poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                stats.merge(_pool_stats(pools[key]))
+            except KeyError:
+                # Пул вытеснен между keys() и чтением, его статистика уже в `_disposed`.
+                continue
+        return stats
+
+
+def _pool_stats(pool: t.Any, /) -> ConnectionStats:
+    return ConnectionStats(requests=getattr(pool, "num_requests", 0), opened=getattr(pool, "num_connections", 0))
@@ -0,0 +1,235 @@
+"""Асинхронный клиент для отправки HTTP-запросов (aiohttp) с синхронным мостом для фикстур."""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import threading
+import typing as t
+from urllib.parse import urljoin
+
+import aiohttp
+from requests import HTTPError
+
+_R = t.TypeVar("_R")
+
+
+@dataclasses.dataclass(frozen=True)
+class AsyncResponse:
+    """Прочитанный ответ: аналог `requests.Response` для `AsyncAPIClientBase`."""
+
+    status_code: int
+    url: str
+    headers: t.Mapping[str, str]
+    content: bytes
+    encoding: t.Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self) -> t.Any:
+        return json.loads(self.content)
+
+
+class AsyncAPIClientBase:
+    """Базовый класс для асинхронной отправки HTTP-запросов.
+
+    Контракт `request` совпадает с `APIClientBase.request`. Все запросы клиента используют общий пул
+    соединений, количество одновременно выполняемых запросов ограничено `max_concurrency`.
+    Синхронный код (фикстуры) вызывает запросы через `run`/`request_many`: они выполняются в цикле
+    событий клиента в отдельном потоке.
+    """
+
+    disable_status_code_verify: bool = False
+
+    # Ограничение одновременно выполняемых запросов клиента.
+    max_concurrency: int = 100
+
+    # Пул соединений: всего и на один хост (0 — без ограничения на хост).
+    pool_limit: int = 100
+    pool_limit_per_host: int = 0
+
+    # Таймауты по умолчанию: установка соединения и чтение ответа, в секундах.
+    connect_timeout: float = 10
+    read_timeout: float = 120
+
+    def __init__(self, base_url: str, /, *, access_token: str = None, max_concurrency: t.Optional[int] = None):
+        self._base_url = base_url
+        self.access_token = access_token
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+        self._session: t.Optional[aiohttp.ClientSession] = None
+        self._semaphore: t.Optional[asyncio.Semaphore] = None
+        self._loop: t.Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: t.Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    async def __aenter__(self) -> AsyncAPIClientBase:
+        return self
+
+    async def __aexit__(self, *exc_info: t.Any) -> None:
+        await self.aclose()
+
+    def __enter__(self) -> AsyncAPIClientBase:
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.close()
+
+    @property
+    def headers_bearer_authorizaton(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Сессия и семафор привязаны к циклу событий, поэтому создаются при первом запросе внутри него.
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_limit, limit_per_host=self.pool_limit_per_host),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def request(
+        self,
+        endpoint: str,
+        *,
+        method: str = "get",
+        headers: dict = None,
+        data: dict = None,
+        params: dict = None,
+        payload: dict = None,
+        files: dict = None,
+        jsonify: bool = False,
+        verify: bool = False,
+        allow_redirects: bool = True,
+        expected_status_code: int = 200,
+        timeouts: t.Optional[t.Union[float, tuple[float, float], tuple[float, None]]] = None,
+    ) -> t.Union[AsyncResponse, t.Dict[str, t.Any], t.List[t.Any]]:
+        """HTTP-запрос (см. `APIClientBase.request`).
+
+        Returns:
+            typing.Union[AsyncResponse, typing.Dict[str, typing.Any], typing.List[typing.Any]]: прочитанный
+                ответ или JSON при `jsonify=True`.
+        """
+        session = self._get_session()
+        if files:
+            data = _build_form_data(data, files)
+        async with self._semaphore:
+            async with session.request(
+                method.upper(),
+                urljoin(self._base_url, endpoint),
+                headers=headers,
+                data=data,
+                params=params,
+                json=payload,
+                allow_redirects=allow_redirects,
+                ssl=True if verify else False,
+                timeout=self._client_timeout(timeouts),
+            ) as raw_response:
+                response = AsyncResponse(
+                    status_code=raw_response.status,
+                    url=str(raw_response.url),
+                    headers=dict(raw_response.headers),
+                    content=await raw_response.read(),
+                    encoding=raw_response.charset,
+                )
+
+        if response.status_code != expected_status_code and not self.disable_status_code_verify:
+            raise HTTPError(
+                f'Ошибка при HTTP-запросе (expected_code={expected_status_code}, got_code={response.status_code})\n'
+                f'Ответ: {response.text}.'
+            )
+
+        if jsonify:
+            return response.json()
+        return response
+
+    def _client_timeout(
+        self, timeouts: t.Optional[t.Union[float, tuple[float, float], tuple[float, None]]], /
+    ) -> aiohttp.ClientTimeout:
+        if timeouts is None:
+            timeouts = (self.connect_timeout, self.read_timeout)
+        if not isinstance(timeouts, tuple):
+            timeouts = (timeouts, timeouts)
+        connect, read = timeouts
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+    async def gather(self, *calls: t.Awaitable[_R], return_exceptions: bool = False) -> list[_R]:
+        """Параллельное выполнение запросов (ограничение параллельности — `max_concurrency`)."""
+        return list(await asyncio.gather(*calls, return_exceptions=return_exceptions))
+
+    def run(self, coroutine: t.Awaitable[_R], /) -> _R:
+        """Синхронное выполнение корутины в цикле событий клиента (для фикстур и синхронных тестов)."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop()).result()
+
+    def request_many(
+        self,
+        calls: t.Iterable[tuple[str, dict[str, t.Any]]],
+        /,
+        *,
+        return_exceptions: bool = False,
+    ) -> list[t.Any]:
+        """Синхронный запуск множества запросов.
+
+        Args:
+            calls (typing.Iterable[tuple[str, dict[str, typing.Any]]]): пары (endpoint, параметры `request`).
+            return_exceptions (bool): вернуть ошибки в списке результатов вместо выброса первой из них.
+
+        Returns:
+            list[typing.Any]: результаты в порядке `calls`.
+        """
+        calls = list(calls)
+
+        async def _run() -> list[t.Any]:
+            return await self.gather(
+                *(self.request(endpoint, **kwargs) for endpoint, kwargs in calls),
+                return_exceptions=return_exceptions,
+            )
+
+        return self.run(_run())
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name=f"{self.__class__.__name__}-loop",
+                    daemon=True,
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    async def aclose(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    def close(self) -> None:
+        """Закрытие сессии и остановка цикла событий, созданного синхронным мостом."""
+        if self._loop is None:
+            return
+        self.run(self.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._loop = None
+        self._loop_thread = None
+
+
+def _build_form_data(data: t.Optional[dict], files: dict, /) -> aiohttp.FormData:
+    # Формат `files` как у requests: {"поле": файл} или {"поле": (имя, файл[, content-type])}.
+    form = aiohttp.FormData()
+    for name, value in (data or {}).items():
+        form.add_field(name, str(value))
+    for name, value in files.items():
+        if isinstance(value, tuple):
+            filename, content, *content_type = value
+            form.add_field(name, content, filename=filename, content_type=content_type[0] if content_type else None)
+        else:
+            form.add_field(name, value, filename=getattr(value, "name", name))
+    return form
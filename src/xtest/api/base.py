@@ -1,23 +1,41 @@
 """Базовый модуль для отправки HTTP-запросов."""
+import random
+import time
 import typing as t
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
-from requests import ConnectionError, HTTPError, Response, Session
+from requests import ConnectionError, HTTPError, Request, Response, Session
+from requests.cookies import get_cookie_header
+
+from xtest.api.adapters import (
+    DEFAULT_RETRY_STATUSES,
+    ConnectionStats,
+    PooledHTTPAdapter,
+    build_retry,
+)
+from xtest.api.cache import ResponseCache
+from xtest.api.streaming import iter_json_array, write_chunks
+from xtest.utils.instrumentation import count_retries, instrumented, normalize_endpoint
 
 
 def retry_request(func: t.Callable[..., t.Any]) -> t.Callable[..., t.Any]:
+    """Повтор вызова при ConnectionError (3 попытки) с экспоненциальной задержкой и случайным разбросом.
+
+    `APIClientBase.request` повторяет запросы на уровне HTTP-адаптера и этот декоратор не использует.
+    """
+
     def wrapper(*args, **kwargs) -> t.Any:
         count_retry = 3
 
         last_exc = None
-        last_exc_msg = None
-        for _ in list(range(count_retry)):
+        for attempt in range(count_retry):
             try:
                 return func(*args, **kwargs)
             except ConnectionError as exception_msg:
-                last_exc = ConnectionError
-                last_exc_msg = exception_msg
-        raise last_exc(last_exc_msg)  # type: ignore
+                last_exc = exception_msg
+                if attempt < count_retry - 1:
+                    time.sleep(0.2 * 2**attempt * random.uniform(0.5, 1.5))
+        raise last_exc  # type: ignore
 
     return wrapper
 
@@ -27,16 +45,100 @@ class APIClientBase:
 
     disable_status_code_verify: bool = False
 
-    def __init__(self, base_url: str, /, *, access_token: str = None):
+    # Количество хостов, для которых хранятся пулы соединений, и соединений в пуле одного хоста.
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+
+    # Ожидание свободного соединения вместо открытия лишнего (которое закрывается после запроса).
+    pool_block: bool = False
+
+    # TCP keep-alive для соединений пула.
+    tcp_keepalive: bool = True
+
+    # Повторы запросов: ошибки соединения, ошибки чтения и статусы `retry_statuses` (для идемпотентных методов).
+    max_retries: int = 3
+    retry_backoff_factor: float = 0.2
+    retry_backoff_jitter: float = 0.1
+    retry_statuses: tuple[int, ...] = DEFAULT_RETRY_STATUSES
+
+    # Таймауты по умолчанию: установка соединения и чтение ответа, в секундах.
+    connect_timeout: float = 10
+    read_timeout: float = 120
+
+    # Максимальный размер тела ответа (в байтах) в тексте HTTPError.
+    max_error_body: int = 4096
+
+    # Размер чанка при потоковом чтении ответа, в байтах.
+    stream_chunk_size: int = 64 * 1024
+
+    def __init__(
+        self,
+        base_url: str,
+        /,
+        *,
+        access_token: str = None,
+        pool_maxsize: t.Optional[int] = None,
+        response_cache: t.Optional[ResponseCache] = None,
+    ):
         self._base_url = base_url
         self._session = Session()
         self.access_token = access_token
+        self.response_cache = response_cache
+        if pool_maxsize is not None:
+            self.pool_maxsize = pool_maxsize
+        self._adapters: list[PooledHTTPAdapter] = []
+        adapter = self._build_adapter(self.pool_maxsize)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _build_adapter(self, pool_maxsize: int, /) -> PooledHTTPAdapter:
+        adapter = PooledHTTPAdapter(
+            tcp_keepalive=self.tcp_keepalive,
+            pool_connections=self.pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=self.pool_block,
+            max_retries=build_retry(
+                self.max_retries,
+                backoff_factor=self.retry_backoff_factor,
+                backoff_jitter=self.retry_backoff_jitter,
+                statuses=self.retry_statuses,
+            ),
+        )
+        self._adapters.append(adapter)
+        return adapter
+
+    def mount_host(self, url: str, /, *, pool_maxsize: int) -> None:
+        """Отдельный пул соединений для хоста (например, для нагруженного сервиса).
+
+        Args:
+            url (str): адрес хоста, например "https://api.example.com".
+            pool_maxsize (int): количество соединений в пуле хоста.
+        """
+        parsed = urlparse(url)
+        self._session.mount(f"{parsed.scheme}://{parsed.netloc}/", self._build_adapter(pool_maxsize))
+
+    @property
+    def connection_stats(self) -> ConnectionStats:
+        """Статистика соединений: запросы, открытые и переиспользованные соединения."""
+        stats = ConnectionStats()
+        for adapter in self._adapters:
+            stats.merge(adapter.stats)
+        return stats
+
+    def close(self) -> None:
+        self._session.close()
 
     @property
     def headers_bearer_authorizaton(self) -> dict[str, str]:
         return {"Authorization": f"Bearer {self.access_token}"}
 
-    @retry_request
+    @instrumented(
+        "api",
+        target=lambda self, endpoint, **kwargs: (
+            f"{kwargs.get('method', 'get').upper()} "
+            f"{normalize_endpoint(urlparse(urljoin(self._base_url, endpoint)).path)}"
+        ),
+    )
     def request(
         self,
         endpoint: str,
@@ -51,28 +153,135 @@ class APIClientBase:
         verify: bool = False,
         allow_redirects: bool = True,
         expected_status_code: int = 200,
-        timeouts: t.Optional[t.Union[float, tuple[float, float], tuple[float, None]]] = (120, 120),
+        timeouts: t.Optional[t.Union[float, tuple[float, float], tuple[float, None]]] = None,
+        stream: bool = False,
+        use_cache: bool = True,
     ) -> t.Union[Response, t.Dict[str, t.Any], t.List[t.Any]]:
+        """HTTP-запрос.
 
-        response = self._session.request(
-            method,
-            url=urljoin(self._base_url, endpoint),
-            headers=headers,
-            data=data,
-            params=params,
-            json=payload,
-            allow_redirects=allow_redirects,
-            files=files,
-            verify=verify,
-            timeout=timeouts,
-        )
+        Повторы при ошибках соединения и статусах `retry_statuses` выполняет HTTP-адаптер сессии.
+        `timeouts` — таймаут или пара (соединение, чтение); по умолчанию (`connect_timeout`, `read_timeout`).
+        При `stream=True` тело ответа не читается: его читает вызывающий код (`iter_content`, `iter_json_items`,
+        `download`), после чего ответ нужно закрыть.
+        Если задан `response_cache`, ответ может быть взят из кэша или кассеты (кроме потоковых запросов
+        и запросов с файлами). `use_cache=False` (например, для получения токенов) исключает запрос из кэша
+        в режиме CACHE, но не из кассеты: в режимах RECORD/REPLAY записываются и воспроизводятся все запросы.
+        """
+        if timeouts is None:
+            timeouts = (self.connect_timeout, self.read_timeout)
+        url = urljoin(self._base_url, endpoint)
+
+        def send() -> Response:
+            return self._session.request(
+                method,
+                url=url,
+                headers=headers,
+                data=data,
+                params=params,
+                json=payload,
+                allow_redirects=allow_redirects,
+                files=files,
+                verify=verify,
+                timeout=timeouts,
+                stream=stream,
+            )
+
+        cache = self.response_cache
+        if cache is not None and not stream and not files and cache.handles(method, cacheable=use_cache):
+            key = self._response_cache_key(method, url, headers=headers, params=params, data=data, payload=payload)
+            response = cache.fetch(method, url, key, send)
+            # Cookies сохраненного ответа попадают в сессию так же, как cookies ответа из сети.
+            self._session.cookies.update(response.cookies)
+        else:
+            response = send()
+        if (retries := getattr(response.raw, "retries", None)) is not None:
+            count_retries(len(retries.history))
 
         if response.status_code != expected_status_code and not self.disable_status_code_verify:
             raise HTTPError(
                 f'Ошибка при HTTP-запросе (expected_code={expected_status_code}, got_code={response.status_code})\n'
-                f'Ответ: {response.text}.'
+                f'Ответ: {self._error_body(response)}.',
+                response=response,
             )
 
         if jsonify:
             return response.json()
         return response
+
+    def _response_cache_key(self, method: str, url: str, /, *, headers: t.Optional[dict] = None, **body: t.Any) -> str:
+        # Cookies сессии, которые уйдут с запросом (например, cookies имперсонации), входят в ключ.
+        cookies = get_cookie_header(self._session.cookies, Request(method.upper(), url).prepare())
+        return self.response_cache.key(method, url, headers=headers, cookies=cookies, **body)
+
+    def discard_cached_response(
+        self,
+        endpoint: str,
+        /,
+        *,
+        method: str = "get",
+        headers: dict = None,
+        params: dict = None,
+        data: dict = None,
+        payload: dict = None,
+    ) -> None:
+        """Удаление ответа из `response_cache` (ключ строится так же, как в `request`)."""
+        if self.response_cache is None:
+            return
+        url = urljoin(self._base_url, endpoint)
+        key = self._response_cache_key(method, url, headers=headers, params=params, data=data, payload=payload)
+        self.response_cache.discard_key(key)
+
+    def _error_body(self, response: Response, /) -> str:
+        # Из тела читается не больше `max_error_body` байт: ответ с ошибкой может быть огромным.
+        if response._content_consumed:  # pylint: disable=protected-access
+            body = response.content[: self.max_error_body]
+            truncated = len(response.content) > self.max_error_body
+        else:
+            body = b""
+            for chunk in response.iter_content(self.max_error_body):
+                body = chunk
+                break
+            truncated = bool(body) and response.raw is not None and bool(response.raw.read(1))
+            response.close()
+        text = body.decode(response.encoding or "utf-8", errors="replace")
+        return f"{text}... (обрезано до {self.max_error_body} байт)" if truncated else text
+
+    def iter_content(
+        self, endpoint: str, /, *, chunk_size: t.Optional[int] = None, **kwargs: t.Any
+    ) -> t.Iterator[bytes]:
+        """Тело ответа по частям, без чтения целиком в память.
+
+        Args:
+            endpoint (str): адрес запроса.
+            chunk_size (typing.Optional[int]): размер чанка (по умолчанию `stream_chunk_size`).
+            kwargs: параметры `request` (кроме `stream` и `jsonify`).
+
+        Yields:
+            bytes: очередная часть тела ответа.
+        """
+        response = self.request(endpoint, stream=True, **kwargs)
+        try:
+            yield from response.iter_content(chunk_size or self.stream_chunk_size)
+        finally:
+            response.close()
+
+    def iter_json_items(
+        self, endpoint: str, /, *, chunk_size: t.Optional[int] = None, **kwargs: t.Any
+    ) -> t.Iterator[t.Any]:
+        """Элементы JSON-массива из тела ответа по мере загрузки (в памяти — только текущий элемент)."""
+        response = self.request(endpoint, stream=True, **kwargs)
+        try:
+            yield from iter_json_array(
+                response.iter_content(chunk_size or self.stream_chunk_size),
+                encoding=response.encoding or "utf-8",
+            )
+        finally:
+            response.close()
+
+    def download(self, endpoint: str, target: t.Any, /, *, chunk_size: t.Optional[int] = None, **kwargs: t.Any) -> int:
+        """Запись тела ответа в файл (путь или файловый объект) или в буфер (bytearray, mmap) по частям.
+
+        Returns:
+            int: количество записанных байт.
+        """
+        return write_chunks(self.iter_content(endpoint, chunk_size=chunk_size, **kwargs), target)
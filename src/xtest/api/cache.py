@@ -0,0 +1,381 @@
+"""Кэш ответов и кассеты (запись/воспроизведение) для `APIClientBase`."""
+from __future__ import annotations
+
+import abc
+import base64
+import collections
+import contextlib
+import dataclasses
+import enum
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import typing as t
+from pathlib import Path
+
+from requests import Response
+from requests.cookies import create_cookie
+from requests.structures import CaseInsensitiveDict
+
+
+@enum.unique
+class CacheMode(enum.Enum):
+    # Ответы на безопасные запросы (GET/HEAD) берутся из хранилища, при промахе — из сети с сохранением.
+    CACHE = "cache"
+    # Все запросы выполняются по сети, все ответы сохраняются (запись кассеты).
+    RECORD = "record"
+    # Ответы только из хранилища, без сети (воспроизведение кассеты).
+    REPLAY = "replay"
+
+
+class CassetteMissError(Exception):
+    def __init__(self, method: str, url: str, /) -> None:
+        super().__init__(f"Ответ на запрос {method.upper()} {url} не записан в кассету (режим replay).")
+
+
+def request_key(
+    method: str,
+    url: str,
+    /,
+    *,
+    params: t.Any = None,
+    data: t.Any = None,
+    payload: t.Any = None,
+    headers: t.Optional[t.Mapping[str, str]] = None,
+    cookies: t.Optional[str] = None,
+) -> str:
+    """Ключ запроса: хэш метода, URL, GET-параметров, тела, значимых заголовков и cookies (заголовок Cookie)."""
+    parts = {
+        "method": method.upper(),
+        "url": url,
+        "params": params,
+        "data": data,
+        "payload": payload,
+        "headers": {name.lower(): value for name, value in (headers or {}).items()},
+        "cookies": cookies,
+    }
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def dump_response(response: Response, /) -> dict[str, t.Any]:
+    """Сериализуемое представление ответа (тело, заголовки, cookies, история редиректов)."""
+    return {
+        "status_code": response.status_code,
+        "reason": response.reason,
+        "url": response.url,
+        "encoding": response.encoding,
+        "headers": dict(response.headers),
+        "content": base64.b64encode(response.content).decode("ascii"),
+        "cookies": [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure,
+            }
+            for cookie in response.cookies
+        ],
+        "history": [{"status_code": item.status_code, "url": item.url} for item in response.history],
+    }
+
+
+def load_response(record: dict[str, t.Any], /, *, keep_expiry: bool = True) -> Response:
+    """Ответ из представления `dump_response` (`keep_expiry=False` — cookies без срока действия)."""
+    response = Response()
+    response.status_code = record["status_code"]
+    response.reason = record.get("reason")
+    response.url = record["url"]
+    response.encoding = record.get("encoding")
+    response.headers = CaseInsensitiveDict(record["headers"])
+    response._content = base64.b64decode(record["content"])  # pylint: disable=protected-access
+    for cookie in record.get("cookies", ()):
+        if not keep_expiry:
+            cookie = {**cookie, "expires": None}
+        response.cookies.set_cookie(create_cookie(**cookie))
+    for item in record.get("history", ()):
+        redirect = Response()
+        redirect.status_code = item["status_code"]
+        redirect.url = item["url"]
+        redirect._content = b""  # pylint: disable=protected-access
+        response.history.append(redirect)
+    return response
+
+
+def _jwt_subject(token: str, /) -> t.Optional[str]:
+    # Claim `sub` JWT. None, если значение не JWT.
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return str(claims["sub"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _credential_identity(value: str, /) -> str:
+    # Bearer-токен JWT заменяется его субъектом, остальные значения не меняются.
+    scheme, _, token = value.partition(" ")
+    if scheme.lower() == "bearer" and (subject := _jwt_subject(token.strip())) is not None:
+        return f"Bearer sub={subject}"
+    return value
+
+
+def _cookies_identity(header: str, /) -> str:
+    # Из cookies остаются имена и субъекты JWT-значений: остальные значения (идентификаторы сессий)
+    # меняются от прогона к прогону.
+    parts = []
+    for item in header.split(";"):
+        name, _, value = item.strip().partition("=")
+        subject = _jwt_subject(value)
+        parts.append(name if subject is None else f"{name}=sub:{subject}")
+    return "; ".join(sorted(parts))
+
+
+class ResponseStore(abc.ABC):
+    """Хранилище сериализованных ответов."""
+
+    @abc.abstractmethod
+    def get(self, key: str, /) -> t.Optional[dict[str, t.Any]]:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def put(self, key: str, record: dict[str, t.Any], /) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def discard(self, key: str, /) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError()
+
+
+class MemoryStore(ResponseStore):
+    """LRU-хранилище в памяти процесса с ограниченным временем жизни записей.
+
+    Args:
+        maxsize (int): максимальное количество ответов.
+        ttl (typing.Optional[float]): время жизни ответа в секундах (None — без ограничения).
+    """
+
+    def __init__(self, *, maxsize: int = 1024, ttl: t.Optional[float] = None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._records: collections.OrderedDict[str, tuple[dict[str, t.Any], float]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, /) -> t.Optional[dict[str, t.Any]]:
+        with self._lock:
+            record, stored_at = self._records.get(key, (None, 0.0))
+            if record is None:
+                return None
+            if self.ttl is not None and time.monotonic() - stored_at >= self.ttl:
+                del self._records[key]
+                return None
+            self._records.move_to_end(key)
+            return record
+
+    def put(self, key: str, record: dict[str, t.Any], /) -> None:
+        with self._lock:
+            self._records[key] = (record, time.monotonic())
+            self._records.move_to_end(key)
+            while len(self._records) > self.maxsize:
+                self._records.popitem(last=False)
+
+    def discard(self, key: str, /) -> None:
+        with self._lock:
+            self._records.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+class DiskStore(ResponseStore):
+    """Хранилище в каталоге (один JSON-файл на ответ), общее для воркеров pytest-xdist.
+
+    Запись атомарна (временный файл и `os.replace`), поэтому воркеры не видят недописанных файлов.
+    Время последнего обращения — mtime файла: при превышении `max_entries` удаляются самые давние ответы.
+
+    Args:
+        directory (typing.Union[str, os.PathLike]): каталог хранилища (кассеты).
+        ttl (typing.Optional[float]): время жизни ответа в секундах (None — без ограничения).
+        max_entries (typing.Optional[int]): максимальное количество ответов (None — без ограничения).
+    """
+
+    def __init__(
+        self,
+        directory: t.Union[str, os.PathLike],
+        /,
+        *,
+        ttl: t.Optional[float] = None,
+        max_entries: t.Optional[int] = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str, /) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str, /) -> t.Optional[dict[str, t.Any]]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                stored = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if self.ttl is not None and time.time() - stored["stored_at"] >= self.ttl:
+            path.unlink(missing_ok=True)
+            return None
+        if self.max_entries is not None:
+            # Отметка обращения для вытеснения давно не используемых ответов.
+            with contextlib.suppress(FileNotFoundError):
+                os.utime(path)
+        return stored["record"]
+
+    def put(self, key: str, record: dict[str, t.Any], /) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False) as file:
+            json.dump({"stored_at": time.time(), "record": record}, file, ensure_ascii=False)
+        os.replace(file.name, path)
+        if self.max_entries is not None:
+            self._evict()
+
+    def _evict(self) -> None:
+        paths = list(self.directory.glob("*/*.json"))
+        if len(paths) <= self.max_entries:
+            return
+        by_access = []
+        for path in paths:
+            try:
+                by_access.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        by_access.sort()
+        for _, path in by_access[: len(by_access) - self.max_entries]:
+            path.unlink(missing_ok=True)
+
+    def discard(self, key: str, /) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*/*.json"):
+            path.unlink(missing_ok=True)
+
+
+@dataclasses.dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """Кэш ответов `APIClientBase.request`.
+
+    Ключ — метод, URL, GET-параметры, тело запроса, заголовки из `vary_headers` и cookies сессии,
+    отправляемые с запросом. Authorization входит в ключ по умолчанию: ответ, полученный с токеном
+    одного пользователя, не должен выдаваться запросу с токеном другого.
+
+    В режимах RECORD и REPLAY токены и cookies меняются от прогона к прогону, поэтому в ключ входят
+    не их значения, а субъект (claim `sub`) Bearer-токена JWT и имена cookies (для JWT-значений —
+    с субъектом). Cookies воспроизведенных ответов загружаются без срока действия.
+
+    Args:
+        store (ResponseStore): хранилище ответов.
+        mode (CacheMode): режим работы.
+        methods (typing.Iterable[str]): методы, ответы на которые кэшируются в режиме CACHE.
+        vary_headers (typing.Iterable[str]): заголовки запроса, входящие в ключ.
+    """
+
+    def __init__(
+        self,
+        store: ResponseStore,
+        /,
+        *,
+        mode: CacheMode = CacheMode.CACHE,
+        methods: t.Iterable[str] = ("GET", "HEAD"),
+        vary_headers: t.Iterable[str] = ("Accept", "Authorization"),
+    ) -> None:
+        self.store = store
+        self.mode = mode
+        self.methods = frozenset(method.upper() for method in methods)
+        self.vary_headers = frozenset(header.lower() for header in vary_headers)
+        self.stats = ResponseCacheStats()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} mode={self.mode.value} store={self.store.__class__.__name__}>"
+
+    def handles(self, method: str, /, *, cacheable: bool = True) -> bool:
+        """Запрос проходит через кэш.
+
+        Кассета (RECORD/REPLAY) записывает и воспроизводит все запросы, иначе воспроизведение требовало
+        бы сети. `cacheable=False` исключает запрос только из кэша в режиме CACHE (например, получение токенов).
+        """
+        if self.mode is not CacheMode.CACHE:
+            return True
+        return cacheable and method.upper() in self.methods
+
+    def key(
+        self,
+        method: str,
+        url: str,
+        /,
+        *,
+        headers: t.Optional[t.Mapping[str, str]] = None,
+        cookies: t.Optional[str] = None,
+        **body: t.Any,
+    ) -> str:
+        headers = {name: value for name, value in (headers or {}).items() if name.lower() in self.vary_headers}
+        if self.mode is not CacheMode.CACHE:
+            headers = {
+                name: _credential_identity(value) if name.lower() == "authorization" else value
+                for name, value in headers.items()
+            }
+            cookies = _cookies_identity(cookies) if cookies else cookies
+        return request_key(method, url, headers=headers, cookies=cookies, **body)
+
+    def discard(self, method: str, url: str, /, **kwargs: t.Any) -> None:
+        """Удаление сохраненного ответа (например, после изменения данных, которые он описывает)."""
+        self.discard_key(self.key(method, url, **kwargs))
+
+    def discard_key(self, key: str, /) -> None:
+        # Кассета (RECORD/REPLAY) не меняется: она воспроизводит прогон целиком.
+        if self.mode is CacheMode.CACHE:
+            self.store.discard(key)
+
+    def fetch(self, method: str, url: str, key: str, send: t.Callable[[], Response], /) -> Response:
+        """Ответ из хранилища или от `send` (с сохранением) в зависимости от режима.
+
+        Raises:
+            CassetteMissError: в режиме REPLAY ответ не записан.
+        """
+        if self.mode is not CacheMode.RECORD:
+            if (record := self.store.get(key)) is not None:
+                self.stats.hits += 1
+                # Кассета воспроизводится в любое время: cookies с истекшим сроком не были бы отправлены.
+                return load_response(record, keep_expiry=self.mode is not CacheMode.REPLAY)
+            self.stats.misses += 1
+            if self.mode is CacheMode.REPLAY:
+                raise CassetteMissError(method, url)
+
+        response = send()
+        # В режиме CACHE сохраняются только успешные ответы, кассета записывает все.
+        if self.mode is CacheMode.RECORD or response.ok:
+            self.store.put(key, dump_response(response))
+            self.stats.stored += 1
+        return response
@@ -0,0 +1,132 @@
+"""Потоковая обработка тел ответов: чанки, элементы JSON-массива, запись в файл или буфер."""
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import typing as t
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_DELIMITERS = _WHITESPACE + ",]"
+
+
+class StreamingJSONError(ValueError):
+    pass
+
+
+def iter_json_array(chunks: t.Iterable[bytes], /, *, encoding: str = "utf-8") -> t.Iterator[t.Any]:
+    """Элементы JSON-массива верхнего уровня по мере получения чанков.
+
+    В памяти хранится только текущий незавершенный элемент, а не весь документ.
+
+    Args:
+        chunks (typing.Iterable[bytes]): части тела ответа.
+        encoding (str): кодировка тела ответа.
+
+    Yields:
+        typing.Any: очередной элемент массива.
+
+    Raises:
+        StreamingJSONError: тело не является JSON-массивом или оборвано.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    chunks = iter(chunks)
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+
+    def fill() -> bool:
+        # Дочитывание следующего чанка; False — тело закончилось.
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            buffer = buffer[position:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[position:] + text_decoder.decode(chunk)
+        position = 0
+        return True
+
+    def skip_whitespace() -> t.Optional[str]:
+        # Следующий значимый символ (без сдвига позиции) или None в конце тела.
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in _WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return None
+
+    if skip_whitespace() != "[":
+        raise StreamingJSONError("Тело ответа не является JSON-массивом.")
+    position += 1
+
+    while True:
+        char = skip_whitespace()
+        if char is None:
+            raise StreamingJSONError("Тело ответа оборвано: JSON-массив не закрыт.")
+        if char == "]":
+            return
+        if started:
+            if char != ",":
+                raise StreamingJSONError(f"Ожидалась запятая между элементами массива, получено: {char!r}.")
+            position += 1
+            skip_whitespace()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as ex:
+                if not fill():
+                    raise StreamingJSONError(f"Некорректный элемент JSON-массива: {ex}") from ex
+                continue
+            # Число, на котором закончился буфер ("-1." из "-1.5e3"), может продолжаться в следующем чанке.
+            if (
+                isinstance(item, (int, float))
+                and not isinstance(item, bool)
+                and (end == len(buffer) or buffer[end] not in _NUMBER_DELIMITERS)
+                and fill()
+            ):
+                continue
+            break
+        position = end
+        started = True
+        yield item
+
+
+def write_chunks(chunks: t.Iterable[bytes], target: t.Any, /) -> int:
+    """Запись чанков в файл (путь или файловый объект) или в записываемый буфер (bytearray, mmap).
+
+    Args:
+        chunks (typing.Iterable[bytes]): части тела ответа.
+        target (typing.Any): путь, объект с методом `write` или объект с buffer protocol.
+
+    Returns:
+        int: количество записанных байт.
+
+    Raises:
+        ValueError: тело ответа не помещается в буфер.
+    """
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as file:
+            return write_chunks(chunks, file)
+
+    written = 0
+    if hasattr(target, "write") and not isinstance(target, memoryview):
+        for chunk in chunks:
+            target.write(chunk)
+            written += len(chunk)
+        return written
+
+    view = memoryview(target).cast("B")
+    for chunk in chunks:
+        end = written + len(chunk)
+        if end > len(view):
+            raise ValueError(f"Тело ответа не помещается в буфер размером {len(view)} байт.")
+        view[written:end] = chunk
+        written = end
+    return written
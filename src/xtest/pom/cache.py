@@ -0,0 +1,77 @@
+"""Кэш найденных WebElement в пределах экземпляра страницы/элемента."""
+from __future__ import annotations
+
+import dataclasses
+import typing as t
+
+from selenium.common import exceptions
+from selenium.webdriver.remote.webelement import WebElement
+
+
+@dataclasses.dataclass
+class ElementCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Сколько закэшированных элементов оказались устаревшими (StaleElementReferenceException).
+    stale: int = 0
+    # Сколько раз кэш очищался целиком (навигация, смена URL, устаревший элемент).
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    @property
+    def saved_round_trips(self) -> int:
+        # Каждое попадание заменяет поиск элемента (find_element) проверкой уже найденного.
+        return self.hits
+
+
+class ElementCache:
+    """Кэш WebElement по ключу `AdvancedLocator.as_locator`.
+
+    Элемент из кэша перед выдачей проверяется функцией `validate` (например, `is_displayed`).
+    Если элемент устарел, кэш очищается целиком: скорее всего, страница была перерисована.
+    """
+
+    def __init__(self) -> None:
+        self._elements: dict[tuple[str, str], WebElement] = {}
+        self.stats = ElementCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._elements)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._elements
+
+    def lookup(
+        self,
+        key: tuple[str, str],
+        /,
+        *,
+        validate: t.Callable[[WebElement], bool] = lambda element: True,
+    ) -> t.Optional[WebElement]:
+        element = self._elements.get(key)
+        if element is not None:
+            try:
+                if validate(element):
+                    self.stats.hits += 1
+                    return element
+                self._elements.pop(key, None)
+            except exceptions.StaleElementReferenceException:
+                self.stats.stale += 1
+                self.invalidate()
+        self.stats.misses += 1
+        return None
+
+    def put(self, key: tuple[str, str], element: WebElement, /) -> None:
+        self._elements[key] = element
+
+    def discard(self, key: tuple[str, str], /) -> None:
+        self._elements.pop(key, None)
+
+    def invalidate(self) -> None:
+        if self._elements:
+            self.stats.invalidations += 1
+        self._elements.clear()
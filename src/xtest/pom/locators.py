@@ -1,25 +1,109 @@
+"""Локаторы элементов страницы."""
 from __future__ import annotations
 
+import threading
 import typing as t
+import weakref
 
-from pydantic import BaseModel, Field
 from selenium.webdriver.common.by import By
 
 
-class AdvancedLocator(BaseModel):
-    loc: str = Field()
-    by: str = Field(default=By.CSS_SELECTOR)
-    desc: t.Optional[str] = None
+class AdvancedLocator:
+    """Неизменяемый локатор элемента.
+
+    Экземпляры с одинаковыми `by`, `loc` и `desc` — один и тот же объект (интернирование), поэтому
+    локатор можно использовать как ключ словаря (кэши, метрики) и сравнивать по `is`.
+
+    Вызов локатора с аргументами форматирует шаблон `loc` (`str.format`) и возвращает новый
+    локатор, не изменяя исходный. Результаты форматирования кэшируются по аргументам.
+
+    Args:
+        loc (str): значение локатора (может содержать поля `str.format`).
+        by (str): стратегия поиска (`selenium.webdriver.common.by.By`).
+        desc (typing.Optional[str]): описание элемента.
+    """
+
+    __slots__ = ("loc", "by", "desc", "_hash", "_is_template", "_formatted", "__weakref__")
+
+    # Максимальное количество закэшированных результатов форматирования одного шаблона.
+    format_cache_size: t.ClassVar[int] = 256
+
+    _interned: t.ClassVar[weakref.WeakValueDictionary] = weakref.WeakValueDictionary()
+    _intern_lock: t.ClassVar[threading.Lock] = threading.Lock()
+
+    loc: str
+    by: str
+    desc: t.Optional[str]
+    _hash: int
+    _is_template: bool
+    _formatted: dict[t.Hashable, AdvancedLocator]
+
+    def __new__(cls, loc: str, by: str = By.CSS_SELECTOR, desc: t.Optional[str] = None) -> AdvancedLocator:
+        if not isinstance(loc, str) or not isinstance(by, str):
+            raise TypeError(f"Значение и стратегия локатора должны быть строками: by={by!r}, loc={loc!r}.")
+        key = (cls, by, loc, desc)
+        if (locator := cls._interned.get(key)) is not None:
+            return locator
+        with cls._intern_lock:
+            if (locator := cls._interned.get(key)) is not None:
+                return locator
+            locator = super().__new__(cls)
+            object.__setattr__(locator, "loc", loc)
+            object.__setattr__(locator, "by", by)
+            object.__setattr__(locator, "desc", desc)
+            object.__setattr__(locator, "_hash", hash((by, loc, desc)))
+            object.__setattr__(locator, "_is_template", "{" in loc or "}" in loc)
+            object.__setattr__(locator, "_formatted", {})
+            cls._interned[key] = locator
+            return locator
+
+    def __setattr__(self, name: str, value: t.Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} неизменяем.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{self.__class__.__name__} неизменяем.")
+
+    def __reduce__(self) -> tuple[t.Any, ...]:
+        return self.__class__, (self.loc, self.by, self.desc)
+
+    def __copy__(self) -> AdvancedLocator:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> AdvancedLocator:
+        return self
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(loc={self.loc!r}, by={self.by!r}, desc={self.desc!r})"
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: t.Any) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, AdvancedLocator):
+            return NotImplemented
+        return (self.by, self.loc, self.desc) == (other.by, other.loc, other.desc)
 
     @property
     def as_locator(self) -> tuple[str, str]:
         return self.by, self.loc
 
-    def __call__(self, /, *args, **kwargs) -> AdvancedLocator:
-        self.__config__.allow_mutation = True
-        self.loc = self.loc.format(*args, **kwargs)
-        self.__config__.allow_mutation = False
-        return self
-
-    class Config:
-        allow_mutation = False
+    def __call__(self, /, *args: t.Any, **kwargs: t.Any) -> AdvancedLocator:
+        if not self._is_template:
+            return self
+        try:
+            # Типы входят в ключ: True, 1 и 1.0 равны, но форматируются по-разному.
+            key: t.Hashable = tuple((type(arg), arg) for arg in args)
+            if kwargs:
+                key = (key, tuple((name, type(value), value) for name, value in kwargs.items()))
+            if (locator := self._formatted.get(key)) is not None:
+                return locator
+        except TypeError:
+            # Нехэшируемые аргументы: форматирование без кэша.
+            return self.__class__(self.loc.format(*args, **kwargs), self.by, self.desc)
+        locator = self.__class__(self.loc.format(*args, **kwargs), self.by, self.desc)
+        if len(self._formatted) >= self.format_cache_size:
+            self._formatted.clear()
+        self._formatted[key] = locator
+        return locator
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import abc
+import contextlib
+import dataclasses
+import enum
+import functools
 import re
 import time
 import typing as t
@@ -15,6 +19,7 @@ from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support import expected_conditions as ec
 from selenium.webdriver.support.wait import WebDriverWait
 
+from xtest.pom.cache import ElementCache
 from xtest.pom.exceptions import (
     AttributeNotPresentInWebElementError,
     ElementNotDisappearedOnPageError,
@@ -23,15 +28,118 @@ from xtest.pom.exceptions import (
     TextNotPresentInElementError,
 )
 from xtest.pom.locators import AdvancedLocator
-from xtest.pom.predicates import url_matches_without_get_parameters
+from xtest.pom.predicates import UrlMatches, compile_pattern, strip_url
+from xtest.pom.scripts import (
+    CLEAR_INPUT_JS,
+    NAVIGATE_JS,
+    OPEN_PAGE_PROBE_JS,
+    SNAPSHOT_ELEMENTS_JS,
+    SNAPSHOT_PROPERTIES,
+)
+from xtest.pom.session_state import (
+    SessionSnapshots,
+    SessionState,
+    capture_session_state,
+    cookies_from_jar,
+    origin_of,
+    remove_injection,
+    restore_session_state,
+)
+from xtest.pom.waits import BrowserWait, PollingWebDriverWait, WaitMode
+from xtest.pom.windows import WindowManager
 from xtest.utils.decorators import wait
+from xtest.utils.instrumentation import instrumented
+from xtest.utils.polling import (
+    DEFAULT_POLLING,
+    Deadline,
+    PollingStrategy,
+    iter_attempts,
+)
+
+
+@enum.unique
+class InputMode(enum.Enum):
+    # Посимвольная очистка поля и фиксированные паузы после ввода.
+    LEGACY = "legacy"
+    # Очистка одним скриптом и ожидание наблюдаемого результата ввода вместо пауз.
+    FAST = "fast"
+
+
+@enum.unique
+class OpenMode(enum.Enum):
+    # driver.get, обязательное обновление страницы, ожидание URL и опрос readyState.
+    LEGACY = "legacy"
+    # Один переход без обновления и одна проба (URL, readyState, условие страницы) на попытку.
+    FAST = "fast"
+
+
+@dataclasses.dataclass
+class OpenTimings:
+    # Длительность этапов открытия страницы, в секундах.
+    navigation: float = 0.0
+    refresh: float = 0.0
+    # От начала ожидания до совпадения URL с паттерном страницы.
+    url: t.Optional[float] = None
+    # От начала ожидания до готовности страницы.
+    ready: float = 0.0
+    post_open: float = 0.0
+    total: float = 0.0
+
+
+_READY_STATES = {"interactive": ("interactive", "complete"), "complete": ("complete",)}
+# Стратегии перехода режима FAST (`BasePageActions.navigation_strategy`).
+_NAVIGATION_STRATEGIES = ("normal", "none")
+# Ошибки WebDriver при выполнении скрипта в документе, который выгружается во время перехода.
+_NAVIGATION_ERRORS = ("document unloaded", "execution context", "frame detached", "frame was detached")
+
+
+@functools.lru_cache(maxsize=256)
+def _open_probe(ready_script: t.Optional[str], /) -> str:
+    # Проба готовности режима FAST с условием страницы (строится по значению `ready_script` экземпляра).
+    return OPEN_PAGE_PROBE_JS.replace("__CONDITION__", ready_script or "true")
 
 
 class _BaseActions(ABC):
     locators = None
 
+    # Стратегия опроса для всех ожиданий страницы/элемента.
+    polling: PollingStrategy = DEFAULT_POLLING
+
+    # Режим ожиданий: опрос командами WebDriver или ожидание внутри браузера (один скрипт на ожидание).
+    wait_mode: WaitMode = WaitMode.DRIVER
+
+    # Кэш найденных видимых элементов (по `AdvancedLocator.as_locator`) в пределах экземпляра.
+    use_element_cache: bool = False
+
+    # Режим ввода для `send_keys`/`set_value_to_checkbox`.
+    input_mode: InputMode = InputMode.LEGACY
+
     def __init__(self, driver: WebDriver, /):
         self.driver = driver
+        self.element_cache = ElementCache()
+        self._last_known_url: t.Optional[str] = None
+
+    def _observe_url(self, url: str, /) -> str:
+        # Смена URL означает новую страницу: найденные ранее элементы больше не актуальны.
+        if url != self._last_known_url:
+            if self._last_known_url is not None:
+                self.element_cache.invalidate()
+            self._last_known_url = url
+            self.windows.record_url(url)
+        return url
+
+    def invalidate_element_cache(self) -> None:
+        self.element_cache.invalidate()
+        self._last_known_url = None
+
+    @property
+    def windows(self) -> WindowManager:
+        """Вкладки браузера (общий менеджер сессии)."""
+        return WindowManager.for_driver(self.driver)
+
+    @property
+    def browser_wait(self) -> BrowserWait:
+        return BrowserWait(self.driver)
 
     @property
     def action_chains(self) -> ActionChains:
@@ -44,7 +152,7 @@ class _BaseActions(ABC):
         Returns:
             dict[str, list[str]]: get-параметры.
         """
-        parsed_url = urlparse(self.driver.current_url)
+        parsed_url = urlparse(self._observe_url(self.driver.current_url))
         return parse_qs(parsed_url.query)
 
     def is_stale_of(self, element: WebElement, /, *, timeout: t.Optional[int] = None) -> bool:
@@ -57,8 +165,9 @@ class _BaseActions(ABC):
         self.action_chains.send_keys(Keys.TAB).perform()
         return self
 
+    @instrumented("ui")
     def click(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> None:
-        wait(
+        self._wait_for(
             method=lambda: self.find_visible_element(locator, timeout=1).click(),
             timeout=timeout,
             error=(
@@ -70,6 +179,7 @@ class _BaseActions(ABC):
             ),
         )
 
+    @instrumented("ui")
     def click_on_select_elements(
         self,
         locator: AdvancedLocator,
@@ -79,30 +189,87 @@ class _BaseActions(ABC):
         timeout: t.Optional[int] = None,
     ) -> None:
         def wrapper():
-            for element in self.find_visible_elements(locator, timeout=1):
-                if element.is_displayed() and element.text.strip() == value:
-                    element.click()
+            for item in self.find_visible_snapshot(locator, properties=("element", "text"), timeout=1):
+                if item["text"].strip() == value:
+                    item["element"].click()
                     return
             raise exceptions.ElementNotVisibleException(f"Элемент отсутствует на странице со значением: {value}")
 
-        return wait(
+        return self._wait_for(
             method=wrapper,
-            error=(exceptions.ElementNotVisibleException, ElementNotPresentOnPageError),
+            error=(
+                exceptions.ElementNotVisibleException,
+                exceptions.StaleElementReferenceException,
+                ElementNotPresentOnPageError,
+            ),
             timeout=timeout,
         )
 
-    def send_keys(self, locator: AdvancedLocator, send_data: str, /, *, auto_clear: bool = True) -> None:
+    @instrumented("ui")
+    def send_keys(
+        self,
+        locator: AdvancedLocator,
+        send_data: str,
+        /,
+        *,
+        auto_clear: bool = True,
+        mode: t.Optional[InputMode] = None,
+        expected_value: t.Optional[str] = None,
+        settle: t.Optional[t.Callable[[], t.Any]] = None,
+        settle_timeout: float = 2,
+    ) -> None:
+        """Ввод текста в поле.
+
+        В режиме `InputMode.FAST` поле очищается одним скриптом, текст вводится одной командой,
+        после чего ожидается значение поля, равное `expected_value` (по умолчанию — введенному тексту),
+        и, если передан, истинный результат `settle` (например, исчезновение индикатора debounce-запроса).
+        Если условие не выполнилось за `settle_timeout`, ввод считается завершенным (как и в режиме LEGACY).
+
+        Args:
+            locator (AdvancedLocator): локатор поля ввода.
+            send_data (str): текст для ввода.
+            auto_clear (bool): очистка поля перед вводом.
+            mode (typing.Optional[InputMode]): режим ввода (по умолчанию `input_mode` класса).
+            expected_value (typing.Optional[str]): ожидаемое значение поля (для полей с масками).
+            settle (typing.Optional[typing.Callable[[], typing.Any]]): дополнительное условие завершения ввода.
+            settle_timeout (float): таймаут ожидания условий завершения ввода.
+        """
         web_element = self.find_visible_element(locator)
         web_element.click()
 
-        if auto_clear:
-            while web_element.get_attribute("value") != "":
-                web_element.send_keys(Keys.BACKSPACE)
-                web_element.send_keys(Keys.DELETE)
+        if (mode or self.input_mode) is InputMode.LEGACY:
+            if auto_clear:
+                self._clear_input_by_keys(web_element)
+            web_element.send_keys(send_data)
+            time.sleep(0.7)
+            return
 
+        if auto_clear:
+            self._clear_input(web_element)
         web_element.send_keys(send_data)
-        time.sleep(0.7)
 
+        expected_value = str(send_data) if expected_value is None else expected_value
+        self._wait_for(
+            lambda: web_element.get_property("value") == expected_value or None,
+            check=True,
+            timeout=settle_timeout,
+            raise_exception=False,
+        )
+        if settle is not None:
+            self._wait_for(lambda: settle() or None, check=True, timeout=settle_timeout, raise_exception=False)
+
+    @staticmethod
+    def _clear_input_by_keys(web_element: WebElement, /) -> None:
+        while web_element.get_attribute("value") != "":
+            web_element.send_keys(Keys.BACKSPACE)
+            web_element.send_keys(Keys.DELETE)
+
+    def _clear_input(self, web_element: WebElement, /) -> None:
+        if self.driver.execute_script(CLEAR_INPUT_JS, web_element) not in ("", None):
+            # Поле не поддалось очистке скриптом (нестандартный компонент) — очищаем клавишами.
+            self._clear_input_by_keys(web_element)
+
+    @instrumented("ui")
     def send_keys_by_key(
         self,
         locator: AdvancedLocator,
@@ -119,18 +286,46 @@ class _BaseActions(ABC):
         web_element = self.find_visible_element(locator)
 
         if auto_clear:
-            while web_element.get_attribute("value") != "":
-                web_element.send_keys(Keys.BACKSPACE)
-                web_element.send_keys(Keys.DELETE)
+            if self.input_mode is InputMode.LEGACY:
+                self._clear_input_by_keys(web_element)
+            else:
+                self._clear_input(web_element)
 
         for char in str(send_data):
             web_element.send_keys(char)
             if isinstance(send_timeout, float):
                 time.sleep(send_timeout)
 
-    def wait(self, /, *, timeout: t.Optional[int] = None) -> WebDriverWait:
-        return WebDriverWait(self.driver, timeout=timeout or 10, poll_frequency=0.001)
+    def _wait_for(self, method: t.Callable[..., t.Any], **kwargs) -> t.Optional[t.Any]:
+        kwargs.setdefault("interval", self.polling)
+        return wait(method, **kwargs)
+
+    def wait(self, /, *, timeout: t.Optional[float] = None) -> WebDriverWait:
+        return PollingWebDriverWait(self.driver, timeout=10 if timeout is None else timeout, polling=self.polling)
+
+    def _browser_deadline(self, timeout: t.Optional[float], /) -> Deadline:
+        # Ожидание в браузере и опрос через WebDriver после его сбоя укладываются в один таймаут.
+        return Deadline(10 if timeout is None else timeout)
+
+    def _wait_in_browser(
+        self,
+        locator: AdvancedLocator,
+        condition: str,
+        /,
+        *,
+        timeout: t.Optional[float] = None,
+        message: str = "",
+        **expected: t.Any,
+    ) -> t.Any:
+        return self.browser_wait.until(
+            locator.as_locator,
+            condition,
+            timeout=10 if timeout is None else timeout,
+            message=message,
+            **expected,
+        )
 
+    @instrumented("ui")
     def is_visible_element(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> bool:
         try:
             self.find_visible_element(locator, timeout=timeout)
@@ -138,6 +333,7 @@ class _BaseActions(ABC):
         except (exceptions.ElementNotVisibleException, ElementNotPresentOnPageError):
             return False
 
+    @instrumented("ui")
     def find_element(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> WebElement:
         try:
             return self.wait(timeout=timeout).until(
@@ -153,21 +349,41 @@ class _BaseActions(ABC):
         except exceptions.ElementClickInterceptedException:
             return False
 
+    @instrumented("ui")
     def find_visible_element(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> WebElement:
+        if not self.use_element_cache:
+            return self._find_visible_element(locator, timeout=timeout)
+        if element := self.element_cache.lookup(locator.as_locator, validate=lambda cached: cached.is_displayed()):
+            return element
+        element = self._find_visible_element(locator, timeout=timeout)
+        self.element_cache.put(locator.as_locator, element)
+        return element
+
+    def _find_visible_element(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> WebElement:
+        message = f"Элемент не отображается на странице (timeout={timeout}). Локатор: {locator.as_locator}."
+        fallback_timeout = timeout
         try:
-            return self.wait(timeout=timeout).until(
+            if self.wait_mode is WaitMode.BROWSER:
+                deadline = self._browser_deadline(timeout)
+                # Страница перезагрузилась во время ожидания — продолжаем опросом через WebDriver.
+                with contextlib.suppress(exceptions.JavascriptException):
+                    return self._wait_in_browser(locator, "visible", timeout=timeout, message=message)
+                fallback_timeout = deadline.remaining
+            return self.wait(timeout=fallback_timeout).until(
                 method=ec.visibility_of_element_located(locator.as_locator),
-                message=f"Элемент не отображается на странице (timeout={timeout}). Локатор: {locator.as_locator}.",
+                message=message,
             )
         except exceptions.TimeoutException as ex:
             raise ElementNotPresentOnPageError(locator, timeout=timeout) from ex
 
+    @instrumented("ui")
     def find_elements(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> t.List[WebElement]:
         try:
             return list(self.wait(timeout=timeout).until(ec.presence_of_all_elements_located(locator)))
         except exceptions.TimeoutException:
             return []
 
+    @instrumented("ui")
     def find_visible_elements(
         self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None
     ) -> list[WebElement]:
@@ -179,11 +395,87 @@ class _BaseActions(ABC):
         except exceptions.TimeoutException as ex:
             raise ElementNotPresentOnPageError(locator, timeout=timeout) from ex
 
+    @instrumented("ui")
+    def snapshot_elements(
+        self,
+        locator: AdvancedLocator,
+        /,
+        *,
+        properties: t.Iterable[str] = ("text", "visible"),
+        attributes: t.Iterable[str] = (),
+        css: t.Iterable[str] = (),
+    ) -> list[dict[str, t.Any]]:
+        """Снимок свойств всех элементов локатора за один вызов `execute_script` (без ожидания).
+
+        Args:
+            locator (AdvancedLocator): локатор элементов.
+            properties (typing.Iterable[str]): свойства элементов (element, text, visible, value,
+                selected, enabled, tag_name). Свойство "element" — WebElement для дальнейших действий.
+            attributes (typing.Iterable[str]): HTML-атрибуты (ключ "attributes").
+            css (typing.Iterable[str]): вычисленные CSS-свойства (ключ "css").
+
+        Returns:
+            list[dict[str, typing.Any]]: по одному словарю на каждый найденный элемент.
+        """
+        properties = list(properties)
+        if unknown := set(properties) - SNAPSHOT_PROPERTIES:
+            raise ValueError(f"Неизвестные свойства для снимка элементов: {sorted(unknown)}.")
+        by, value = locator.as_locator
+        return list(
+            self.driver.execute_script(SNAPSHOT_ELEMENTS_JS, by, value, properties, list(attributes), list(css))
+            or []
+        )
+
+    @instrumented("ui")
+    def find_visible_snapshot(
+        self,
+        locator: AdvancedLocator,
+        /,
+        *,
+        properties: t.Iterable[str] = ("text",),
+        attributes: t.Iterable[str] = (),
+        css: t.Iterable[str] = (),
+        timeout: t.Optional[float] = None,
+    ) -> list[dict[str, t.Any]]:
+        """Ожидание, пока все элементы локатора станут видимыми, и снимок их свойств.
+
+        Аналог `find_visible_elements`, но каждая итерация ожидания — один вызов `execute_script`.
+
+        Raises:
+            ElementNotPresentOnPageError: элементы не найдены или не все видимы за таймаут.
+        """
+        properties = tuple(dict.fromkeys((*properties, "visible")))
+
+        def wrapper() -> t.Optional[list[dict[str, t.Any]]]:
+            snapshot = self.snapshot_elements(locator, properties=properties, attributes=attributes, css=css)
+            if snapshot and all(item["visible"] for item in snapshot):
+                return snapshot
+            return None
+
+        result = self._wait_for(
+            wrapper,
+            timeout=timeout,
+            check=True,
+            error=exceptions.JavascriptException,
+            raise_exception=False,
+        )
+        if result is None:
+            raise ElementNotPresentOnPageError(locator, timeout=timeout)
+        return result
+
+    @instrumented("ui")
     def wait_hide_element(self, locator: AdvancedLocator, /, *, timeout: int = None) -> WebElement:
+        message = f"Элемент не исчез со страницы (timeout={timeout}). Локатор: {locator}."
+        fallback_timeout = timeout
         try:
-            return self.wait(timeout=timeout).until(
+            if self.wait_mode is WaitMode.BROWSER:
+                deadline = self._browser_deadline(timeout)
+                with contextlib.suppress(exceptions.JavascriptException):
+                    return self._wait_in_browser(locator, "hidden", timeout=timeout, message=message)
+                fallback_timeout = deadline.remaining
+            return self.wait(timeout=fallback_timeout).until(
                 method=ec.invisibility_of_element_located(locator.as_locator),
-                message=f"Элемент не исчез со страницы (timeout={timeout}). Локатор: {locator}.",
+                message=message,
             )
         except exceptions.TimeoutException as ex:
             raise ElementNotDisappearedOnPageError(locator, timeout=timeout) from ex
@@ -203,14 +495,26 @@ class _BaseActions(ABC):
                     return True
             raise TextNotPresentInElementError(locator, "", timeout=timeout)
 
-        return wait(
+        return self._wait_for(
             method=wrapper,
             timeout=timeout,
             check=True,
             error=(TextNotPresentInElementError, ElementNotPresentOnPageError),
         )
 
+    @instrumented("ui")
     def wait_text_present(self, locator: AdvancedLocator, text: str, /, *, timeout: int = None) -> str:
+        fallback_timeout = timeout
+        if self.wait_mode is WaitMode.BROWSER:
+            deadline = self._browser_deadline(timeout)
+            try:
+                with contextlib.suppress(exceptions.JavascriptException):
+                    self._wait_in_browser(locator, "text", timeout=timeout, text=text)
+                    return text
+            except exceptions.TimeoutException as ex:
+                raise TextNotPresentInElementError(locator, text, timeout=timeout) from ex
+            fallback_timeout = deadline.remaining
+
         def wrapper():
             element_text = self.get_text_from_obj(locator, timeout=1)
             if isinstance(element_text, str):
@@ -218,13 +522,14 @@ class _BaseActions(ABC):
                     return text
             raise TextNotPresentInElementError(locator, text, timeout=timeout)
 
-        return wait(
+        return self._wait_for(
             method=wrapper,
-            timeout=timeout,
+            timeout=fallback_timeout,
             check=True,
             error=(TextNotPresentInElementError, ElementNotPresentOnPageError),
         )
 
+    @instrumented("ui")
     def wait_text_appear_in_array_texts(
         self,
         locator: AdvancedLocator,
@@ -239,7 +544,7 @@ class _BaseActions(ABC):
                 return True
             return None
 
-        return wait(wrapper, timeout=timeout, check=True, raise_exception=False) or False
+        return self._wait_for(wrapper, timeout=timeout, check=True, raise_exception=False) or False
 
     def is_present_text_in_element(self, locator: AdvancedLocator, /, *, timeout: int = None) -> bool:
         return self.__is_present_text_in_web_element(locator, self.get_text_from_obj, timeout=timeout)
@@ -247,6 +552,7 @@ class _BaseActions(ABC):
     def is_present_text_in_input(self, locator: AdvancedLocator, /, *, timeout: float = None) -> bool:
         return self.__is_present_text_in_web_element(locator, self.get_value_from_obj, timeout=timeout)
 
+    @instrumented("ui")
     def wait_text_change_from(self, locator: AdvancedLocator, text: str, /, *, timeout: int = None) -> bool:
         def _method():
             _text = self.get_text_from_obj(locator, timeout=1)
@@ -254,10 +560,9 @@ class _BaseActions(ABC):
                 return True
             raise ElementNotDisappearedOnPageError(locator, reason=f'Текст не сменился с "{text}".')
 
-        return wait(
+        return self._wait_for(
             method=_method,
             timeout=timeout,
-            interval=1,
             check=True,
             error=ElementNotDisappearedOnPageError,
         )
@@ -270,7 +575,7 @@ class _BaseActions(ABC):
         exc: bool = True,
         timeout: t.Optional[int] = None,
     ) -> t.Optional[str]:
-        result = wait(
+        result = self._wait_for(
             method=callback,
             timeout=timeout,
             check=True,
@@ -285,6 +590,7 @@ class _BaseActions(ABC):
             return str(result)
         return None
 
+    @instrumented("ui")
     def get_text_from_obj(
         self,
         locator: AdvancedLocator,
@@ -299,6 +605,7 @@ class _BaseActions(ABC):
 
         return self.__get_text_from_object(wrapper, timeout=timeout)
 
+    @instrumented("ui")
     def get_text_from_hidden_obj(
         self,
         locator: AdvancedLocator,
@@ -313,6 +620,8 @@ class _BaseActions(ABC):
 
         return self.__get_text_from_object(wrapper, timeout=timeout)
 
+    # Локатор — второй аргумент: цель по умолчанию (первый аргумент) была бы именем атрибута.
+    @instrumented("ui", target=lambda self, attribute_name, locator, **kwargs: "=".join(locator.as_locator))
     def get_attr_from_obj(
         self,
         attribute_name: str,
@@ -329,7 +638,7 @@ class _BaseActions(ABC):
                 raise AttributeNotPresentInWebElementError(locator, attribute_name, timeout=timeout)
             raise ElementNotPresentOnPageError(locator, timeout=timeout)
 
-        return wait(
+        return self._wait_for(
             method=wrapper,
             timeout=timeout,
             check=True,
@@ -343,28 +652,48 @@ class _BaseActions(ABC):
         return self.get_attr_from_obj("value", locator, timeout=timeout)
 
     def get_values_from_objects(self, locator: AdvancedLocator, /, *, timeout: float = None) -> list[t.Any]:
-        return [element.get_attribute("value") for element in self.find_visible_elements(locator, timeout=timeout)]
+        return [item["value"] for item in self.find_visible_snapshot(locator, properties=("value",), timeout=timeout)]
 
     ##################################
+    @instrumented("ui")
     def get_selected_from_obj(
         self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None
     ) -> t.Optional[bool]:
         return bool(
-            wait(
+            self._wait_for(
                 method=lambda: self.find_visible_element(locator, timeout=timeout).is_selected(),
                 timeout=timeout,
                 check=True,
             )
         )
 
-    def set_value_to_checkbox(self, locator: AdvancedLocator, value: bool, /):
+    @instrumented("ui")
+    def set_value_to_checkbox(
+        self,
+        locator: AdvancedLocator,
+        value: bool,
+        /,
+        *,
+        mode: t.Optional[InputMode] = None,
+        settle_timeout: float = 2,
+    ):
         web_element = self.find_visible_element(locator)
         web_element_selected = web_element.is_selected()
         if value and not web_element_selected:
             web_element.click()
         elif not value and web_element_selected:
             web_element.click()
-        time.sleep(0.5)
+
+        if (mode or self.input_mode) is InputMode.LEGACY:
+            time.sleep(0.5)
+        elif web_element_selected != value:
+            # Ожидаем, что состояние чекбокса действительно переключилось.
+            self._wait_for(
+                lambda: web_element.is_selected() == value or None,
+                check=True,
+                timeout=settle_timeout,
+                raise_exception=False,
+            )
 
     def get_visible_elements_by_locator(
         self,
@@ -374,19 +703,22 @@ class _BaseActions(ABC):
         timeout: t.Optional[int] = None,
     ) -> list[WebElement]:
         try:
-            return self.wait(timeout=timeout).until(ec.visibility_of_all_elements_located(locator))
-        except exceptions.TimeoutException:
+            snapshot = self.find_visible_snapshot(locator, properties=("element",), timeout=timeout)
+        except ElementNotPresentOnPageError:
             return []
+        return [item["element"] for item in snapshot]
 
     def is_exists_elements(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> bool:
         return len(self.get_visible_elements_by_locator(locator, timeout=timeout)) > 0
 
+    @instrumented("ui")
     def is_enabled_element(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> bool:
         try:
             return self.find_visible_element(locator, timeout=timeout).is_enabled()
         except ElementNotPresentOnPageError:
             return False
 
+    @instrumented("ui")
     def is_enabled_hidden_element(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> bool:
         try:
             return self.find_element(locator, timeout=timeout).is_enabled()
@@ -394,10 +726,10 @@ class _BaseActions(ABC):
             return False
 
     def get_count_elements_on_page(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> int:
-        return len(self.find_visible_elements(locator, timeout=timeout))
+        return len(self.find_visible_snapshot(locator, properties=(), timeout=timeout))
 
     def get_texts_by_locator(self, locator: AdvancedLocator, /, *, timeout: t.Optional[int] = None) -> t.List[str]:
-        return [element.text for element in self.find_visible_elements(locator, timeout=timeout)]
+        return [item["text"] for item in self.find_visible_snapshot(locator, properties=("text",), timeout=timeout)]
 
     def get_element_style(
         self,
@@ -418,8 +750,9 @@ class _BaseActions(ABC):
                 return expected_value in selected_attribute
             return None
 
-        return wait(method=wrapper, check=True, raise_exception=False)
+        return self._wait_for(method=wrapper, check=True, raise_exception=False)
 
+    @instrumented("ui")
     def wait_number_of_elements_to_appear(
         self,
         locator: AdvancedLocator,
@@ -438,11 +771,30 @@ class _BaseActions(ABC):
                 return True
             return None
 
+        fallback_timeout = timeout
+        if self.wait_mode is WaitMode.BROWSER:
+            deadline = self._browser_deadline(timeout)
+            try:
+                with contextlib.suppress(exceptions.JavascriptException):
+                    self._wait_in_browser(
+                        locator,
+                        "count",
+                        timeout=timeout,
+                        count=count_elements,
+                        exact=True,
+                        visible=is_visibility,
+                    )
+                    return True
+            except exceptions.TimeoutException:
+                return False
+            fallback_timeout = deadline.remaining
+
         try:
-            return wait(method=wrapper, check=True, timeout=timeout, raise_exception=False) or False
+            return self._wait_for(method=wrapper, check=True, timeout=fallback_timeout, raise_exception=False) or False
         except exceptions.TimeoutException as ex:
             raise ElementNotPresentOnPageError(locator, timeout=timeout) from ex
 
+    @instrumented("ui")
     def wait_number_of_more_elements_to_appear(
         self,
         locator: AdvancedLocator,
@@ -461,14 +813,66 @@ class _BaseActions(ABC):
                 return True
             return None
 
+        fallback_timeout = timeout
+        if self.wait_mode is WaitMode.BROWSER:
+            deadline = self._browser_deadline(timeout)
+            try:
+                with contextlib.suppress(exceptions.JavascriptException):
+                    self._wait_in_browser(
+                        locator,
+                        "count",
+                        timeout=timeout,
+                        count=count_elements,
+                        exact=False,
+                        visible=is_visibility,
+                    )
+                    return True
+            except exceptions.TimeoutException:
+                return False
+            fallback_timeout = deadline.remaining
+
         try:
-            return wait(method=wrapper, check=True, timeout=timeout, raise_exception=False) or False
+            return self._wait_for(method=wrapper, check=True, timeout=fallback_timeout, raise_exception=False) or False
         except exceptions.TimeoutException as ex:
             raise ElementNotPresentOnPageError(locator, timeout=timeout) from ex
 
 
 class BasePageActions(_BaseActions, ABC):
 
+    # Режим открытия страницы (`open_page`).
+    open_mode: OpenMode = OpenMode.LEGACY
+
+    # Режим FAST: обновление страницы после перехода (в режиме LEGACY — всегда).
+    refresh_on_open: bool = False
+
+    # Режим FAST: "normal" — `driver.get` (ожидание по стратегии загрузки сессии, `--xtest-page-load-strategy`),
+    # "none" — переход скриптом без ожидания загрузки.
+    navigation_strategy: str = "normal"
+
+    # Режим FAST: минимальное состояние document.readyState ("interactive" или "complete").
+    ready_state: str = "complete"
+
+    # Режим FAST: JS-выражение готовности страницы, проверяемое вместе с URL и readyState
+    # (например, "document.querySelector('textarea[name=q]') !== null"). Если не задано,
+    # после пробы вызывается `is_loading_page` (если он переопределен).
+    ready_script: t.Optional[str] = None
+
+    # Режим FAST: таймаут открытия страницы в секундах.
+    open_timeout: float = 35.0
+
+    # Длительность этапов последнего открытия страницы в режиме FAST.
+    last_open_timings: t.Optional[OpenTimings] = None
+
+    # Заполняются в `__init_subclass__`: скомпилированный `endpoint_pattern` и условия URL по базовому URL.
+    _endpoint_regex: t.ClassVar[t.Optional[re.Pattern]] = None
+    _url_predicates: t.ClassVar[dict[tuple[str, str], UrlMatches]] = {}
+
+    def __init_subclass__(cls, **kwargs: t.Any) -> None:
+        super().__init_subclass__(**kwargs)
+        pattern = getattr(cls, "endpoint_pattern", None)
+        cls._endpoint_regex = compile_pattern(pattern) if isinstance(pattern, str) else None
+        cls._url_predicates = {}
+
     # Название страницы.
     page_name: str
 
@@ -496,22 +900,38 @@ class BasePageActions(_BaseActions, ABC):
 
     @property
     def browser_url_tabs(self) -> list[str]:
-        urls = []
-        for handle in self.driver.window_handles:
-            self.driver.switch_to.window(handle)
-            urls.append(self.driver.current_url.split("?")[0])
-        self.driver.switch_to.window(self.driver.window_handles[0])
-        return urls
+        """URL вкладок без GET-параметров (текущая вкладка не меняется, см. `WindowManager.urls`)."""
+        return [strip_url(url) for url in self.windows.urls(refresh=True).values()]
+
+    @property
+    def endpoint_regex(self) -> re.Pattern:
+        """Скомпилированный `endpoint_pattern` (паттерн, заданный в экземпляре, компилируется с кэшем)."""
+        regex = self._endpoint_regex
+        if regex is None or regex.pattern != self.endpoint_pattern:
+            regex = compile_pattern(self.endpoint_pattern)
+        return regex
+
+    @property
+    def url_predicate(self) -> UrlMatches:
+        """Условие совпадения URL браузера со страницей (создается один раз на класс и базовый URL)."""
+        key = (self.build_url(), self.endpoint_pattern)
+        if (predicate := self._url_predicates.get(key)) is None:
+            predicate = self._url_predicates[key] = UrlMatches(urljoin(key[0], key[1].lstrip("/")))
+        return predicate
 
     @property
     def get_endpoint_pattern_groups(self) -> t.Optional[tuple]:
-        if result := re.search(self.endpoint_pattern, self.driver.current_url):
+        if result := self.endpoint_regex.search(self._observe_url(self.driver.current_url)):
             return result.groups()
         return None
 
+    @instrumented("ui", target=lambda self: self.endpoint)
     def open_page(self):
+        if self.open_mode is OpenMode.FAST:
+            return self._open_page_fast()
 
         # Открытие страницы по URL.
+        self.invalidate_element_cache()
         self.driver.get(urljoin(self.build_url(), self.endpoint))
 
         # Обновление страницы (на всякий случай, пусть будет пока что тут)
@@ -527,44 +947,139 @@ class BasePageActions(_BaseActions, ABC):
                 return self.is_loading_page()
             return None
 
-        wait_result = wait(
+        wait_result = self._wait_for(
             method=wait_loading_page,
             check=True,
-            interval=0.1,
             timeout=10,
         )
         self.post_open_page()
         return wait_result
 
+    def _open_page_fast(self):
+        timings = self.last_open_timings = OpenTimings()
+        started = time.perf_counter()
+        url = urljoin(self.build_url(), self.endpoint)
+        predicate = self.url_predicate
+
+        if self.navigation_strategy not in _NAVIGATION_STRATEGIES:
+            raise ValueError(
+                f"Неизвестная стратегия перехода {self.navigation_strategy!r}, допустимые: {_NAVIGATION_STRATEGIES}."
+            )
+        self.invalidate_element_cache()
+        if self.navigation_strategy == "none":
+            self.driver.execute_script(NAVIGATE_JS, url)
+        else:
+            self.driver.get(url)
+        timings.navigation = time.perf_counter() - started
+
+        if self.refresh_on_open:
+            phase = time.perf_counter()
+            self.refresh_page()
+            timings.refresh = time.perf_counter() - phase
+
+        # Одна команда на попытку: URL, readyState и условие страницы.
+        phase = time.perf_counter()
+        script = _open_probe(self.ready_script)
+        ready_states = list(_READY_STATES[self.ready_state])
+        deadline = Deadline(self.open_timeout)
+        current_url, matched = None, False
+        for _ in iter_attempts(deadline.remaining, strategy=self.polling):
+            try:
+                current_url, _, ready = self.driver.execute_script(script, ready_states)
+            except exceptions.JavascriptException:
+                continue
+            except exceptions.WebDriverException as ex:
+                if not any(error in str(ex.msg).lower() for error in _NAVIGATION_ERRORS):
+                    raise
+                continue
+            matched = predicate.search(current_url) is not None
+            if timings.url is None and matched:
+                timings.url = time.perf_counter() - phase
+            # URL проверяется в той же попытке, что и готовность: страница могла уйти по редиректу
+            # (например, на страницу входа) после первого совпадения.
+            if ready and matched:
+                break
+        else:
+            reason = "Страница не загрузилась" if matched else "Не произошел переход по URL"
+            raise PageNotLoadedError(self.page_name, reason=f"{reason} (URL: {current_url})")
+        self._observe_url(current_url)
+
+        # Проверка страницы на стороне Python, если условие не задано скриптом: опрос, как в режиме LEGACY,
+        # в пределах оставшегося `open_timeout`.
+        result = True
+        if self.ready_script is None and type(self).is_loading_page is not BasePageActions.is_loading_page:
+            result = self._wait_for(method=self.is_loading_page, check=True, timeout=deadline.remaining)
+        timings.ready = time.perf_counter() - phase
+
+        phase = time.perf_counter()
+        self.post_open_page()
+        timings.post_open = time.perf_counter() - phase
+        timings.total = time.perf_counter() - started
+        return result
+
+    @instrumented("ui", target=lambda self: self.endpoint)
     def refresh_page(self) -> BasePageActions:
+        self.invalidate_element_cache()
         self.driver.refresh()
         return self
 
     def set_cookies(self, cookies: RequestsCookieJar, /):
-        for cookie in cookies:
-            self.driver.add_cookie(
-                {
-                    "name": cookie.name,
-                    "value": cookie.value,
-                    "domain": cookie.domain,
-                    "httpOnly": False,
-                }
-            )
+        """Установка cookies со всеми атрибутами (path, secure, expiry, HttpOnly).
+
+        В Chromium cookies задаются одной командой CDP без предварительного открытия страницы.
+        """
+        restore_session_state(self.driver, SessionState(origin_of(self.build_url()), cookies_from_jar(cookies)))
+
+    @instrumented("ui", target=lambda self, snapshots, username, **kwargs: f"{self.endpoint} as {username}")
+    def open_page_as(self, snapshots: SessionSnapshots, username: str, /, *, role: t.Optional[str] = None):
+        """Открытие страницы от имени пользователя без UI-логина.
+
+        Если снимок состояния входа пользователя (и роли) есть в `snapshots`, он восстанавливается
+        без запросов к Keycloak. Иначе используются cookies имперсонации Keycloak, а после открытия
+        страницы (и входа через SSO) снимается новый снимок.
+
+        Args:
+            snapshots (SessionSnapshots): снимки состояния входа.
+            username (str): имя пользователя.
+            role (typing.Optional[str]): роль, под которой выполнен вход (часть ключа снимка).
+        """
+        origin = origin_of(self.build_url())
+        state = snapshots.get(username, origin=origin, role=role)
+        cached = state is not None
+        if state is None:
+            state = snapshots.from_keycloak(username, origin=origin)
+        injection = restore_session_state(self.driver, state)
+        try:
+            result = self.open_page()
+        except PageNotLoadedError:
+            # Устаревший снимок (сессия отозвана) не должен использоваться повторно.
+            if cached:
+                snapshots.discard(username, origin=origin, role=role)
+            raise
+        finally:
+            remove_injection(self.driver, injection)
+        if not cached:
+            snapshots.put(capture_session_state(self.driver), username, role=role)
+        return result
 
     def is_loading_page(self) -> bool:
         raise NotImplementedError()
 
+    @instrumented("ui")
     def wait_change_url_to(self, url: str, /, *, timeout: int = None) -> bool:
         try:
             self.wait(timeout=timeout).until(ec.url_to_be(url))
+            self._observe_url(url)
             return True
         except TimeoutException:
             return False
 
+    @instrumented("ui", target=lambda self, **kwargs: self.endpoint_pattern)
     def wait_change_url_by_pattern(self, /, *, timeout: int = None) -> bool:
-        url_pattern = urljoin(self.build_url(), self.endpoint_pattern.lstrip("/"))
         try:
-            self.wait(timeout=timeout).until(url_matches_without_get_parameters(url_pattern))
+            self.wait(timeout=timeout).until(self.url_predicate)
+            # Как и в `wait_change_url_to`: новый URL сбрасывает кэш элементов и запоминается для вкладки.
+            self._observe_url(self.driver.current_url)
             return True
         except TimeoutException:
             return False
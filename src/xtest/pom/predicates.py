@@ -1,12 +1,179 @@
+"""Условия ожиданий WebDriver (для `WebDriverWait.until`) с заранее скомпилированными паттернами.
+
+Условия объединяются через `&` и `|`: составное условие читает `current_url` и `title` не более
+одного раза за попытку опроса, сколько бы частей от них ни зависело.
+"""
+from __future__ import annotations
+
+import abc
+import functools
 import re
+import typing as t
 
+from selenium.common import exceptions
 from selenium.webdriver.remote.webdriver import WebDriver
 
+if t.TYPE_CHECKING:
+    from xtest.pom.locators import AdvancedLocator
 
-def url_matches_without_get_parameters(pattern: str):
-    """Работает аналогично 'expected_conditions.url_matches', только в данном случае игнорируются GET-параметры."""
 
-    def _predicate(driver: WebDriver):
-        return bool(re.search(pattern, driver.current_url.split("?")[0].split("#")[0]))
+@functools.lru_cache(maxsize=1024)
+def compile_pattern(pattern: str, /) -> re.Pattern:
+    """Скомпилированный паттерн (кэш на процесс)."""
+    return re.compile(pattern)
+
+
+def strip_url(url: str, /) -> str:
+    """URL без GET-параметров и фрагмента."""
+    return url.partition("?")[0].partition("#")[0]
+
+
+class DriverState:
+    """Состояние браузера в пределах одной попытки опроса: каждое значение запрашивается один раз."""
+
+    __slots__ = ("driver", "_url", "_title")
+
+    def __init__(self, driver: WebDriver, /) -> None:
+        self.driver = driver
+        self._url: t.Optional[str] = None
+        self._title: t.Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        if self._url is None:
+            self._url = self.driver.current_url
+        return self._url
+
+    @property
+    def title(self) -> str:
+        if self._title is None:
+            self._title = self.driver.title
+        return self._title
+
+
+class Predicate(abc.ABC):
+    """Условие ожидания. Вызов с драйвером — одна попытка опроса."""
+
+    def __call__(self, driver: WebDriver) -> t.Any:
+        return self.evaluate(DriverState(driver))
+
+    @abc.abstractmethod
+    def evaluate(self, state: DriverState, /) -> t.Any:
+        """Результат условия (ложное значение — условие не выполнено)."""
+        raise NotImplementedError()
+
+    def __and__(self, other: Predicate) -> AllOf:
+        return AllOf(self, other)
+
+    def __or__(self, other: Predicate) -> AnyOf:
+        return AnyOf(self, other)
+
+
+class AllOf(Predicate):
+    """Все условия выполнены; результат — результат последнего условия."""
+
+    def __init__(self, *predicates: Predicate) -> None:
+        # Вложенные AllOf разворачиваются, чтобы не создавать лишних уровней вызовов.
+        self.predicates = tuple(
+            item
+            for predicate in predicates
+            for item in (predicate.predicates if isinstance(predicate, AllOf) else (predicate,))
+        )
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {list(self.predicates)}>"
+
+    def evaluate(self, state: DriverState, /) -> t.Any:
+        result: t.Any = True
+        for predicate in self.predicates:
+            result = predicate.evaluate(state)
+            if not result:
+                return False
+        return result
+
+
+class AnyOf(Predicate):
+    """Хотя бы одно условие выполнено; результат — результат первого выполненного условия."""
+
+    def __init__(self, *predicates: Predicate) -> None:
+        self.predicates = tuple(
+            item
+            for predicate in predicates
+            for item in (predicate.predicates if isinstance(predicate, AnyOf) else (predicate,))
+        )
 
-    return _predicate
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {list(self.predicates)}>"
+
+    def evaluate(self, state: DriverState, /) -> t.Any:
+        for predicate in self.predicates:
+            if result := predicate.evaluate(state):
+                return result
+        return False
+
+
+class UrlMatches(Predicate):
+    """URL (без GET-параметров и фрагмента) соответствует паттерну; результат — `re.Match`."""
+
+    def __init__(self, pattern: t.Union[str, re.Pattern], /) -> None:
+        self.pattern = compile_pattern(pattern) if isinstance(pattern, str) else pattern
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.pattern.pattern!r}>"
+
+    def __call__(self, driver: WebDriver) -> t.Union[re.Match, bool]:
+        # Одиночное условие не создает DriverState.
+        return self.search(driver.current_url) or False
+
+    def search(self, url: str, /) -> t.Optional[re.Match]:
+        return self.pattern.search(strip_url(url))
+
+    def evaluate(self, state: DriverState, /) -> t.Union[re.Match, bool]:
+        return self.search(state.url) or False
+
+
+class UrlIs(Predicate):
+    def __init__(self, url: str, /) -> None:
+        self.url = url
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.url!r}>"
+
+    def evaluate(self, state: DriverState, /) -> bool:
+        return state.url == self.url
+
+
+class TitleMatches(Predicate):
+    def __init__(self, pattern: t.Union[str, re.Pattern], /) -> None:
+        self.pattern = compile_pattern(pattern) if isinstance(pattern, str) else pattern
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.pattern.pattern!r}>"
+
+    def evaluate(self, state: DriverState, /) -> t.Union[re.Match, bool]:
+        return self.pattern.search(state.title) or False
+
+
+class ElementPresent(Predicate):
+    """Элементы локатора есть в DOM (при `visible=True` — хотя бы один видим); результат — элемент."""
+
+    def __init__(self, locator: AdvancedLocator, /, *, visible: bool = False) -> None:
+        self.locator = locator
+        self.visible = visible
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.locator.as_locator} visible={self.visible}>"
+
+    def evaluate(self, state: DriverState, /) -> t.Any:
+        try:
+            for element in state.driver.find_elements(*self.locator.as_locator):
+                if not self.visible or element.is_displayed():
+                    return element
+        except exceptions.StaleElementReferenceException:
+            return False
+        return False
+
+
+def url_matches_without_get_parameters(pattern: t.Union[str, re.Pattern]) -> UrlMatches:
+    """Работает аналогично 'expected_conditions.url_matches', только в данном случае игнорируются GET-параметры."""
+    return UrlMatches(pattern)
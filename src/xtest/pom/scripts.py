@@ -0,0 +1,231 @@
+"""JavaScript-сценарии, выполняемые на стороне браузера."""
+
+# Поиск элементов по паре (by, value) из `AdvancedLocator.as_locator` и проверка видимости.
+# Видимость приближена к `WebElement.is_displayed()`: элемент имеет геометрию,
+# не скрыт через display/visibility и не полностью прозрачен.
+_HELPERS_JS = """
+const __xtestFind = function (by, value) {
+    const byCss = (selector) => Array.from(document.querySelectorAll(selector));
+    switch (by) {
+        case "css selector":
+            return byCss(value);
+        case "id":
+            return byCss('[id="' + CSS.escape(value) + '"]');
+        case "name":
+            return byCss('[name="' + CSS.escape(value) + '"]');
+        case "class name":
+            return byCss("." + CSS.escape(value));
+        case "tag name":
+            return Array.from(document.getElementsByTagName(value));
+        case "link text":
+            return byCss("a").filter((el) => el.innerText.trim() === value);
+        case "partial link text":
+            return byCss("a").filter((el) => el.innerText.includes(value));
+        case "xpath": {
+            const snapshot = document.evaluate(
+                value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            const nodes = [];
+            for (let i = 0; i < snapshot.snapshotLength; i++) {
+                nodes.push(snapshot.snapshotItem(i));
+            }
+            return nodes;
+        }
+        default:
+            throw new Error("Unsupported locator strategy: " + by);
+    }
+};
+const __xtestIsVisible = function (el) {
+    if (!el.isConnected || el.getClientRects().length === 0) {
+        return false;
+    }
+    for (let node = el; node && node.nodeType === 1; node = node.parentElement) {
+        const style = window.getComputedStyle(node);
+        if (style.display === "none" || style.opacity === "0") {
+            return false;
+        }
+    }
+    return window.getComputedStyle(el).visibility !== "hidden";
+};
+"""
+
+# Асинхронное ожидание условия внутри страницы: проверка выполняется при каждой мутации DOM
+# и на каждом кадре отрисовки (анимации/transition не всегда порождают мутации).
+# Аргументы: by, value, condition, expected, timeout_ms, callback.
+# Условия:
+#   visible   — первый видимый элемент;
+#   hidden    — видимых элементов нет;
+#   count     — количество (видимых, если expected.visible) элементов == / >= expected.count;
+#   text      — текст первого видимого элемента (без пробелов по краям) равен expected.text.
+WAIT_CONDITION_JS = (
+    _HELPERS_JS
+    + """
+const [by, value, condition, expected, timeoutMs, done] = arguments;
+
+const check = function () {
+    const elements = __xtestFind(by, value);
+    switch (condition) {
+        case "visible": {
+            const element = elements.find(__xtestIsVisible);
+            return element ? {ok: true, value: element} : null;
+        }
+        case "hidden":
+            return elements.some(__xtestIsVisible) ? null : {ok: true, value: true};
+        case "count": {
+            const matched = expected.visible ? elements.filter(__xtestIsVisible) : elements;
+            if (expected.visible && matched.length !== elements.length) {
+                return null;
+            }
+            const ok = expected.exact ? matched.length === expected.count : matched.length >= expected.count;
+            return ok ? {ok: true, value: matched.length} : null;
+        }
+        case "text": {
+            const element = elements.find(__xtestIsVisible);
+            return element && element.innerText.trim() === expected.text ? {ok: true, value: element} : null;
+        }
+        default:
+            throw new Error("Unsupported wait condition: " + condition);
+    }
+};
+
+let finished = false;
+let observer = null;
+let timer = null;
+const finish = function (result) {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    if (observer) {
+        observer.disconnect();
+    }
+    clearTimeout(timer);
+    done(result);
+};
+const probe = function () {
+    if (finished) {
+        return;
+    }
+    try {
+        const result = check();
+        if (result) {
+            finish(result);
+        }
+    } catch (error) {
+        finish({ok: false, error: String(error)});
+    }
+};
+const schedule = window.requestAnimationFrame
+    ? (callback) => window.requestAnimationFrame(callback)
+    : (callback) => setTimeout(callback, 16);
+const onFrame = function () {
+    probe();
+    if (!finished) {
+        schedule(onFrame);
+    }
+};
+
+probe();
+if (!finished) {
+    observer = new MutationObserver(probe);
+    observer.observe(document.documentElement, {
+        subtree: true, childList: true, attributes: true, characterData: true,
+    });
+    timer = setTimeout(() => finish({ok: false, timeout: true}), timeoutMs);
+    schedule(onFrame);
+}
+"""
+)
+
+# Снимок свойств всех элементов локатора за один вызов `execute_script`.
+# Аргументы: by, value, properties, attributes, css.
+# Свойства: element, text, visible, value, selected, enabled, tag_name.
+SNAPSHOT_ELEMENTS_JS = (
+    _HELPERS_JS
+    + """
+const [by, value, properties, attributes, css] = arguments;
+
+const readers = {
+    element: (el) => el,
+    text: (el) => (__xtestIsVisible(el) ? el.innerText : ""),
+    visible: (el) => __xtestIsVisible(el),
+    value: (el) => (el.value === undefined ? el.getAttribute("value") : String(el.value)),
+    selected: (el) => Boolean(el.checked || el.selected),
+    enabled: (el) => !el.disabled,
+    tag_name: (el) => el.tagName.toLowerCase(),
+};
+
+return __xtestFind(by, value).map(function (el) {
+    const item = {};
+    for (const name of properties) {
+        item[name] = readers[name](el);
+    }
+    if (attributes.length) {
+        item.attributes = {};
+        for (const name of attributes) {
+            item.attributes[name] = el.getAttribute(name);
+        }
+    }
+    if (css.length) {
+        const style = window.getComputedStyle(el);
+        item.css = {};
+        for (const name of css) {
+            item.css[name] = style.getPropertyValue(name);
+        }
+    }
+    return item;
+});
+"""
+)
+
+SNAPSHOT_PROPERTIES = frozenset(("element", "text", "visible", "value", "selected", "enabled", "tag_name"))
+
+# Очистка поля ввода за один вызов: значение сбрасывается через нативный setter
+# (чтобы его увидели React/Vue), затем генерируются события input/change.
+# Аргументы: element. Возвращает значение поля после очистки.
+CLEAR_INPUT_JS = """
+const [el] = arguments;
+if (el instanceof HTMLInputElement || el instanceof HTMLTextAreaElement) {
+    const proto = Object.getPrototypeOf(el);
+    const descriptor = Object.getOwnPropertyDescriptor(proto, "value");
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(el, "");
+    } else {
+        el.value = "";
+    }
+} else if (el.isContentEditable) {
+    el.textContent = "";
+} else {
+    return el.value === undefined ? null : String(el.value);
+}
+el.dispatchEvent(new Event("input", {bubbles: true}));
+el.dispatchEvent(new Event("change", {bubbles: true}));
+return el.value === undefined ? "" : String(el.value);
+"""
+
+# Переход без ожидания загрузки (аналог стратегии загрузки "none" для одной навигации). Текущий документ
+# помечается, чтобы проба готовности не приняла его за новый, если URL совпадает.
+# Аргументы: url.
+NAVIGATE_JS = """
+window.__xtestStaleDocument = true;
+window.location.assign(arguments[0]);
+"""
+
+# Проба готовности страницы за один вызов: URL, document.readyState и условие страницы.
+# Аргументы: readyStates (допустимые состояния). Возвращает [url, readyState, ready]: ready — null,
+# пока документ старый или не достиг нужного состояния, иначе результат условия страницы.
+# __CONDITION__ заменяется JS-выражением страницы (`BasePageActions.ready_script`).
+OPEN_PAGE_PROBE_JS = """
+const [readyStates] = arguments;
+const state = document.readyState;
+if (window.__xtestStaleDocument || !readyStates.includes(state)) {
+    return [window.location.href, state, null];
+}
+let ready;
+try {
+    ready = Boolean(__CONDITION__);
+} catch (error) {
+    ready = false;
+}
+return [window.location.href, state, ready];
+"""
@@ -0,0 +1,315 @@
+"""Снимки состояния входа (cookies, localStorage, sessionStorage) для открытия страниц без UI-логина.
+
+Снимок пользователя (и роли) снимается один раз после первого входа и хранится с ограниченным
+временем жизни. Последующие открытия страниц восстанавливают его одной командой CDP
+(`Network.setCookies`) и скриптом, выполняемым при создании документа, — без запросов к Keycloak
+и без редиректов через страницу входа. Без CDP снимок восстанавливается одним `execute_script`
+(storage и cookies без HttpOnly) и `add_cookie` только для HttpOnly-cookies.
+
+Снимки содержат действующие cookies сессии: каталог хранилища не должен быть общедоступным.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import time
+import typing as t
+from urllib.parse import urlparse
+
+from requests.cookies import RequestsCookieJar
+from selenium.common import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from xtest.api.cache import ResponseStore
+
+if t.TYPE_CHECKING:
+    from xtest.utils.keycloak import KeycloakClient
+
+# Аргументы: origin, localStorage, sessionStorage, cookies (без HttpOnly).
+_RESTORE_STORAGE_JS = """
+const [origin, local, session, cookies] = arguments;
+if (window.location.origin !== origin) {
+    return false;
+}
+for (const [key, value] of Object.entries(local)) {
+    window.localStorage.setItem(key, value);
+}
+for (const [key, value] of Object.entries(session)) {
+    window.sessionStorage.setItem(key, value);
+}
+for (const cookie of cookies) {
+    // Имя и значение записываются как есть: это исходные байты cookie, кодирование изменило бы их.
+    let line = cookie.name + "=" + cookie.value + "; path=" + (cookie.path || "/");
+    // Cookie хоста (домен без точки, равный хосту) задается без domain: атрибут распространил бы ее
+    // на поддомены.
+    if (cookie.domain && cookie.domain !== window.location.hostname) {
+        line += "; domain=" + cookie.domain;
+    }
+    if (cookie.expiry) {
+        line += "; expires=" + new Date(cookie.expiry * 1000).toUTCString();
+    }
+    if (cookie.secure) {
+        line += "; secure";
+    }
+    if (cookie.sameSite) {
+        line += "; samesite=" + cookie.sameSite;
+    }
+    document.cookie = line;
+}
+return true;
+"""
+
+_CAPTURE_STORAGE_JS = """
+const copy = (storage) => Object.fromEntries(
+    Array.from({length: storage.length}, (_, index) => storage.key(index)).map((key) => [key, storage.getItem(key)])
+);
+return [window.location.origin, copy(window.localStorage), copy(window.sessionStorage)];
+"""
+
+# Восстановление storage при создании документа нужного origin (до скриптов приложения), один раз на вкладку.
+_INJECT_STORAGE_JS = """
+(function (origin, local, session) {
+    if (window.location.origin !== origin || window.sessionStorage.getItem("__xtest_state_restored")) {
+        return;
+    }
+    for (const [key, value] of Object.entries(local)) {
+        window.localStorage.setItem(key, value);
+    }
+    for (const [key, value] of Object.entries(session)) {
+        window.sessionStorage.setItem(key, value);
+    }
+    window.sessionStorage.setItem("__xtest_state_restored", "1");
+})(%s, %s, %s);
+"""
+
+_SAME_SITE = {"strict": "Strict", "lax": "Lax", "none": "None"}
+
+
+def origin_of(url: str, /) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def cookies_from_jar(jar: RequestsCookieJar, /) -> list[dict[str, t.Any]]:
+    """Cookies из jar requests в формате WebDriver со всеми атрибутами (path, secure, expiry, HttpOnly)."""
+    cookies = []
+    for cookie in jar:
+        item: dict[str, t.Any] = {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path or "/",
+            "secure": bool(cookie.secure),
+            "httpOnly": any(name.lower() == "httponly" for name in getattr(cookie, "_rest", {})),
+        }
+        if cookie.expires is not None:
+            item["expiry"] = int(cookie.expires)
+        same_site = next(
+            (value for name, value in getattr(cookie, "_rest", {}).items() if name.lower() == "samesite"), None
+        )
+        if same_site and same_site.lower() in _SAME_SITE:
+            item["sameSite"] = _SAME_SITE[same_site.lower()]
+        cookies.append(item)
+    return cookies
+
+
+@dataclasses.dataclass
+class SessionState:
+    # Origin приложения (scheme://host[:port]), для которого снят storage.
+    origin: str
+    cookies: list[dict[str, t.Any]] = dataclasses.field(default_factory=list)
+    local_storage: dict[str, str] = dataclasses.field(default_factory=dict)
+    session_storage: dict[str, str] = dataclasses.field(default_factory=dict)
+    captured_at: float = dataclasses.field(default_factory=time.time)
+
+    @property
+    def expires_at(self) -> t.Optional[float]:
+        """Время истечения самой короткоживущей cookie (None — только сессионные cookies)."""
+        expirations = [cookie["expiry"] for cookie in self.cookies if cookie.get("expiry")]
+        return min(expirations) if expirations else None
+
+    def as_dict(self) -> dict[str, t.Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, t.Any], /) -> SessionState:
+        return cls(**data)
+
+
+def _cdp(driver: WebDriver, command: str, params: dict[str, t.Any], /) -> t.Optional[dict[str, t.Any]]:
+    # None — CDP недоступен (не Chromium или Selenium Grid без проброса CDP).
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return None
+    try:
+        return driver.execute_cdp_cmd(command, params)
+    except WebDriverException:
+        return None
+
+
+def _cdp_cookie(cookie: dict[str, t.Any], origin: str, /) -> dict[str, t.Any]:
+    item = {
+        "name": cookie["name"],
+        "value": cookie["value"],
+        "path": cookie.get("path", "/"),
+        "secure": cookie.get("secure", False),
+        "httpOnly": cookie.get("httpOnly", False),
+    }
+    # Cookie без домена привязывается к origin снимка.
+    if cookie.get("domain"):
+        item["domain"] = cookie["domain"]
+    else:
+        item["url"] = origin
+    if cookie.get("expiry"):
+        item["expires"] = cookie["expiry"]
+    if cookie.get("sameSite"):
+        item["sameSite"] = cookie["sameSite"]
+    return item
+
+
+def _matches_host(domain: t.Optional[str], host: str, /) -> bool:
+    if not domain:
+        return True
+    domain = domain.lstrip(".")
+    return host == domain or host.endswith(f".{domain}")
+
+
+def _webdriver_cookie(cookie: dict[str, t.Any], host: str, /) -> dict[str, t.Any]:
+    # Cookie хоста (домен без точки, равный хосту) добавляется без domain, иначе она станет cookie домена.
+    if cookie.get("domain") == host:
+        return {key: value for key, value in cookie.items() if key != "domain"}
+    return cookie
+
+
+def restore_session_state(driver: WebDriver, state: SessionState, /) -> t.Optional[str]:
+    """Восстановление снимка в браузере.
+
+    С CDP страница не открывается: cookies всех доменов задаются одной командой, а storage —
+    скриптом, который выполнится при создании документа origin снимка (следующее открытие страницы).
+    Без CDP браузер переходит на origin снимка (и домены cookies, если они отличаются).
+
+    Returns:
+        typing.Optional[str]: идентификатор скрипта восстановления storage (см. `remove_injection`).
+    """
+    has_storage = bool(state.local_storage or state.session_storage)
+    cookies = [_cdp_cookie(cookie, state.origin) for cookie in state.cookies]
+    if _cdp(driver, "Network.setCookies", {"cookies": cookies}) is not None:
+        if not has_storage:
+            return None
+        source = _INJECT_STORAGE_JS % tuple(
+            json.dumps(value) for value in (state.origin, state.local_storage, state.session_storage)
+        )
+        result = _cdp(driver, "Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        if result is not None:
+            return result.get("identifier")
+
+    host = urlparse(state.origin).hostname or ""
+    foreign = [cookie for cookie in state.cookies if not _matches_host(cookie.get("domain"), host)]
+    own = [cookie for cookie in state.cookies if _matches_host(cookie.get("domain"), host)]
+    # Cookies других доменов (например, SSO-домен Keycloak) задаются только со страницы этого домена.
+    for domain in sorted({cookie["domain"].lstrip(".") for cookie in foreign}):
+        driver.get(f"{urlparse(state.origin).scheme}://{domain}/")
+        for cookie in foreign:
+            if _matches_host(cookie["domain"], domain):
+                driver.add_cookie(_webdriver_cookie(cookie, domain))
+    if origin_of(driver.current_url) != state.origin:
+        driver.get(f"{state.origin}/")
+    plain = [cookie for cookie in own if not cookie.get("httpOnly")]
+    driver.execute_script(_RESTORE_STORAGE_JS, state.origin, state.local_storage, state.session_storage, plain)
+    for cookie in own:
+        if cookie.get("httpOnly"):
+            driver.add_cookie(_webdriver_cookie(cookie, host))
+    return None
+
+
+def remove_injection(driver: WebDriver, identifier: t.Optional[str], /) -> None:
+    """Удаление скрипта восстановления storage (чтобы он не сработал в следующих тестах)."""
+    if identifier is not None:
+        _cdp(driver, "Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+
+
+def capture_session_state(driver: WebDriver, /) -> SessionState:
+    """Снимок состояния текущей страницы: cookies (с CDP — всех доменов) и storage её origin."""
+    origin, local_storage, session_storage = driver.execute_script(_CAPTURE_STORAGE_JS)
+    session_storage.pop("__xtest_state_restored", None)
+    if (result := _cdp(driver, "Network.getAllCookies", {})) is not None:
+        cookies = [
+            {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie["domain"],
+                "path": cookie["path"],
+                "secure": cookie["secure"],
+                "httpOnly": cookie["httpOnly"],
+                **({"expiry": int(cookie["expires"])} if not cookie.get("session") and cookie["expires"] > 0 else {}),
+                **({"sameSite": cookie["sameSite"]} if cookie.get("sameSite") else {}),
+            }
+            for cookie in result["cookies"]
+        ]
+    else:
+        cookies = driver.get_cookies()
+    return SessionState(origin, cookies, local_storage, session_storage)
+
+
+@dataclasses.dataclass
+class SessionSnapshotsStats:
+    hits: int = 0
+    misses: int = 0
+    captured: int = 0
+
+
+class SessionSnapshots:
+    """Снимки состояния входа по пользователю, роли и origin приложения.
+
+    Args:
+        store (ResponseStore): хранилище снимков (`DiskStore` — общее для воркеров xdist).
+        keycloak (typing.Optional[KeycloakClient]): клиент Keycloak для первого входа через имперсонацию.
+        ttl (float): максимальное время жизни снимка в секундах.
+        expiry_margin (float): запас до истечения cookies, после которого снимок не используется.
+    """
+
+    def __init__(
+        self,
+        store: ResponseStore,
+        /,
+        *,
+        keycloak: t.Optional[KeycloakClient] = None,
+        ttl: float = 600.0,
+        expiry_margin: float = 30.0,
+    ) -> None:
+        self.store = store
+        self.keycloak = keycloak
+        self.ttl = ttl
+        self.expiry_margin = expiry_margin
+        self.stats = SessionSnapshotsStats()
+
+    @staticmethod
+    def key(username: str, /, *, origin: str, role: t.Optional[str] = None) -> str:
+        raw = json.dumps([username.lower(), role, origin])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, username: str, /, *, origin: str, role: t.Optional[str] = None) -> t.Optional[SessionState]:
+        key = self.key(username, origin=origin, role=role)
+        if (record := self.store.get(key)) is not None:
+            state = SessionState.from_dict(record)
+            now = time.time()
+            expires_at = state.expires_at
+            if now - state.captured_at < self.ttl and (expires_at is None or now < expires_at - self.expiry_margin):
+                self.stats.hits += 1
+                return state
+            self.store.discard(key)
+        self.stats.misses += 1
+        return None
+
+    def put(self, state: SessionState, username: str, /, *, role: t.Optional[str] = None) -> None:
+        self.store.put(self.key(username, origin=state.origin, role=role), state.as_dict())
+        self.stats.captured += 1
+
+    def discard(self, username: str, /, *, origin: str, role: t.Optional[str] = None) -> None:
+        self.store.discard(self.key(username, origin=origin, role=role))
+
+    def from_keycloak(self, username: str, /, *, origin: str) -> SessionState:
+        """Начальное состояние из cookies имперсонации Keycloak (до первого открытия приложения)."""
+        if self.keycloak is None:
+            raise RuntimeError("Снимок не найден, а клиент Keycloak для входа не задан.")
+        return SessionState(origin, cookies_from_jar(self.keycloak.get_impersonate_cookies_by_username(username)))
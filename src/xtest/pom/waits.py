@@ -0,0 +1,119 @@
+"""Ожидания WebDriver: адаптивный опрос (`xtest.utils.polling`) и ожидание на стороне браузера."""
+from __future__ import annotations
+
+import enum
+import math
+import typing as t
+import weakref
+
+from selenium.common import TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+from xtest.pom.scripts import WAIT_CONDITION_JS
+from xtest.utils.polling import PollingStrategy, iter_attempts, resolve_strategy
+
+_R = t.TypeVar("_R")
+
+
+class PollingWebDriverWait(WebDriverWait):
+    """`WebDriverWait` с адаптивным интервалом опроса вместо фиксированного `poll_frequency`."""
+
+    def __init__(
+        self,
+        driver: WebDriver,
+        /,
+        *,
+        timeout: float,
+        polling: t.Union[float, PollingStrategy, None] = None,
+        ignored_exceptions: t.Optional[t.Iterable[t.Type[Exception]]] = None,
+    ) -> None:
+        super().__init__(driver, timeout=timeout, ignored_exceptions=ignored_exceptions)
+        self.polling = resolve_strategy(polling)
+
+    def until(self, method: t.Callable[[WebDriver], t.Union[_R, t.Literal[False]]], message: str = "") -> _R:
+        screen = None
+        stacktrace = None
+        for _ in iter_attempts(self._timeout, strategy=self.polling):
+            try:
+                value = method(self._driver)
+                if value:
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+        raise TimeoutException(message, screen, stacktrace)
+
+    def until_not(self, method: t.Callable[[WebDriver], t.Any], message: str = "") -> t.Any:
+        for _ in iter_attempts(self._timeout, strategy=self.polling):
+            try:
+                value = method(self._driver)
+                if not value:
+                    return value
+            except self._ignored_exceptions:
+                return True
+        raise TimeoutException(message)
+
+
+@enum.unique
+class WaitMode(enum.Enum):
+    # Опрос условия командами WebDriver (find_element/is_displayed на каждой итерации).
+    DRIVER = "driver"
+    # Ожидание внутри браузера: один `execute_async_script` на ожидание.
+    BROWSER = "browser"
+
+
+# Последний выставленный драйверу таймаут асинхронных скриптов (чтобы не отправлять команду на каждое ожидание).
+_script_timeouts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Запас времени сверх таймаута ожидания, чтобы скрипт успел ответить сам, а не был прерван драйвером.
+_SCRIPT_TIMEOUT_MARGIN = 5.0
+
+
+class BrowserWait:
+    """Ожидание условий на стороне браузера через MutationObserver/requestAnimationFrame.
+
+    Каждое ожидание — одна команда `execute_async_script`, независимо от его длительности.
+    """
+
+    def __init__(self, driver: WebDriver, /) -> None:
+        self.driver = driver
+
+    def _ensure_script_timeout(self, timeout: float, /) -> None:
+        required = math.ceil(timeout + _SCRIPT_TIMEOUT_MARGIN)
+        if _script_timeouts.get(self.driver, 0) >= required:
+            return
+        self.driver.set_script_timeout(required)
+        _script_timeouts[self.driver] = required
+
+    def until(
+        self,
+        locator: tuple[str, str],
+        condition: str,
+        /,
+        *,
+        timeout: float,
+        message: str = "",
+        **expected: t.Any,
+    ) -> t.Any:
+        """Ожидание условия для локатора.
+
+        Args:
+            locator (tuple[str, str]): пара (by, value).
+            condition (str): условие ("visible", "hidden", "count", "text").
+            timeout (float): таймаут ожидания в секундах.
+            message (str): сообщение для TimeoutException.
+            expected: параметры условия (count/exact/visible для "count", text для "text").
+
+        Returns:
+            typing.Any: WebElement для "visible"/"text", количество для "count", True для "hidden".
+        """
+        self._ensure_script_timeout(timeout)
+        by, value = locator
+        timeout_ms = int(timeout * 1000)
+        result = self.driver.execute_async_script(WAIT_CONDITION_JS, by, value, condition, expected, timeout_ms)
+        if isinstance(result, dict) and result.get("ok"):
+            return result.get("value")
+        if isinstance(result, dict) and result.get("error"):
+            message = f"{message} Ошибка скрипта ожидания: {result['error']}".strip()
+        raise TimeoutException(message)
@@ -0,0 +1,296 @@
+"""Учет вкладок (окон) браузера без переключения по всем вкладкам.
+
+`WindowManager` хранит известные дескрипторы вкладок, их последние известные URL и текущую
+вкладку. Список вкладок обновляется сравнением с `window_handles` (одна команда), URL текущей
+вкладки — из наблюдений страниц, URL остальных — одной командой CDP (`Target.getTargets`) или,
+без CDP, переключением только на вкладки с неизвестным URL с возвратом на исходную.
+
+Текущая вкладка не запрашивается у драйвера повторно, поэтому переключать вкладки нужно через
+менеджер (`switch_to`), а после переключения в обход него — вызвать `reset`.
+"""
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import threading
+import typing as t
+import weakref
+from urllib.parse import urlparse
+
+from selenium.common import NoSuchWindowException, TimeoutException, WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from xtest.utils.polling import PollingStrategy, iter_attempts
+
+# URL, которые не кэшируются: вкладка еще загружается и скоро сменит адрес.
+_PENDING_URLS = frozenset({"", "about:blank"})
+
+
+def _origin(url: str, /) -> t.Optional[str]:
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+@dataclasses.dataclass
+class WindowManagerStats:
+    # Выполненные переключения вкладок.
+    switches: int = 0
+    # Переключения, не отправленные драйверу (вкладка уже текущая).
+    skipped_switches: int = 0
+    # Запросы `window_handles`.
+    handle_queries: int = 0
+    # URL вкладок, прочитанные переключением на вкладку (без CDP).
+    switched_url_reads: int = 0
+
+
+@dataclasses.dataclass
+class NewTab:
+    # Дескриптор вкладки, заполняется при выходе из `WindowManager.expect_new_tab`.
+    handle: t.Optional[str] = None
+
+
+class WindowManager:
+    """Вкладки одной сессии WebDriver.
+
+    Для сессии существует один менеджер (`for_driver`), общий для всех страниц.
+
+    Args:
+        driver (WebDriver): сессия браузера.
+    """
+
+    _managers: t.ClassVar[weakref.WeakKeyDictionary] = weakref.WeakKeyDictionary()
+    _managers_lock: t.ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, driver: WebDriver, /) -> None:
+        self.driver = driver
+        # Дескриптор -> последний известный URL (None — неизвестен), в порядке открытия вкладок.
+        self._tabs: dict[str, t.Optional[str]] = {}
+        self._current: t.Optional[str] = None
+        self._synced = False
+        # Origin всех URL, которые видел менеджер (для очистки сессии без CDP), не сбрасываются `reset`.
+        self.visited_origins: set[str] = set()
+        self.stats = WindowManagerStats()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} tabs={len(self._tabs)} current={self._current!r}>"
+
+    @classmethod
+    def for_driver(cls, driver: WebDriver, /) -> WindowManager:
+        if (manager := cls._managers.get(driver)) is None:
+            with cls._managers_lock:
+                if (manager := cls._managers.get(driver)) is None:
+                    manager = cls._managers[driver] = cls(driver)
+        return manager
+
+    @classmethod
+    def discard(cls, driver: WebDriver, /) -> None:
+        """Забыть состояние вкладок сессии (например, после очистки сессии пула)."""
+        with cls._managers_lock:
+            cls._managers.pop(driver, None)
+
+    def reset(self) -> None:
+        """Сброс кэша: следующие обращения заново запросят вкладки и текущую вкладку."""
+        self._tabs.clear()
+        self._current = None
+        self._synced = False
+
+    @property
+    def tabs(self) -> dict[str, t.Optional[str]]:
+        """Кэшированная карта вкладок: дескриптор -> последний известный URL (без команд драйверу)."""
+        if not self._synced:
+            self.sync()
+        return dict(self._tabs)
+
+    @property
+    def handles(self) -> list[str]:
+        if not self._synced:
+            self.sync()
+        return list(self._tabs)
+
+    @property
+    def current_handle(self) -> str:
+        if self._current is None:
+            self._current = self.driver.current_window_handle
+            self._tabs.setdefault(self._current, None)
+        return self._current
+
+    def sync(self) -> list[str]:
+        """Обновление списка вкладок одной командой.
+
+        Returns:
+            list[str]: дескрипторы вкладок, появившихся с предыдущего обновления.
+        """
+        handles = self.driver.window_handles
+        self.stats.handle_queries += 1
+        return self._apply_handles(handles)
+
+    def _apply_handles(self, handles: list[str], /) -> list[str]:
+        known = self._tabs
+        self._tabs = {handle: known.get(handle) for handle in handles}
+        if self._current is not None and self._current not in self._tabs:
+            self._current = None
+        self._synced = True
+        return [handle for handle in handles if handle not in known] if known else []
+
+    def record_url(self, url: str, /, *, handle: t.Optional[str] = None) -> None:
+        """Запомнить URL вкладки (по умолчанию текущей, если она уже известна) и его origin."""
+        if (origin := _origin(url)) is not None:
+            self.visited_origins.add(origin)
+        handle = handle or self._current
+        if handle is None:
+            return
+        self._tabs[handle] = None if url in _PENDING_URLS else url
+
+    def switch_to(self, handle: str, /) -> None:
+        """Переключение на вкладку (команда отправляется, только если вкладка не текущая)."""
+        if handle == self._current:
+            self.stats.skipped_switches += 1
+            return
+        try:
+            self.driver.switch_to.window(handle)
+        except NoSuchWindowException:
+            self._tabs.pop(handle, None)
+            self._current = None
+            raise
+        self.stats.switches += 1
+        self._current = handle
+        self._tabs.setdefault(handle, None)
+
+    @contextlib.contextmanager
+    def switched_to(self, handle: str, /) -> t.Iterator[str]:
+        """Временное переключение на вкладку с возвратом на исходную."""
+        previous = self.current_handle
+        self.switch_to(handle)
+        try:
+            yield handle
+        finally:
+            if previous in self._tabs:
+                self.switch_to(previous)
+
+    def switch_to_url(self, predicate: t.Callable[[str], t.Any], /) -> t.Optional[str]:
+        """Переключение на первую вкладку, URL которой удовлетворяет условию.
+
+        Returns:
+            typing.Optional[str]: дескриптор вкладки (None — подходящей вкладки нет).
+        """
+        for handle, url in self.urls().items():
+            if predicate(url):
+                self.switch_to(handle)
+                return handle
+        return None
+
+    def urls(self, *, refresh: bool = False) -> dict[str, str]:
+        """URL всех вкладок.
+
+        Известные URL фоновых вкладок берутся из кэша; текущая вкладка и ее URL читаются всегда (без
+        переключения). Неизвестные URL (или все при `refresh=True`) читаются одной командой CDP,
+        а без CDP — переключением на эти вкладки с возвратом на текущую.
+
+        Returns:
+            dict[str, str]: дескриптор -> URL, в порядке открытия вкладок.
+        """
+        self.sync()
+        # Текущая вкладка запрашивается заново: ее могли переключить в обход менеджера.
+        self._current = None
+        current = self.current_handle
+        self.record_url(self.driver.current_url, handle=current)
+        unknown = [handle for handle, url in self._tabs.items() if handle != current and (refresh or url is None)]
+        if unknown:
+            unknown = self._read_urls_cdp(unknown)
+        if unknown:
+            with self.switched_to(current):
+                for handle in unknown:
+                    self.switch_to(handle)
+                    self.record_url(self.driver.current_url, handle=handle)
+                    self.stats.switched_url_reads += 1
+        return {handle: url or "about:blank" for handle, url in self._tabs.items()}
+
+    def _read_urls_cdp(self, handles: list[str], /) -> list[str]:
+        # Возвращает вкладки, URL которых не удалось прочитать через CDP.
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return handles
+        try:
+            targets = self.driver.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        except (WebDriverException, KeyError, TypeError):
+            return handles
+        # В chromedriver дескриптор вкладки — targetId (в старых версиях с префиксом "CDwindow-").
+        urls = {target["targetId"]: target["url"] for target in targets if target.get("type") == "page"}
+        missing = []
+        for handle in handles:
+            url = urls.get(handle, urls.get(handle.removeprefix("CDwindow-")))
+            if url is None:
+                missing.append(handle)
+            else:
+                self.record_url(url, handle=handle)
+        return missing
+
+    def wait_for_new_tab(
+        self,
+        /,
+        *,
+        timeout: float,
+        known: t.Optional[t.Iterable[str]] = None,
+        switch: bool = True,
+        polling: t.Union[float, PollingStrategy, None] = None,
+    ) -> str:
+        """Ожидание новой вкладки (одна команда `window_handles` на попытку).
+
+        Args:
+            timeout (float): таймаут ожидания в секундах.
+            known (typing.Optional[typing.Iterable[str]]): вкладки, открытые до действия
+                (по умолчанию — известные менеджеру).
+            switch (bool): переключиться на новую вкладку.
+            polling (typing.Union[float, PollingStrategy, None]): стратегия опроса.
+
+        Returns:
+            str: дескриптор новой вкладки.
+
+        Raises:
+            TimeoutException: новая вкладка не появилась.
+        """
+        known = set(self.handles if known is None else known)
+        for _ in iter_attempts(timeout, strategy=polling):
+            handles = self.driver.window_handles
+            self.stats.handle_queries += 1
+            self._apply_handles(handles)
+            if new := [handle for handle in handles if handle not in known]:
+                if switch:
+                    self.switch_to(new[-1])
+                return new[-1]
+        raise TimeoutException(f"Новая вкладка не открылась за {timeout} с.")
+
+    @contextlib.contextmanager
+    def expect_new_tab(
+        self,
+        /,
+        *,
+        timeout: float,
+        switch: bool = True,
+        polling: t.Union[float, PollingStrategy, None] = None,
+    ) -> t.Iterator[NewTab]:
+        """Ожидание вкладки, открытой действием внутри блока `with`.
+
+        Пример:
+            with page.windows.expect_new_tab(timeout=10) as tab:
+                page.click_to_element(LINK)
+            assert tab.handle
+        """
+        new_tab = NewTab()
+        known = self.handles
+        yield new_tab
+        new_tab.handle = self.wait_for_new_tab(timeout=timeout, known=known, switch=switch, polling=polling)
+
+    def close(self, handle: t.Optional[str] = None, /, *, switch_to: t.Optional[str] = None) -> None:
+        """Закрытие вкладки (по умолчанию текущей) и переключение на `switch_to` или последнюю оставшуюся."""
+        if not self._synced:
+            self.sync()
+        handle = handle or self.current_handle
+        self.switch_to(handle)
+        self.driver.close()
+        self._tabs.pop(handle, None)
+        self._current = None
+        target = switch_to or next(reversed(self._tabs), None)
+        if target is not None:
+            self.switch_to(target)
@@ -1,34 +1,379 @@
+"""Запуск вспомогательных сервисов (заглушки, моки) на время сессии.
+
+Процесс запускается в собственной группе процессов, готовность определяется пробами (открытый
+TCP-порт, HTTP 200, строка в выводе) с быстрым опросом вместо фиксированных пауз, а вывод
+хранится в ограниченных кольцевых буферах. `run_shared` позволяет воркерам pytest-xdist
+использовать один экземпляр сервиса на сессию.
+"""
+from __future__ import annotations
+
+import abc
+import collections
+import json
 import os
+import re
 import signal
+import socket
+import subprocess
+import threading
+import time
 import types
+import typing as t
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from xtest.utils.filelock import FileLock
+from xtest.utils.polling import ExponentialBackoff, iter_attempts
+
+
+class SetupProcessError(Exception):
+    def __init__(self, reason: str, /, *, output: str = "") -> None:
+        self.reason = reason
+        self.output = output
+        message = f"{reason}\nПоследний вывод процесса:\n{output}" if output else reason
+        super().__init__(message)
+
+
+class RingBuffer:
+    """Последние строки потока вывода процесса.
+
+    Поток читается фоновым потоком, поэтому процесс не блокируется на заполненном pipe,
+    а память ограничена `maxlen` строками.
+    """
+
+    def __init__(self, stream: t.BinaryIO, /, *, maxlen: int = 2000, name: str = "output") -> None:
+        self._lines: collections.deque[str] = collections.deque(maxlen=maxlen)
+        # Количество строк, прочитанных за все время (включая вытесненные из буфера).
+        self.total = 0
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read, args=(stream,), name=f"ring-buffer-{name}", daemon=True)
+        self._reader.start()
+
+    def _read(self, stream: t.BinaryIO, /) -> None:
+        with stream:
+            for raw in iter(stream.readline, b""):
+                line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                with self._lock:
+                    self._lines.append(line)
+                    self.total += 1
+
+    @property
+    def lines(self) -> list[str]:
+        with self._lock:
+            return list(self._lines)
+
+    def lines_since(self, index: int, /) -> tuple[list[str], int]:
+        """Строки, прочитанные после строки с номером `index`, и номер последней строки."""
+        with self._lock:
+            new = min(self.total - index, len(self._lines))
+            return list(self._lines)[len(self._lines) - new :], self.total
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def join(self, timeout: t.Optional[float] = None) -> None:
+        self._reader.join(timeout)
+
+
+class ReadinessProbe(abc.ABC):
+    """Проба готовности процесса."""
+
+    @abc.abstractmethod
+    def check(self, runner: ProcessRunner, /) -> bool:
+        raise NotImplementedError()
+
+    # Проба по выводу возможна только в процессе, запустившем сервис.
+    requires_output = False
+
+
+class TcpProbe(ReadinessProbe):
+    def __init__(self, port: int, /, *, host: str = "127.0.0.1", timeout: float = 0.5) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.host}:{self.port}>"
+
+    def check(self, runner: ProcessRunner, /) -> bool:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                return True
+        except OSError:
+            return False
+
+
+class HttpProbe(ReadinessProbe):
+    def __init__(self, url: str, /, *, status: int = 200, timeout: float = 1.0) -> None:
+        self.url = url
+        self.status = status
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.url} status={self.status}>"
+
+    def check(self, runner: ProcessRunner, /) -> bool:
+        try:
+            with urllib.request.urlopen(self.url, timeout=self.timeout) as response:  # nosec: адрес из конфигурации
+                return response.status == self.status
+        except urllib.error.HTTPError as ex:
+            return ex.code == self.status
+        except (OSError, ValueError):
+            return False
+
+
+class LogProbe(ReadinessProbe):
+    """Строка вывода (stdout или stderr), соответствующая регулярному выражению."""
+
+    requires_output = True
+
+    def __init__(self, pattern: t.Union[str, re.Pattern], /) -> None:
+        self.pattern = re.compile(pattern)
+        self._seen: dict[int, int] = {}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.pattern.pattern!r}>"
+
+    def check(self, runner: ProcessRunner, /) -> bool:
+        # Просматриваются только строки, появившиеся после предыдущей проверки.
+        for buffer in (runner.stdout, runner.stderr):
+            if buffer is None:
+                continue
+            lines, self._seen[id(buffer)] = buffer.lines_since(self._seen.get(id(buffer), 0))
+            if any(self.pattern.search(line) for line in lines):
+                return True
+        return False
 
 
 class ProcessRunner:
+    """Вспомогательный сервис, запущенный в собственной группе процессов.
+
+    Args:
+        command (typing.Sequence[str]): команда запуска.
+        name (typing.Optional[str]): имя сервиса (по умолчанию — имя исполняемого файла).
+        probes (typing.Sequence[ReadinessProbe]): пробы готовности (готов, когда прошли все).
+        env (typing.Optional[typing.Mapping[str, str]]): дополнительные переменные окружения.
+        cwd (typing.Optional[typing.Union[str, os.PathLike]]): рабочий каталог.
+        ready_timeout (float): таймаут готовности в секундах.
+        stop_timeout (float): время на штатное завершение до принудительной остановки, в секундах.
+        buffer_lines (int): количество хранимых строк stdout и stderr.
+    """
+
+    polling = ExponentialBackoff(initial=0.01, maximum=0.25)
+
+    def __init__(
+        self,
+        command: t.Sequence[str],
+        /,
+        *,
+        name: t.Optional[str] = None,
+        probes: t.Sequence[ReadinessProbe] = (),
+        env: t.Optional[t.Mapping[str, str]] = None,
+        cwd: t.Optional[t.Union[str, os.PathLike]] = None,
+        ready_timeout: float = 30.0,
+        stop_timeout: float = 10.0,
+        buffer_lines: int = 2000,
+    ) -> None:
+        self.command = [str(item) for item in command]
+        self.name = name or Path(self.command[0]).name
+        self.probes = tuple(probes)
+        self.env = dict(env or {})
+        self.cwd = cwd
+        self.ready_timeout = ready_timeout
+        self.stop_timeout = stop_timeout
+        self.buffer_lines = buffer_lines
+        self.stdout: t.Optional[RingBuffer] = None
+        self.stderr: t.Optional[RingBuffer] = None
+        # Время от запуска до готовности, в секундах.
+        self.startup_time: t.Optional[float] = None
+        self._process: t.Optional[subprocess.Popen] = None
+        self._pid: t.Optional[int] = None
+        # False — сервис запущен другим процессом (воркером xdist) и не останавливается этим экземпляром.
+        self._owner = True
+        self._state_path: t.Optional[Path] = None
+
+    @classmethod
+    def from_module(cls, process_module: types.ModuleType, /, **kwargs: t.Any) -> ProcessRunner:
+        """Сервис из модуля с атрибутами `__process_cmd_start__` и (необязательно) `__process_probes__`."""
+        kwargs.setdefault("probes", getattr(process_module, "__process_probes__", ()))
+        kwargs.setdefault("name", process_module.__name__.rpartition(".")[2])
+        return cls(process_module.__process_cmd_start__, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r} pid={self._pid} owner={self._owner}>"
+
+    @property
+    def pid(self) -> t.Optional[int]:
+        return self._pid
+
+    @property
+    def owner(self) -> bool:
+        return self._owner
+
+    @property
+    def returncode(self) -> t.Optional[int]:
+        return self._process.poll() if self._process is not None else None
+
     @property
-    def pid(self) -> int:
-        return self.__pid
-
-    def run_process(self, process_module: types.ModuleType) -> None:
-        process = Popen(
-            process_module.__process_cmd_start__,
-            stdin=self.__stdin,
-            stdout=self.__stdout,
-            stderr=self.__stderr,
+    def running(self) -> bool:
+        if self._process is not None:
+            return self._process.poll() is None
+        return self._pid is not None and _pid_alive(self._pid)
+
+    def output(self) -> str:
+        """Последние строки stdout и stderr."""
+        parts = []
+        for title, buffer in (("stdout", self.stdout), ("stderr", self.stderr)):
+            if buffer is not None and (text := buffer.text()):
+                parts.append(f"[{title}]\n{text}")
+        return "\n".join(parts)
+
+    def run_process(self, process_module: t.Optional[types.ModuleType] = None) -> None:
+        """Запуск процесса и ожидание готовности.
+
+        Raises:
+            SetupProcessError: процесс завершился или не стал готов за `ready_timeout` секунд.
+        """
+        if process_module is not None:
+            self.command = [str(item) for item in process_module.__process_cmd_start__]
+        if self._process is not None and self._process.poll() is None:
+            raise RuntimeError(f"Процесс {self.name} уже запущен.")
+
+        started = time.monotonic()
+        kwargs: dict[str, t.Any] = {}
+        if os.name == "nt":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["start_new_session"] = True
+        try:
+            self._process = subprocess.Popen(  # pylint: disable=consider-using-with
+                self.command,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=self.cwd,
+                env={**os.environ, **self.env},
+                **kwargs,
+            )
+        except OSError as ex:
+            raise SetupProcessError(f"Процесс {self.name} не запущен: {ex}") from ex
+        self._pid = self._process.pid
+        self._owner = True
+        self.stdout = RingBuffer(self._process.stdout, maxlen=self.buffer_lines, name=f"{self.name}-stdout")
+        self.stderr = RingBuffer(self._process.stderr, maxlen=self.buffer_lines, name=f"{self.name}-stderr")
+        try:
+            self.wait_ready()
+        except SetupProcessError:
+            self.teardown_process()
+            raise
+        self.startup_time = time.monotonic() - started
+
+    def wait_ready(self, probes: t.Optional[t.Sequence[ReadinessProbe]] = None, /) -> None:
+        """Ожидание прохождения всех проб готовности.
+
+        Raises:
+            SetupProcessError: процесс завершился или не стал готов за `ready_timeout` секунд.
+        """
+        pending = list(self.probes if probes is None else probes)
+        for _ in iter_attempts(self.ready_timeout, strategy=self.polling):
+            pending = [probe for probe in pending if not probe.check(self)]
+            if not pending:
+                return
+            if not self.running:
+                if self.stdout is not None:
+                    self.stdout.join(1.0)
+                    self.stderr.join(1.0)
+                raise SetupProcessError(
+                    f"Процесс {self.name} завершился до готовности с кодом {self.returncode}.",
+                    output=self.output(),
+                )
+        raise SetupProcessError(
+            f"Процесс {self.name} не готов за {self.ready_timeout} с, не пройдены пробы: {pending}.",
+            output=self.output(),
         )
 
-        if process.returncode is not None:
-            os.kill(process.pid, signal.SIGINT)
-            raise SetupProcessError(reason="Процесс запустился с ошибкой. Проверьте логи по пути")
+    def teardown_process(self) -> None:
+        """Штатное завершение группы процессов, по истечении `stop_timeout` — принудительное."""
+        if self._state_path is not None and self._owner:
+            self._state_path.unlink(missing_ok=True)
+        if not self._owner or (process := self._process) is None:
+            return
+        if process.poll() is None:
+            _signal_group(process, graceful=True)
+            try:
+                process.wait(self.stop_timeout)
+            except subprocess.TimeoutExpired:
+                _signal_group(process, graceful=False)
+                process.wait()
+        elif os.name != "nt":
+            # Лидер группы завершился, но дочерние процессы могли остаться.
+            _signal_group(process, graceful=False)
+        for buffer in (self.stdout, self.stderr):
+            if buffer is not None:
+                buffer.join(1.0)
+
+    def run_shared(self, state_dir: t.Union[str, os.PathLike], /, *, session: str) -> None:
+        """Запуск одного экземпляра сервиса на сессию.
 
-        if hasattr(self.__config, "run_subprocesses") and isinstance(self.__config.run_subprocesses, list):
-            self.__config.run_subprocesses.append(self)
+        Первый процесс сессии запускает сервис и записывает его pid в `state_dir`, остальные
+        (воркеры xdist) подключаются к запущенному: проверяют пробы, не требующие вывода,
+        и не останавливают сервис при `teardown_process`.
+
+        Args:
+            state_dir (typing.Union[str, os.PathLike]): каталог, общий для процессов сессии.
+            session (str): идентификатор сессии.
+        """
+        state_dir = Path(state_dir)
+        self._state_path = state_dir / f"{self.name}.json"
+        with FileLock(state_dir / f"{self.name}.lock"):
+            state = _read_state(self._state_path)
+            if state is not None and state["session"] == session and _pid_alive(state["pid"]):
+                self._owner = False
+                self._pid = state["pid"]
+                self.startup_time = 0.0
+                self.wait_ready([probe for probe in self.probes if not probe.requires_output])
+                return
+            self.run_process()
+            state_dir.mkdir(parents=True, exist_ok=True)
+            self._state_path.write_text(json.dumps({"session": session, "pid": self._pid}), encoding="utf-8")
+
+    def __enter__(self) -> ProcessRunner:
+        if not self.running:
+            self.run_process()
+        return self
+
+    def __exit__(self, *_: t.Any) -> None:
+        self.teardown_process()
+
+
+def _signal_group(process: subprocess.Popen, /, *, graceful: bool) -> None:
+    try:
+        if os.name == "nt":
+            if graceful:
+                process.send_signal(signal.CTRL_BREAK_EVENT)  # pylint: disable=no-member
+            else:
+                process.kill()
         else:
-            self.__config.run_subprocesses = [self]
+            os.killpg(process.pid, signal.SIGTERM if graceful else signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _pid_alive(pid: int, /) -> bool:
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
 
-        self.__pid = process.pid
 
-    def teardown_process(self):
-        os.kill(self.pid, signal.SIGKILL)
-        self.__stdin.close()
-        self.__stdout.close()
-        self.__stderr.close()
+def _read_state(path: Path, /) -> t.Optional[dict[str, t.Any]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
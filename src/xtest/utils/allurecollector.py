@@ -0,0 +1,297 @@
+"""Сборщик результатов Allure с буферизацией и фоновой записью.
+
+Результаты тестов (с шагами и ссылками на вложения) копятся в памяти и записываются фоновым
+потоком пачками в JSON Lines-файл процесса (`xtest-<воркер>.jsonl`). Каждый воркер pytest-xdist
+пишет только в свой файл, поэтому блокировки файлов не нужны. В конце прогона `export_allure`
+раскладывает файлы воркеров в стандартные `<uuid>-result.json`, которые читает `allure generate`.
+
+Вложения хранятся по хэшу содержимого: одинаковые скриншоты записываются один раз.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import typing as t
+import uuid
+from pathlib import Path
+
+# Статусы Allure.
+PASSED = "passed"
+FAILED = "failed"
+BROKEN = "broken"
+SKIPPED = "skipped"
+
+_SEGMENT_PATTERN = "xtest-*.jsonl"
+
+
+def _now() -> int:
+    return int(time.time() * 1000)
+
+
+class _Flush:
+    # Маркер в очереди записи: запись всего, что было поставлено в очередь до него.
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class AllureCollector:
+    """Сборщик результатов одного процесса (воркера).
+
+    Текущие тест и шаг хранятся отдельно для каждого потока.
+
+    Args:
+        directory (typing.Union[str, os.PathLike]): каталог результатов Allure.
+        worker_id (str): идентификатор процесса (воркера xdist) в имени файла результатов.
+        batch_size (int): максимальное количество результатов в одной записи.
+        flush_interval (float): максимальное время (в секундах) между получением результата и его записью.
+        flush_timeout (float): максимальное время ожидания записи в `flush` и `close`.
+    """
+
+    def __init__(
+        self,
+        directory: t.Union[str, os.PathLike],
+        /,
+        *,
+        worker_id: str = "master",
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        flush_timeout: float = 60.0,
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_path = self.directory / f"xtest-{worker_id}.jsonl"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flush_timeout = flush_timeout
+        # Ошибки записи: результаты и вложения, которые не удалось записать, теряются, а поток записи продолжает работу.
+        self.errors: list[str] = []
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._local = threading.local()
+        self._attachments: set[str] = set()
+        self._attachments_lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="allure-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def _stack(self) -> list[dict[str, t.Any]]:
+        # [результат теста, шаг, вложенный шаг, ...]
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    @property
+    def current(self) -> t.Optional[dict[str, t.Any]]:
+        """Текущий шаг или результат теста."""
+        stack = self._stack
+        return stack[-1] if stack else None
+
+    def start_test(
+        self,
+        name: str,
+        /,
+        *,
+        full_name: t.Optional[str] = None,
+        labels: t.Optional[t.Mapping[str, str]] = None,
+        parameters: t.Optional[t.Mapping[str, t.Any]] = None,
+    ) -> dict[str, t.Any]:
+        full_name = full_name or name
+        result = {
+            "uuid": str(uuid.uuid4()),
+            "historyId": hashlib.md5(full_name.encode("utf-8")).hexdigest(),  # nosec: не для защиты
+            "fullName": full_name,
+            "name": name,
+            "status": None,
+            "stage": "running",
+            "start": _now(),
+            "steps": [],
+            "attachments": [],
+            "labels": [{"name": key, "value": value} for key, value in (labels or {}).items()],
+            "parameters": [{"name": key, "value": str(value)} for key, value in (parameters or {}).items()],
+        }
+        self._local.stack = [result]
+        return result
+
+    def stop_test(
+        self,
+        status: str = PASSED,
+        /,
+        *,
+        message: t.Optional[str] = None,
+        trace: t.Optional[str] = None,
+    ) -> None:
+        stack = self._stack
+        if not stack:
+            return
+        result = stack[0]
+        stack.clear()
+        result["status"] = status
+        result["stage"] = "finished"
+        result["stop"] = _now()
+        if message is not None or trace is not None:
+            result["statusDetails"] = {"message": message, "trace": trace}
+        self._queue.put(("result", result))
+
+    @contextlib.contextmanager
+    def step(self, name: str, /, **parameters: t.Any) -> t.Iterator[dict[str, t.Any]]:
+        """Шаг текущего теста (вне теста шаг не записывается)."""
+        parent = self.current
+        step = {
+            "name": name,
+            "status": None,
+            "stage": "running",
+            "start": _now(),
+            "steps": [],
+            "attachments": [],
+            "parameters": [{"name": key, "value": str(value)} for key, value in parameters.items()],
+        }
+        if parent is None:
+            yield step
+            return
+        parent["steps"].append(step)
+        self._stack.append(step)
+        try:
+            yield step
+        except AssertionError as ex:
+            step["status"] = FAILED
+            step["statusDetails"] = {"message": str(ex)}
+            raise
+        except BaseException as ex:
+            step["status"] = BROKEN
+            step["statusDetails"] = {"message": f"{ex.__class__.__name__}: {ex}"}
+            raise
+        else:
+            step["status"] = PASSED
+        finally:
+            step["stage"] = "finished"
+            step["stop"] = _now()
+            with contextlib.suppress(ValueError):
+                self._stack.remove(step)
+
+    def attach(
+        self,
+        body: t.Union[bytes, str],
+        /,
+        name: str,
+        *,
+        attachment_type: str = "text/plain",
+        extension: str = "txt",
+    ) -> str:
+        """Вложение в текущий шаг или тест.
+
+        Returns:
+            str: имя файла вложения в каталоге результатов.
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        source = f"{hashlib.sha256(body).hexdigest()}-attachment.{extension.lstrip('.')}"
+        with self._attachments_lock:
+            is_new = source not in self._attachments
+            self._attachments.add(source)
+        if is_new:
+            self._queue.put(("attachment", (source, body)))
+        if (parent := self.current) is not None:
+            parent["attachments"].append({"name": name, "source": source, "type": attachment_type})
+        return source
+
+    def flush(self, timeout: t.Optional[float] = None) -> bool:
+        """Ожидание записи всех полученных результатов и вложений.
+
+        Args:
+            timeout (typing.Optional[float]): таймаут ожидания в секундах (по умолчанию `flush_timeout`).
+
+        Returns:
+            bool: запись завершена (False — истек таймаут или поток записи остановлен).
+        """
+        if self._closed or not self._writer.is_alive():
+            return False
+        marker = _Flush()
+        self._queue.put(("flush", marker))
+        return marker.done.wait(self.flush_timeout if timeout is None else timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(("close", None))
+        self._writer.join(self.flush_timeout)
+
+    def _write_loop(self) -> None:
+        results: list[dict[str, t.Any]] = []
+        deadline: t.Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                kind, payload = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                kind, payload = "timeout", None
+
+            if kind == "result":
+                results.append(payload)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(results) < self.batch_size:
+                    continue
+            elif kind == "attachment":
+                self._write_safely(self._write_attachment, *payload)
+                continue
+
+            if results:
+                self._write_safely(self._write_results, results)
+                results = []
+            deadline = None
+            if kind == "flush":
+                payload.done.set()
+            elif kind == "close":
+                return
+
+    def _write_safely(self, write: t.Callable[..., None], /, *args: t.Any) -> None:
+        # Ошибка одной записи не должна останавливать поток: иначе `flush` не дождется маркера.
+        try:
+            write(*args)
+        except Exception as ex:  # pylint: disable=broad-except
+            self.errors.append(f"{ex.__class__.__name__}: {ex}")
+
+    def _write_results(self, results: list[dict[str, t.Any]], /) -> None:
+        lines = "".join(json.dumps(result, ensure_ascii=False) + "\n" for result in results)
+        with open(self.segment_path, "a", encoding="utf-8") as file:
+            file.write(lines)
+
+    def _write_attachment(self, source: str, body: bytes, /) -> None:
+        path = self.directory / source
+        # Другой воркер мог уже записать то же содержимое.
+        if path.exists():
+            return
+        with tempfile.NamedTemporaryFile("wb", dir=self.directory, suffix=".tmp", delete=False) as file:
+            file.write(body)
+        os.replace(file.name, path)
+
+
+def export_allure(directory: t.Union[str, os.PathLike], /) -> int:
+    """Раскладка результатов из файлов воркеров в стандартные `<uuid>-result.json`.
+
+    Returns:
+        int: количество экспортированных результатов.
+    """
+    directory = Path(directory)
+    exported = 0
+    for segment in sorted(directory.glob(_SEGMENT_PATTERN)):
+        with open(segment, encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                with open(directory / f"{result['uuid']}-result.json", "w", encoding="utf-8") as target:
+                    json.dump(result, target, ensure_ascii=False)
+                exported += 1
+        segment.unlink()
+    return exported
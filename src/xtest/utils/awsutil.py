@@ -1,21 +1,89 @@
+"""Клиент S3-совместимого хранилища для артефактов тестов (скриншоты, логи)."""
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import io
+import os
+import threading
+import typing as t
+
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+
+DEFAULT_ENDPOINT_URL = "https://storage.yandexcloud.net"
+
+
+class AWSUploadError(Exception):
+    def __init__(self, errors: dict[str, BaseException], /) -> None:
+        self.errors = errors
+        details = "\n".join(f"- {key}: {error!r}" for key, error in errors.items())
+        super().__init__(f"Не загружено объектов: {len(errors)}.\n{details}")
 
 
 class AWSClient:
-    def __init__(self, bucket: str, access_key: str, secret_token: str, /) -> None:
+    """Загрузка артефактов в S3-совместимое хранилище.
+
+    Загрузки синхронны: метод возвращается после загрузки и выбрасывает ее ошибку. С `background_uploads=True`
+    (фикстура `xtest_aws_client`) загрузки по умолчанию выполняются в фоне пулом из `max_workers`
+    потоков, а `flush` дожидается их завершения и сообщает об ошибках.
+    Большие тела (от `multipart_threshold` байт) загружаются по частям (multipart upload).
+    Повторная загрузка того же содержимого по тому же ключу пропускается.
+
+    Args:
+        bucket (str): имя бакета.
+        access_key (str): ключ доступа.
+        secret_token (str): секретный ключ.
+        endpoint_url (str): адрес хранилища (для локальной заглушки — например, MinIO или moto).
+        region_name (typing.Optional[str]): регион.
+        addressing_style (str): адресация бакета: "auto", "path" (для локальных заглушек) или "virtual".
+        max_workers (int): количество потоков фоновой загрузки.
+        background_uploads (bool): загружать в фоне, если в вызове не задан `wait`.
+        multipart_threshold (int): размер тела, начиная с которого используется multipart upload.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        access_key: str,
+        secret_token: str,
+        /,
+        *,
+        endpoint_url: str = DEFAULT_ENDPOINT_URL,
+        region_name: t.Optional[str] = None,
+        addressing_style: str = "auto",
+        max_workers: int = 4,
+        multipart_threshold: int = 8 * 1024 * 1024,
+        background_uploads: bool = False,
+    ) -> None:
         self.bucket_name = bucket
+        self.background_uploads = background_uploads
+        self.endpoint_url = endpoint_url
         self.session = boto3.session.Session(
             aws_access_key_id=access_key,
             aws_secret_access_key=secret_token,
+            region_name=region_name,
         )
         self.s3_client = self.session.client(
             service_name="s3",
-            endpoint_url="https://storage.yandexcloud.net",
-        )
-        self.s3_resource = self.session.resource(
-            service_name="s3",
-            endpoint_url="https://storage.yandexcloud.net",
+            endpoint_url=endpoint_url,
+            config=Config(s3={"addressing_style": addressing_style}, max_pool_connections=max(10, max_workers)),
         )
+        self.transfer_config = TransferConfig(multipart_threshold=multipart_threshold, use_threads=False)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="s3-upload")
+        self._pending: dict[concurrent.futures.Future, str] = {}
+        # Хэш содержимого, загруженного (или загружаемого) по ключу.
+        self._uploaded: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._s3_resource = None
+
+    @property
+    def s3_resource(self) -> t.Any:
+        # Ресурс нужен редко, поэтому создается при первом обращении.
+        if self._s3_resource is None:
+            self._s3_resource = self.session.resource(service_name="s3", endpoint_url=self.endpoint_url)
+        return self._s3_resource
 
     def get_object_url(self, object_name: str, expires_in: int = 864000) -> str:
         return self.s3_client.generate_presigned_url(
@@ -24,10 +92,135 @@ class AWSClient:
             ExpiresIn=expires_in,
         )
 
-    def upload_b64_object(self, resource_path: str, body_file: bytes, content_type: str = "image/png") -> None:
-        s3_object = self.s3_resource.Object(self.bucket_name, resource_path)
-        s3_object.put(ContentType=content_type, Body=body_file)
+    def get_object_urls(self, object_names: t.Iterable[str], /, *, expires_in: int = 864000) -> dict[str, str]:
+        """Подписанные ссылки на объекты. Подпись вычисляется локально, без запросов к хранилищу."""
+        return {object_name: self.get_object_url(object_name, expires_in) for object_name in object_names}
+
+    def upload_object(
+        self,
+        resource_path: str,
+        body: t.Union[bytes, str, os.PathLike],
+        /,
+        *,
+        content_type: str = "application/octet-stream",
+        wait: t.Optional[bool] = None,
+    ) -> t.Optional[concurrent.futures.Future]:
+        """Загрузка объекта (в фоне, если `wait=False`).
+
+        Args:
+            resource_path (str): ключ объекта.
+            body (typing.Union[bytes, str, os.PathLike]): содержимое или путь к файлу.
+            content_type (str): Content-Type объекта.
+            wait (typing.Optional[bool]): дождаться завершения загрузки (по умолчанию — если не задан
+                `background_uploads`).
+
+        Returns:
+            typing.Optional[concurrent.futures.Future]: фоновая загрузка или None, если такое же
+                содержимое уже загружено по этому ключу.
+        """
+        if wait is None:
+            wait = not self.background_uploads
+        if isinstance(body, (str, os.PathLike)):
+            with open(body, "rb") as file:
+                digest = _file_digest(file)
+        else:
+            digest = hashlib.sha256(body).hexdigest()
+
+        with self._lock:
+            if self._uploaded.get(resource_path) == digest:
+                return None
+            self._uploaded[resource_path] = digest
+            future = self._executor.submit(self._put, resource_path, body, content_type)
+            self._pending[future] = resource_path
+        future.add_done_callback(lambda done: self._on_done(done, resource_path, digest))
+        if wait:
+            # Ошибка синхронной загрузки выбрасывается здесь, а не повторно в `flush`.
+            with self._lock:
+                self._pending.pop(future, None)
+            future.result()
+        return future
+
+    def upload_content_addressed(
+        self,
+        body: bytes,
+        /,
+        *,
+        prefix: str = "",
+        extension: str = "",
+        content_type: str = "application/octet-stream",
+        wait: t.Optional[bool] = None,
+    ) -> str:
+        """Загрузка по ключу из хэша содержимого: одинаковые артефакты (скриншоты) хранятся один раз.
+
+        Returns:
+            str: ключ объекта.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        resource_path = f"{prefix.rstrip('/')}/{digest}" if prefix else digest
+        if extension:
+            resource_path += f".{extension.lstrip('.')}"
+        self.upload_object(resource_path, body, content_type=content_type, wait=wait)
+        return resource_path
+
+    def upload_b64_object(
+        self,
+        resource_path: str,
+        body_file: bytes,
+        content_type: str = "image/png",
+        *,
+        wait: t.Optional[bool] = None,
+    ) -> None:
+        self.upload_object(resource_path, body_file, content_type=content_type, wait=wait)
+
+    def upload_txt_object(self, resource_path: str, text: str, *, wait: t.Optional[bool] = None) -> None:
+        self.upload_object(resource_path, text.encode("utf-8"), content_type="plain/text", wait=wait)
+
+    def _put(self, resource_path: str, body: t.Union[bytes, str, os.PathLike], content_type: str, /) -> None:
+        extra_args = {"ContentType": content_type}
+        if isinstance(body, (str, os.PathLike)):
+            self.s3_client.upload_file(
+                os.fspath(body), self.bucket_name, resource_path, ExtraArgs=extra_args, Config=self.transfer_config
+            )
+        else:
+            self.s3_client.upload_fileobj(
+                io.BytesIO(body), self.bucket_name, resource_path, ExtraArgs=extra_args, Config=self.transfer_config
+            )
+
+    def _on_done(self, future: concurrent.futures.Future, resource_path: str, digest: str, /) -> None:
+        if future.exception() is not None:
+            # Неудачную загрузку можно повторить тем же содержимым.
+            with self._lock:
+                if self._uploaded.get(resource_path) == digest:
+                    del self._uploaded[resource_path]
+
+    def flush(self, /, *, timeout: t.Optional[float] = None) -> None:
+        """Ожидание завершения фоновых загрузок.
+
+        Raises:
+            AWSUploadError: часть объектов не загружена.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        concurrent.futures.wait(pending, timeout=timeout)
+        errors = {}
+        for future, resource_path in pending.items():
+            if not future.done():
+                with self._lock:
+                    self._pending[future] = resource_path
+            elif (error := future.exception()) is not None:
+                errors[resource_path] = error
+        if errors:
+            raise AWSUploadError(errors)
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+
 
-    def upload_txt_object(self, resource_path: str, text: str) -> None:
-        s3_object = self.s3_resource.Object(self.bucket_name, resource_path)
-        s3_object.put(ContentType="plain/text", Body=text)
+def _file_digest(file: t.BinaryIO, /) -> str:
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(1024 * 1024), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
@@ -1,6 +1,7 @@
-import time
 import typing as t
 
+from xtest.utils.polling import PollingStrategy, iter_attempts
+
 
 class WaitError(Exception):
     pass
@@ -10,9 +11,9 @@ def wait(
     method: t.Callable[..., t.Any],
     *,
     error: t.Union[t.Type[Exception], t.Tuple[t.Type[Exception], ...]] = Exception,
-    timeout: int = None,
+    timeout: float = None,
     check: bool = False,
-    interval: float = 0.5,
+    interval: t.Union[float, PollingStrategy, None] = None,
     raise_exception: bool = True,
     args: tuple = (),
     kwargs: dict[str, t.Any] = None,
@@ -22,9 +23,10 @@ def wait(
     Args:
         method (typing.Callable[..., t.Any]): функция для вызова.
         error (t.Union[t.Type[Exception], t.Tuple[t.Type[Exception], ...]]): ошибки для игнорирования.
-        timeout (int): таймаут для ожидания.
+        timeout (float): таймаут для ожидания (допускаются дробные значения).
         check (bool): проверка результата. При отсутствии результата вызывается TimeoutException.
-        interval (float): интервал для ожидания.
+        interval (t.Union[float, PollingStrategy, None]): интервал для ожидания. Число — фиксированный интервал,
+            None — адаптивный интервал по умолчанию (см. `xtest.utils.polling.DEFAULT_POLLING`).
         raise_exception (bool): вызывается ли ошибка после завершения функции.
         args (tuple): дополнительные позиционные аргументы для передачу в функцию.
         kwargs (dict): дополнительные аргументы по ключу для передачу в функцию.
@@ -40,13 +42,13 @@ def wait(
     if timeout is None:
         timeout = 10
 
-    start_time = time.time()
-    while time.time() - start_time < int(timeout):
+    if args is None:
+        args = ()
+    if kwargs is None:
+        kwargs = {}
+
+    for _ in iter_attempts(timeout, strategy=interval):
         try:
-            if args is None:
-                args = ()
-            if kwargs is None:
-                kwargs = {}
             result = method(*args, **kwargs)
             if check:
                 if result is not None:
@@ -56,7 +58,6 @@ def wait(
                 return result
         except errors as exception:
             last_cls = exception
-        time.sleep(interval)
 
     if raise_exception:
         raise last_cls
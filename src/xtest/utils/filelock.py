@@ -0,0 +1,100 @@
+"""Межпроцессная блокировка на файле (координация воркеров pytest-xdist и параллельных прогонов)."""
+from __future__ import annotations
+
+import os
+import typing as t
+from pathlib import Path
+
+from xtest.utils.polling import ExponentialBackoff, iter_attempts
+
+if os.name == "nt":
+    import msvcrt
+
+    def _try_lock(fd: int, /) -> bool:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int, /) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(fd: int, /) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(fd: int, /) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class FileLockTimeoutError(TimeoutError):
+    def __init__(self, path: Path, timeout: float, /) -> None:
+        super().__init__(f"Блокировка {path} не получена за {timeout} с.")
+
+
+class FileLock:
+    """Эксклюзивная блокировка на файле.
+
+    Блокировка принадлежит открытому файлу, поэтому исключает и другие процессы, и другие
+    экземпляры `FileLock` в том же процессе. Снимается операционной системой при завершении процесса.
+
+    Args:
+        path (typing.Union[str, os.PathLike]): путь к файлу блокировки.
+        timeout (typing.Optional[float]): таймаут ожидания блокировки в секундах (None — без ограничения).
+    """
+
+    polling = ExponentialBackoff(initial=0.005, maximum=0.1)
+
+    def __init__(self, path: t.Union[str, os.PathLike], /, *, timeout: t.Optional[float] = None) -> None:
+        self.path = Path(path)
+        self.timeout = timeout
+        self._fd: t.Optional[int] = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} path={str(self.path)!r} locked={self.locked}>"
+
+    @property
+    def locked(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> None:
+        """Получение блокировки.
+
+        Raises:
+            FileLockTimeoutError: блокировка не получена за `timeout` секунд.
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"Блокировка {self.path} уже получена.")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        timeout = self.timeout if self.timeout is not None else float("inf")
+        for _ in iter_attempts(timeout, strategy=self.polling):
+            if _try_lock(fd):
+                self._fd = fd
+                return
+        os.close(fd)
+        raise FileLockTimeoutError(self.path, timeout)
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fd, self._fd = self._fd, None
+        try:
+            _unlock(fd)
+        finally:
+            os.close(fd)
+
+    def __enter__(self) -> FileLock:
+        self.acquire()
+        return self
+
+    def __exit__(self, *_: t.Any) -> None:
+        self.release()
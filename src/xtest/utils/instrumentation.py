@@ -0,0 +1,212 @@
+"""Замеры длительности вызовов API-клиентов и действий со страницей.
+
+Пока запись не включена (`enable`), инструментированный вызов стоит одну проверку глобальной
+переменной. Включенная запись сохраняет для каждого вызова длительность, количество попыток
+опроса (`xtest.utils.polling`), повторов HTTP-запроса и цель вызова (локатор или endpoint).
+"""
+from __future__ import annotations
+
+import dataclasses
+import functools
+import re
+import statistics
+import threading
+import time
+import typing as t
+
+_F = t.TypeVar("_F", bound=t.Callable[..., t.Any])
+
+# Сегменты пути с идентификаторами (UUID, числа) заменяются на "{id}", чтобы вызовы одного endpoint
+# попадали в одну группу.
+_ID_SEGMENT = re.compile(r"/(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)(?=/|$)")
+
+
+@dataclasses.dataclass
+class CallRecord:
+    # "api" — HTTP-запрос, "ui" — действие со страницей.
+    kind: str
+    name: str
+    target: str
+    duration: float = 0.0
+    # Попытки опроса в ожиданиях и повторы HTTP-запроса.
+    polls: int = 0
+    retries: int = 0
+    error: t.Optional[str] = None
+    # Вложенность вызова (0 — вызов из теста, а не из другого инструментированного вызова).
+    depth: int = 0
+    test_id: t.Optional[str] = None
+
+
+class CallRecorder:
+    """Накопитель записей о вызовах (потокобезопасный)."""
+
+    def __init__(self) -> None:
+        self.records: list[CallRecord] = []
+        # Текущий тест: проставляется плагином pytest_xtest.
+        self.test_id: t.Optional[str] = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def _stack(self) -> list[CallRecord]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @property
+    def current(self) -> t.Optional[CallRecord]:
+        stack = self._stack
+        return stack[-1] if stack else None
+
+    def start(self, kind: str, name: str, target: str, /) -> CallRecord:
+        stack = self._stack
+        record = CallRecord(kind=kind, name=name, target=target, depth=len(stack), test_id=self.test_id)
+        stack.append(record)
+        return record
+
+    def finish(self, record: CallRecord, duration: float, /, *, error: t.Optional[BaseException] = None) -> None:
+        self._stack.pop()
+        record.duration = duration
+        if error is not None:
+            record.error = error.__class__.__name__
+        with self._lock:
+            self.records.append(record)
+
+    def drain(self) -> list[CallRecord]:
+        with self._lock:
+            records, self.records = self.records, []
+        return records
+
+
+_recorder: t.Optional[CallRecorder] = None
+
+
+def enable(recorder: t.Optional[CallRecorder] = None, /) -> CallRecorder:
+    global _recorder  # pylint: disable=global-statement
+    _recorder = recorder or CallRecorder()
+    return _recorder
+
+
+def disable() -> None:
+    global _recorder  # pylint: disable=global-statement
+    _recorder = None
+
+
+def get_recorder() -> t.Optional[CallRecorder]:
+    return _recorder
+
+
+def count_poll() -> None:
+    """Отметка очередной попытки опроса для текущего вызова."""
+    if _recorder is not None and (record := _recorder.current) is not None:
+        record.polls += 1
+
+
+def count_retries(retries: int, /) -> None:
+    """Отметка повторов HTTP-запроса для текущего вызова."""
+    if _recorder is not None and (record := _recorder.current) is not None:
+        record.retries += retries
+
+
+def normalize_endpoint(path: str, /) -> str:
+    return _ID_SEGMENT.sub("/{id}", path)
+
+
+def _default_target(args: tuple, /) -> str:
+    # Первый аргумент после self — обычно локатор (AdvancedLocator) или endpoint.
+    if len(args) < 2:
+        return ""
+    target = args[1]
+    if (as_locator := getattr(target, "as_locator", None)) is not None:
+        return f"{as_locator[0]}={as_locator[1]}"
+    return str(target)
+
+
+def instrumented(
+    kind: str,
+    /,
+    *,
+    target: t.Optional[t.Callable[..., str]] = None,
+    name: t.Optional[str] = None,
+) -> t.Callable[[_F], _F]:
+    """Декоратор для записи длительности вызова.
+
+    Args:
+        kind (str): тип вызова ("api", "ui").
+        target (typing.Optional[typing.Callable[..., str]]): цель вызова по аргументам функции
+            (по умолчанию — первый аргумент после self).
+        name (typing.Optional[str]): имя вызова (по умолчанию — имя функции).
+    """
+
+    def decorator(func: _F) -> _F:
+        call_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: t.Any, **kwargs: t.Any) -> t.Any:
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            record = recorder.start(
+                kind,
+                call_name,
+                target(*args, **kwargs) if target is not None else _default_target(args),
+            )
+            started = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as ex:
+                recorder.finish(record, time.perf_counter() - started, error=ex)
+                raise
+            recorder.finish(record, time.perf_counter() - started)
+            return result
+
+        return t.cast(_F, wrapper)
+
+    return decorator
+
+
+def _percentile(values: list[float], percent: int, /) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def summarize(records: t.Iterable[CallRecord], /, *, top: int = 10) -> dict[str, t.Any]:
+    """Сводка по вызовам: p50/p95/max по целям и самые медленные вызовы из тестов.
+
+    Args:
+        records (typing.Iterable[CallRecord]): записи о вызовах.
+        top (int): количество самых медленных вызовов в сводке.
+
+    Returns:
+        dict[str, typing.Any]: {"targets": [...], "slowest": [...]}; цели отсортированы по суммарному времени.
+    """
+    records = list(records)
+    groups: dict[tuple[str, str, str], list[CallRecord]] = {}
+    for record in records:
+        groups.setdefault((record.kind, record.name, record.target), []).append(record)
+
+    targets = []
+    for (kind, name, target), group in groups.items():
+        durations = sorted(record.duration for record in group)
+        targets.append(
+            {
+                "kind": kind,
+                "name": name,
+                "target": target,
+                "count": len(group),
+                "total": sum(durations),
+                "p50": _percentile(durations, 50),
+                "p95": _percentile(durations, 95),
+                "max": durations[-1],
+                "polls": sum(record.polls for record in group),
+                "retries": sum(record.retries for record in group),
+                "errors": sum(1 for record in group if record.error),
+            }
+        )
+    targets.sort(key=lambda item: item["total"], reverse=True)
+
+    outer = [record for record in records if record.depth == 0]
+    slowest = sorted(outer, key=lambda record: record.duration, reverse=True)[:top]
+    return {"targets": targets, "slowest": [dataclasses.asdict(record) for record in slowest]}
@@ -1,3 +1,4 @@
+from .bulk import BulkItemResult, BulkResult
 from .client import KeycloakClient
 
-__all__ = ["KeycloakClient"]
+__all__ = ["BulkItemResult", "BulkResult", "KeycloakClient"]
@@ -0,0 +1,71 @@
+"""Пакетное выполнение операций Keycloak с ограниченной параллельностью."""
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import typing as t
+
+from xtest.utils.keycloak.exceptions import KeycloakBulkError
+
+_I = t.TypeVar("_I")
+
+
+@dataclasses.dataclass
+class BulkItemResult:
+    # Исходный элемент (модель пользователя, username).
+    item: t.Any
+    value: t.Any = None
+    error: t.Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass
+class BulkResult:
+    # Результаты в порядке исходных элементов.
+    results: list[BulkItemResult] = dataclasses.field(default_factory=list)
+
+    def __iter__(self) -> t.Iterator[BulkItemResult]:
+        return iter(self.results)
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @property
+    def succeeded(self) -> list[BulkItemResult]:
+        return [result for result in self.results if result.ok]
+
+    @property
+    def failed(self) -> list[BulkItemResult]:
+        return [result for result in self.results if not result.ok]
+
+    def raise_for_errors(self) -> None:
+        """Ошибка со сводкой по всем неуспешным элементам.
+
+        Raises:
+            KeycloakBulkError: хотя бы один элемент завершился с ошибкой.
+        """
+        if failed := self.failed:
+            details = "\n".join(f"- {result.item}: {result.error!r}" for result in failed)
+            raise KeycloakBulkError(f"Ошибки в {len(failed)} из {len(self.results)} операций:\n{details}")
+
+
+def run_bulk(func: t.Callable[[_I], t.Any], items: t.Iterable[_I], /, *, max_workers: int) -> BulkResult:
+    """Вызов `func` для каждого элемента в пуле потоков (не более `max_workers` одновременно).
+
+    Ошибка одного элемента не прерывает обработку остальных и сохраняется в его результате.
+    """
+    items = list(items)
+    if not items:
+        return BulkResult()
+
+    def call(item: _I) -> BulkItemResult:
+        try:
+            return BulkItemResult(item=item, value=func(item))
+        except Exception as ex:  # pylint: disable=broad-except
+            return BulkItemResult(item=item, error=ex)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return BulkResult(results=list(executor.map(call, items)))
@@ -0,0 +1,187 @@
+"""Кэши Keycloak: токены и cookies с учетом срока действия, справочные данные (пользователи, роли, клиенты)."""
+from __future__ import annotations
+
+import base64
+import collections
+import dataclasses
+import json
+import threading
+import time
+import typing as t
+
+_T = t.TypeVar("_T")
+
+
+def jwt_expires_in(token: str, /, *, now: t.Optional[float] = None) -> t.Optional[float]:
+    """Оставшееся время жизни JWT (в секундах) по claim `exp`. None, если токен не JWT или без `exp`."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"]) - (time.time() if now is None else now)
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclasses.dataclass
+class TokenCacheStats:
+    hits: int = 0
+    # Запросы к Keycloak за новым значением.
+    fetches: int = 0
+    # Сколько раз поток дождался значения, полученного другим потоком, вместо своего запроса.
+    coalesced: int = 0
+
+
+@dataclasses.dataclass
+class _Entry:
+    value: t.Any
+    refresh_at: float
+
+
+class TokenCache:
+    """Потокобезопасный кэш значений с ограниченным сроком жизни (токены, cookies).
+
+    Значение обновляется заранее — за `refresh_margin` секунд до истечения (но не раньше середины
+    срока жизни). Одновременные запросы одного ключа объединяются: значение получает один поток,
+    остальные ждут его результата.
+
+    Args:
+        refresh_margin (float): запас до истечения срока, в секундах.
+        clock (typing.Callable[[], float]): часы (по умолчанию `time.monotonic`).
+    """
+
+    def __init__(self, *, refresh_margin: float = 30.0, clock: t.Callable[[], float] = time.monotonic) -> None:
+        self.refresh_margin = refresh_margin
+        self.stats = TokenCacheStats()
+        self._clock = clock
+        self._entries: dict[t.Hashable, _Entry] = {}
+        self._locks: dict[t.Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _fresh(self, key: t.Hashable, /) -> t.Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() < entry.refresh_at:
+            return entry
+        return None
+
+    def get(self, key: t.Hashable, fetch: t.Callable[[], tuple[_T, float]], /) -> _T:
+        """Значение из кэша или новое значение от `fetch`.
+
+        Args:
+            key (typing.Hashable): ключ значения.
+            fetch (typing.Callable[[], tuple[_T, float]]): получение значения и его времени жизни в секундах.
+
+        Returns:
+            _T: значение.
+        """
+        if entry := self._fresh(key):
+            self.stats.hits += 1
+            return entry.value
+
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Пока поток ждал блокировку, значение мог получить другой поток.
+            if entry := self._fresh(key):
+                self.stats.coalesced += 1
+                return entry.value
+            return self._fetch(key, fetch)
+
+    def _fetch(self, key: t.Hashable, fetch: t.Callable[[], tuple[_T, float]], /) -> _T:
+        # Время жизни отсчитывается от момента запроса, а не от получения ответа.
+        started = self._clock()
+        value, lifetime = fetch()
+        self.stats.fetches += 1
+        lifetime = max(0.0, lifetime)
+        self._entries[key] = _Entry(value=value, refresh_at=started + max(lifetime - self.refresh_margin, lifetime / 2))
+        return value
+
+    def invalidate(self, key: t.Optional[t.Hashable] = None, /) -> None:
+        """Удаление значения по ключу (None — очистка кэша целиком)."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+
+_MISSING = object()
+
+
+@dataclasses.dataclass
+class LookupCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Записи, вытесненные по размеру кэша.
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LookupCache:
+    """Потокобезопасный LRU-кэш с ограниченным временем жизни записей (UUID пользователей, роли, клиенты).
+
+    Args:
+        maxsize (int): максимальное количество записей.
+        ttl (typing.Optional[float]): время жизни записи в секундах (None — без ограничения).
+        clock (typing.Callable[[], float]): часы (по умолчанию `time.monotonic`).
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 1024,
+        ttl: t.Optional[float] = 300.0,
+        clock: t.Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError(f"Размер кэша должен быть >= 1: {maxsize}.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = LookupCacheStats()
+        self._clock = clock
+        self._entries: collections.OrderedDict[t.Hashable, tuple[t.Any, float]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: t.Hashable, /, default: t.Any = None) -> t.Any:
+        with self._lock:
+            value, expires_at = self._entries.get(key, (_MISSING, 0.0))
+            if value is _MISSING or self._clock() >= expires_at:
+                self._entries.pop(key, None)
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: t.Hashable, value: t.Any, /) -> None:
+        expires_at = float("inf") if self.ttl is None else self._clock() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def get_or_fetch(self, key: t.Hashable, fetch: t.Callable[[], t.Any], /) -> t.Any:
+        """Значение из кэша или результат `fetch`, который сохраняется в кэш."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = fetch()
+            self.put(key, value)
+        return value
+
+    def discard(self, key: t.Hashable, /) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
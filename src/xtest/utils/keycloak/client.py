@@ -1,13 +1,21 @@
+import threading
+import time
 import typing as t
 from pprint import pformat
 from urllib.parse import parse_qsl, urljoin, urlparse
 
 from requests.cookies import RequestsCookieJar
 
-from xtest.api import APIClientBase
+from xtest.api import APIClientBase, CacheMode, ResponseCache
+from xtest.utils.keycloak.bulk import BulkResult, run_bulk
+from xtest.utils.keycloak.cache import LookupCache, TokenCache, jwt_expires_in
 from xtest.utils.keycloak.exceptions import (
+    KeycloakCreateUserError,
+    KeycloakDeleteUserError,
     KeycloakException,
     KeycloakNotAuthorizationException,
+    KeycloakUserNotAuthorizationError,
+    KeycloakUserNotUpdatedError,
 )
 from xtest.utils.keycloak.models import KeycloakUserModel
 
@@ -15,6 +23,25 @@ from xtest.utils.keycloak.models import KeycloakUserModel
 class KeycloakClient(APIClientBase):
     disable_status_code_verify = True
 
+    # Обновление токенов за N секунд до истечения срока действия.
+    token_refresh_margin: float = 30.0
+
+    # Время жизни токена, если его не удалось определить по ответу Keycloak или claim `exp`.
+    default_token_ttl: float = 60.0
+
+    # Время жизни cookies имперсонализации без явного срока действия.
+    impersonation_ttl: float = 60.0
+
+    # Кэш UUID пользователей, ролей и клиентов: размер и время жизни записи в секундах.
+    lookup_cache_size: int = 1024
+    lookup_ttl: t.Optional[float] = 300.0
+
+    # Размер страницы при выгрузке ролей realm.
+    roles_page_size: int = 100
+
+    # Максимальное количество одновременных запросов в пакетных операциях (и размер пула соединений).
+    bulk_max_workers: int = 16
+
     def __init__(
         self,
         target_keycloak_url: str,
@@ -22,12 +49,39 @@ class KeycloakClient(APIClientBase):
         client_secret: str,
         realm: str,
         /,
+        *,
+        response_cache: t.Optional[ResponseCache] = None,
     ):
         self.__target_keycloak_url = target_keycloak_url
         self.__realm = realm
         self.__client_id = client_id
         self.__client_secret = client_secret
-        super().__init__(self.__target_keycloak_url)
+        self.token_cache = TokenCache(refresh_margin=self.token_refresh_margin)
+        self.lookup_cache = LookupCache(maxsize=self.lookup_cache_size, ttl=self.lookup_ttl)
+        # Пользователи, созданные этим клиентом и еще не удаленные (для `cleanup_created_users`).
+        self.created_usernames: set[str] = set()
+        self._created_lock = threading.Lock()
+        # Пул соединений не меньше числа потоков пакетных операций.
+        super().__init__(
+            self.__target_keycloak_url,
+            pool_maxsize=max(self.pool_maxsize, self.bulk_max_workers),
+            response_cache=response_cache,
+        )
+
+    def _token_lifetime(self, token: str, expires_in: t.Any = None, /) -> float:
+        if expires_in is not None:
+            return float(expires_in)
+        if (lifetime := jwt_expires_in(token)) is not None:
+            return lifetime
+        return self.default_token_ttl
+
+    def invalidate_tokens(self, username: t.Optional[str] = None, /) -> None:
+        """Сброс кэшированных токенов и cookies (username — только для пользователя)."""
+        if username is None:
+            self.token_cache.invalidate()
+            return
+        self.token_cache.invalidate(("token", username.lower()))
+        self.token_cache.invalidate(("cookies", username.lower()))
 
     @property
     def service_account_authorization_headers(self) -> dict[str, str]:
@@ -36,6 +90,9 @@ class KeycloakClient(APIClientBase):
         }
 
     def get_access_token_from_service_account(self) -> t.Optional[str]:
+        return self.token_cache.get(("service_account",), self._fetch_service_account_token)
+
+    def _fetch_service_account_token(self) -> tuple[t.Optional[str], float]:
         url = urljoin(
             self.__target_keycloak_url,
             f"auth/realms/{self.__realm}/protocol/openid-connect/token",
@@ -45,24 +102,40 @@ class KeycloakClient(APIClientBase):
             "client_secret": self.__client_secret,
             "grant_type": "client_credentials",
         }
-        response = self.request(url=url, method="post", data=data)
+        response = self.request(url, method="post", data=data, use_cache=False)
         if response.status_code != 200:
             raise KeycloakNotAuthorizationException(pformat(response.json()))
 
         response_json = response.json()
         if token := response_json.get("access_token"):
-            return str(token)
-        return None
+            return str(token), self._token_lifetime(token, response_json.get("expires_in"))
+        # Токен не выдан — не кэшируем.
+        return None, 0.0
 
     def get_user_id_by_username(self, username: str) -> str:
         username = username.lower()
+        return self.lookup_cache.get_or_fetch(("user", username), lambda: self._fetch_user_id(username))
+
+    def _user_search_request(self, username: str, /) -> tuple[str, dict[str, t.Any]]:
         url = urljoin(self.__target_keycloak_url, f"auth/admin/realms/{self.__realm}/users")
+        return url, {"username": username, "exact": True}
+
+    def _forget_user(self, username: str, /) -> None:
+        # UUID пользователя больше не актуален: удаляем его из кэшей клиента и ответов.
+        username = username.lower()
+        self.lookup_cache.discard(("user", username))
+        # Кассета (RECORD/REPLAY) не меняется: токен для ключа не запрашивается.
+        if self.response_cache is not None and self.response_cache.mode is CacheMode.CACHE:
+            url, params = self._user_search_request(username)
+            self.discard_cached_response(url, params=params, headers=self.service_account_authorization_headers)
+
+    def _fetch_user_id(self, username: str, /) -> str:
+        url, params = self._user_search_request(username)
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.get_access_token_from_service_account()}",
         }
-        params = {"username": username, "exact": True}
-        response = self.request(url=url, headers=headers, params=params)  # type: ignore
+        response = self.request(url, headers=headers, params=params)
         response_json = response.json()
 
         def __get_uuid_from_dict(dictionary: dict) -> t.Optional[str]:
@@ -80,6 +153,14 @@ class KeycloakClient(APIClientBase):
         raise KeycloakException(f"User not found by username. Username: {username}")
 
     def get_impersonate_cookies_by_username(self, username: str) -> RequestsCookieJar:
+        cookies = self.token_cache.get(
+            ("cookies", username.lower()),
+            lambda: self._fetch_impersonate_cookies(username),
+        )
+        # Копия: вызывающий код может менять jar, не затрагивая кэш.
+        return cookies.copy()
+
+    def _fetch_impersonate_cookies(self, username: str, /) -> tuple[RequestsCookieJar, float]:
         user_uuid = self.get_user_id_by_username(username=username)
         url = urljoin(
             self.__target_keycloak_url,
@@ -89,17 +170,22 @@ class KeycloakClient(APIClientBase):
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.get_access_token_from_service_account()}",
         }
-        response = self.request(url=url, method="post", headers=headers)
+        response = self.request(url, method="post", headers=headers, use_cache=False)
         if response.status_code != 200:
             raise KeycloakException(response.json())
 
-        return response.cookies
+        now = time.time()
+        expirations = [cookie.expires - now for cookie in response.cookies if cookie.expires is not None]
+        return response.cookies, min([self.impersonation_ttl, *expirations])
 
     def search_service_account_by_client_id(self, client_id: str) -> dict:
+        return self.lookup_cache.get_or_fetch(("client", client_id), lambda: self._fetch_client(client_id))
+
+    def _fetch_client(self, client_id: str, /) -> dict:
         url = urljoin(self.__target_keycloak_url, "/auth/admin/realms/globaltruck/clients")
         params = {"clientId": client_id, "max": 1, "search": True}
         headers = {"Authorization": f"Bearer {self.get_access_token_from_service_account()}"}
-        response = self.request(url=url, params=params, headers=headers)  # type: ignore
+        response = self.request(url, params=params, headers=headers)
         if response.status_code != 200:
             raise KeycloakException(response.text)
         response_json = response.json()
@@ -109,6 +195,9 @@ class KeycloakClient(APIClientBase):
         raise KeycloakException(f"Client with ID '{client_id}' not found.")
 
     def get_token_by_username(self, username: str) -> t.Optional[str]:
+        return self.token_cache.get(("token", username.lower()), lambda: self._fetch_token_by_username(username))
+
+    def _fetch_token_by_username(self, username: str, /) -> tuple[t.Optional[str], float]:
         user_uuid = self.get_user_id_by_username(username=username)
 
         # Имперсонализация.
@@ -117,7 +206,9 @@ class KeycloakClient(APIClientBase):
             f"/auth/admin/realms/{self.__realm}/users/{user_uuid}/impersonation",
         )
         impersonate_headers = {"Authorization": f"Bearer {self.get_access_token_from_service_account()}"}
-        impersonate_response = self.request(url=impersonate_url, method="post", headers=impersonate_headers)
+        impersonate_response = self.request(
+            impersonate_url, method="post", headers=impersonate_headers, use_cache=False
+        )
         assert impersonate_response.status_code == 200, (
             f"Got status code: {impersonate_response.status_code}\n" f"Response_text: {impersonate_response.text}"
         )
@@ -133,14 +224,17 @@ class KeycloakClient(APIClientBase):
             "client_id": self.__client_id,
             "redirect_uri": self.__target_keycloak_url,
         }
-        auth_response = self.request(auth_url, params=auth_params, headers=impersonate_headers)
+        # Ответ зависит от cookies имперсонации конкретного пользователя: токены не кэшируются.
+        auth_response = self.request(auth_url, params=auth_params, headers=impersonate_headers, use_cache=False)
         try:
             assert auth_response.history[0].status_code == 302
         except IndexError as ex:
             raise KeycloakUserNotAuthorizationError(username) from ex
         auth_url_replace = auth_response.url.replace("#", "?")
         auth_query_string = dict(parse_qsl(urlparse(auth_url_replace).query))
-        return auth_query_string.get("access_token")
+        if token := auth_query_string.get("access_token"):
+            return token, self._token_lifetime(token, auth_query_string.get("expires_in"))
+        return None, 0.0
 
     def create_user(self, user: KeycloakUserModel, /) -> None:
         endpoint = f'auth/admin/realms/{self.__realm}/users'
@@ -163,20 +257,34 @@ class KeycloakClient(APIClientBase):
             request_body.update({'attributes': user.attributes})
 
         response = self.request(
-            url=urljoin(self.__target_keycloak_url, endpoint),
+            urljoin(self.__target_keycloak_url, endpoint),
             payload=request_body,
             method='post',
             headers=self.service_account_authorization_headers,
         )
         if response.status_code != 201:
-            raise KeycloakCreateUserErrror(user.email, reason=response.text)
+            raise KeycloakCreateUserError(user.email, reason=response.text)
+
+        # Keycloak возвращает адрес созданного пользователя: .../users/<uuid>.
+        self._forget_user(user.username)
+        if location := response.headers.get('Location'):
+            self.lookup_cache.put(("user", user.username.lower()), location.rstrip('/').rsplit('/', 1)[-1])
+        with self._created_lock:
+            self.created_usernames.add(user.username.lower())
 
     def delete_user(self, username: str) -> None:
         user_uuid = self.get_user_id_by_username(username)
         url = urljoin(self.__target_keycloak_url, f'/auth/admin/realms/{self.__realm}/users/{user_uuid}')
-        response = self.request(method='delete', url=url, headers=self.service_account_authorization_headers)
+        response = self.request(url, method='delete', headers=self.service_account_authorization_headers)
+        if response.status_code == 404:
+            # Пользователь уже удален (UUID из кэша устарел).
+            self._forget_user(username)
         if response.status_code != 204:
-            raise KeycloakDeleteUserErrror(username, reason=response.text)
+            raise KeycloakDeleteUserError(username, reason=response.text)
+        self._forget_user(username)
+        self.invalidate_tokens(username)
+        with self._created_lock:
+            self.created_usernames.discard(username.lower())
 
     def add_roles(self, username: str, roles: list[str], /) -> None:
         user_uuid = self.get_user_id_by_username(username)
@@ -185,25 +293,102 @@ class KeycloakClient(APIClientBase):
             f'/auth/admin/realms/{self.__realm}/users/{user_uuid}/role-mappings/realm',
         )
         response = self.request(
+            url,
             method='post',
-            url=url,
             headers=self.service_account_authorization_headers,
             payload=self.get_keycloak_roles_by_name(roles),
         )
         if response.status_code != 204:
-            raise KeycloakUserNotUpdatedErrror(username, reason=response.text)
+            raise KeycloakUserNotUpdatedError(username, reason=response.text)
+
+    def get_keycloak_roles_by_name(self, names: list[str], /) -> list[dict[str, t.Any]]:
+        """Представления ролей realm по именам (роли, отсутствующие в realm, пропускаются).
 
-    def get_keycloak_roles_by_name(self, names: list[str], /) -> dict[str, t.Any]:
-        roles = []
-        for role_name in names:
+        Все роли realm выгружаются одним проходом и кэшируются по имени. Если какой-то роли нет
+        в кэше (например, она создана после выгрузки), роли выгружаются повторно.
+        """
+        roles = self.lookup_cache.get(("roles",))
+        if roles is None or any(name not in roles for name in names):
+            roles = self._fetch_realm_roles()
+            self.lookup_cache.put(("roles",), roles)
+        return [roles[name] for name in names if name in roles]
+
+    def _fetch_realm_roles(self) -> dict[str, dict[str, t.Any]]:
+        roles = {}
+        first = 0
+        while True:
             response = self.request(
-                url=urljoin(self.__target_keycloak_url, f'/auth/admin/realms/{self.__realm}/roles'),
+                urljoin(self.__target_keycloak_url, f'/auth/admin/realms/{self.__realm}/roles'),
                 method='get',
-                params={'first': 0, 'max': 20, 'search': role_name},
+                params={'first': first, 'max': self.roles_page_size},
                 headers=self.service_account_authorization_headers,
             )
-            response_json = response.json()
-            for role_dict in response_json or []:
-                if role_dict.get('name') == role_name:
-                    roles.append(role_dict)
-        return roles
+            if response.status_code != 200:
+                raise KeycloakException(response.text)
+            page = response.json() or []
+            for role_dict in page:
+                roles[role_dict.get('name')] = role_dict
+            if len(page) < self.roles_page_size:
+                return roles
+            first += self.roles_page_size
+
+    def create_users(
+        self,
+        users: t.Iterable[KeycloakUserModel],
+        /,
+        *,
+        roles: t.Optional[list[str]] = None,
+        max_workers: t.Optional[int] = None,
+    ) -> BulkResult:
+        """Параллельное создание пользователей (и назначение ролей, если переданы).
+
+        Args:
+            users (typing.Iterable[KeycloakUserModel]): модели пользователей.
+            roles (typing.Optional[list[str]]): роли realm для каждого созданного пользователя.
+            max_workers (typing.Optional[int]): количество одновременных запросов (по умолчанию `bulk_max_workers`).
+
+        Returns:
+            BulkResult: результат по каждому пользователю (value — модель пользователя).
+        """
+        self._prepare_bulk(roles)
+
+        def create(user: KeycloakUserModel) -> KeycloakUserModel:
+            self.create_user(user)
+            if roles:
+                self.add_roles(user.username, roles)
+            return user
+
+        return run_bulk(create, users, max_workers=max_workers or self.bulk_max_workers)
+
+    def delete_users(self, usernames: t.Iterable[str], /, *, max_workers: t.Optional[int] = None) -> BulkResult:
+        """Параллельное удаление пользователей по username."""
+        self._prepare_bulk()
+        return run_bulk(self.delete_user, usernames, max_workers=max_workers or self.bulk_max_workers)
+
+    def assign_roles(
+        self,
+        usernames: t.Iterable[str],
+        roles: list[str],
+        /,
+        *,
+        max_workers: t.Optional[int] = None,
+    ) -> BulkResult:
+        """Параллельное назначение ролей realm пользователям."""
+        self._prepare_bulk(roles)
+        return run_bulk(
+            lambda username: self.add_roles(username, roles),
+            usernames,
+            max_workers=max_workers or self.bulk_max_workers,
+        )
+
+    def cleanup_created_users(self, /, *, max_workers: t.Optional[int] = None) -> BulkResult:
+        """Удаление всех пользователей, созданных клиентом и еще не удаленных, одним параллельным проходом."""
+        with self._created_lock:
+            usernames = sorted(self.created_usernames)
+        return self.delete_users(usernames, max_workers=max_workers)
+
+    def _prepare_bulk(self, roles: t.Optional[list[str]] = None, /) -> None:
+        # Токен и роли запрашиваются один раз до запуска потоков.
+        self.get_access_token_from_service_account()
+        if roles:
+            self.get_keycloak_roles_by_name(roles)
@@ -8,3 +8,45 @@ class KeycloakException(Exception):
     """
     Ошибка: общие ошибки.
     """
+
+
+class KeycloakUserNotAuthorizationError(KeycloakException):
+    """
+    Ошибка: не удалось авторизоваться под пользователем.
+    """
+
+    def __init__(self, username: str, /) -> None:
+        super().__init__(f"Не удалось авторизоваться под пользователем: {username}.")
+
+
+class KeycloakCreateUserError(KeycloakException):
+    """
+    Ошибка: пользователь не создан.
+    """
+
+    def __init__(self, email: str, /, *, reason: str = None) -> None:
+        super().__init__(f"Пользователь {email} не создан. Ответ: {reason}")
+
+
+class KeycloakDeleteUserError(KeycloakException):
+    """
+    Ошибка: пользователь не удален.
+    """
+
+    def __init__(self, username: str, /, *, reason: str = None) -> None:
+        super().__init__(f"Пользователь {username} не удален. Ответ: {reason}")
+
+
+class KeycloakUserNotUpdatedError(KeycloakException):
+    """
+    Ошибка: пользователь не обновлен.
+    """
+
+    def __init__(self, username: str, /, *, reason: str = None) -> None:
+        super().__init__(f"Пользователь {username} не обновлен. Ответ: {reason}")
+
+
+class KeycloakBulkError(KeycloakException):
+    """
+    Ошибка: часть операций пакетного выполнения завершилась с ошибкой.
+    """
@@ -0,0 +1,156 @@
+"""Движок опроса (polling) для ожиданий с адаптивными интервалами."""
+from __future__ import annotations
+
+import abc
+import itertools
+import random
+import time
+import typing as t
+
+from xtest.utils.instrumentation import count_poll
+
+
+class PollingStrategy(abc.ABC):
+    """Стратегия формирования интервалов между попытками."""
+
+    @abc.abstractmethod
+    def delays(self) -> t.Iterator[float]:
+        """Бесконечный генератор интервалов (в секундах) между попытками."""
+        raise NotImplementedError()
+
+
+class FixedInterval(PollingStrategy):
+    """Фиксированный интервал между попытками (поведение старого `wait()`)."""
+
+    def __init__(self, interval: float, /) -> None:
+        if interval < 0:
+            raise ValueError(f"Интервал не может быть отрицательным: {interval}.")
+        self.interval = float(interval)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} interval={self.interval}>"
+
+    def delays(self) -> t.Iterator[float]:
+        return itertools.repeat(self.interval)
+
+
+class ExponentialBackoff(PollingStrategy):
+    """Экспоненциальный рост интервала с ограничением сверху и случайным разбросом.
+
+    Args:
+        initial (float): первый интервал.
+        factor (float): множитель роста интервала.
+        maximum (float): максимальный интервал.
+        jitter (float): относительный разброс интервала (0.2 — ±20%).
+    """
+
+    def __init__(
+        self,
+        *,
+        initial: float = 0.005,
+        factor: float = 2.0,
+        maximum: float = 0.1,
+        jitter: float = 0.2,
+    ) -> None:
+        if initial < 0 or maximum < 0:
+            raise ValueError("Интервалы не могут быть отрицательными.")
+        if factor < 1:
+            raise ValueError(f"Множитель роста интервала должен быть >= 1: {factor}.")
+        if not 0 <= jitter <= 1:
+            raise ValueError(f"Разброс должен быть в пределах [0, 1]: {jitter}.")
+        self.initial = float(initial)
+        self.factor = float(factor)
+        self.maximum = float(maximum)
+        self.jitter = float(jitter)
+
+    def __repr__(self) -> str:
+        return (
+            f"<{self.__class__.__name__} initial={self.initial} factor={self.factor} "
+            f"maximum={self.maximum} jitter={self.jitter}>"
+        )
+
+    def delays(self) -> t.Iterator[float]:
+        delay = min(self.initial, self.maximum)
+        while True:
+            if self.jitter:
+                yield max(0.0, delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+            else:
+                yield delay
+            delay = min(delay * self.factor, self.maximum)
+
+
+DEFAULT_POLLING: PollingStrategy = ExponentialBackoff()
+
+
+def resolve_strategy(interval: t.Union[float, PollingStrategy, None], /) -> PollingStrategy:
+    """Приведение интервала к стратегии опроса.
+
+    Args:
+        interval (typing.Union[float, PollingStrategy, None]): число — фиксированный интервал,
+            None — стратегия по умолчанию.
+
+    Returns:
+        PollingStrategy: стратегия опроса.
+    """
+    if interval is None:
+        return DEFAULT_POLLING
+    if isinstance(interval, PollingStrategy):
+        return interval
+    return FixedInterval(interval)
+
+
+class Deadline:
+    """Крайний срок ожидания по монотонным часам."""
+
+    __slots__ = ("timeout", "_clock", "_end")
+
+    def __init__(self, timeout: float, /, *, clock: t.Callable[[], float] = time.monotonic) -> None:
+        self.timeout = float(timeout)
+        self._clock = clock
+        self._end = clock() + self.timeout
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self._end - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self._end
+
+
+def iter_attempts(
+    timeout: float,
+    /,
+    *,
+    strategy: t.Union[float, PollingStrategy, None] = None,
+    clock: t.Callable[[], float] = time.monotonic,
+    sleep: t.Callable[[float], None] = time.sleep,
+) -> t.Iterator[int]:
+    """Генератор номеров попыток в пределах таймаута.
+
+    Первая попытка выполняется всегда, даже при нулевом таймауте. Сон между попытками
+    ограничивается оставшимся до дедлайна временем, после дедлайна сна нет.
+
+    Args:
+        timeout (float): таймаут в секундах (допускаются дробные значения).
+        strategy (typing.Union[float, PollingStrategy, None]): стратегия интервалов.
+        clock (typing.Callable[[], float]): часы (по умолчанию `time.monotonic`).
+        sleep (typing.Callable[[float], None]): функция сна.
+
+    Yields:
+        int: номер попытки, начиная с 1.
+    """
+    deadline = Deadline(timeout, clock=clock)
+    delays = resolve_strategy(strategy).delays()
+    delay: t.Optional[float] = None
+    for attempt in itertools.count(1):
+        count_poll()
+        yield attempt
+        remaining = deadline.remaining
+        if remaining <= 0:
+            return
+        # Конечная последовательность интервалов продолжается последним интервалом.
+        delay = next(delays, delay)
+        if delay is None:
+            return
+        sleep(min(delay, remaining))